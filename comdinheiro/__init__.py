@@ -29,49 +29,105 @@ Usage Examples:
     from comdinheiro import carteiras_comdinheiro  # Deprecated but available
 """
 
-# Core classes
-from .api_client import ComdinheiroAPI
-from .auth_manager import AuthManager
-from .data_processor import DataProcessor
-from .config import ENDPOINTS, PARAM_TEMPLATES
+from importlib import import_module
 
-# Simplified interface functions
-from .main_interface import (
-    # New simplified functions
-    get_portfolio_list,
-    get_portfolio_data,
-    get_asset_allocation,
-    get_portfolio_balance,
-    export_portfolio_data,
-    test_api_connection,
-    get_user_portfolios,
-    get_available_view_types,
-    format_currency,
-    parse_currency,
+# Public names are resolved on first access (PEP 562) so that importing the
+# package stays cheap: requests is only loaded with ComdinheiroAPI, flask only
+# with AuthManager and pandas only when data is exported.
+_LAZY_ATTRIBUTES = {
+    # Core classes
+    "ComdinheiroAPI": ".api_client",
+    "AsyncComdinheiroAPI": ".async_client",
+    "AuthManager": ".auth_manager",
+    "DataProcessor": ".data_processor",
+    "ENDPOINTS": ".config",
+    "PARAM_TEMPLATES": ".config",
+    "ClientRegistry": ".client_registry",
+    "get_client": ".client_registry",
+    "TTLCache": ".cache",
+    "DiskCache": ".disk_cache",
+    "SingleFlight": ".single_flight",
+    "Deadline": ".deadline",
+    "DeadlineExceeded": ".deadline",
+    "MetricsRegistry": ".metrics",
+    "get_metrics": ".metrics",
+    "ColumnarTable": ".columnar",
+    "TransactionLedger": ".ledger",
+    "TransactionSync": ".ledger",
+    "ExportLedger": ".export_ledger",
+    
+    # Simplified interface functions
+    "get_portfolio_list": ".main_interface",
+    "get_portfolio_data": ".main_interface",
+    "get_portfolio_data_many": ".main_interface",
+    "iter_portfolio_data": ".main_interface",
+    "get_transactions": ".main_interface",
+    "get_asset_allocation": ".main_interface",
+    "get_portfolio_balance": ".main_interface",
+    "export_portfolio_data": ".main_interface",
+    "export_portfolio_data_bulk": ".main_interface",
+    "test_api_connection": ".main_interface",
+    "get_user_portfolios": ".main_interface",
+    "get_available_view_types": ".main_interface",
+    "format_currency": ".main_interface",
+    "parse_currency": ".main_interface",
     
     # Legacy compatibility functions (deprecated)
-    carteiras_comdinheiro,
-    carteiras_patrimonio,
-    asset_allocation_comdinheiro,
-    get_comdinheiro_data,
-    envia_comdinheiro
-)
+    "carteiras_comdinheiro": ".main_interface",
+    "carteiras_patrimonio": ".main_interface",
+    "asset_allocation_comdinheiro": ".main_interface",
+    "get_comdinheiro_data": ".main_interface",
+    "envia_comdinheiro": ".main_interface",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __version__ = "1.0.0"
 __all__ = [
     # Core classes
     "ComdinheiroAPI", 
+    "AsyncComdinheiroAPI",
     "AuthManager", 
     "DataProcessor", 
     "ENDPOINTS", 
     "PARAM_TEMPLATES",
+    "ClientRegistry",
+    "get_client",
+    "TTLCache",
+    "DiskCache",
+    "SingleFlight",
+    "Deadline",
+    "DeadlineExceeded",
+    "MetricsRegistry",
+    "get_metrics",
+    "ColumnarTable",
+    "TransactionLedger",
+    "TransactionSync",
+    "ExportLedger",
     
     # New simplified interface
     "get_portfolio_list",
     "get_portfolio_data", 
+    "get_portfolio_data_many",
+    "iter_portfolio_data",
+    "get_transactions",
     "get_asset_allocation",
     "get_portfolio_balance",
     "export_portfolio_data",
+    "export_portfolio_data_bulk",
     "test_api_connection",
     "get_user_portfolios",
     "get_available_view_types",
@@ -6,51 +6,93 @@ interactions, replacing the complex URL construction patterns with a
 maintainable object-oriented approach.
 """
 
+import logging
 import requests
-import pandas as pd
-from typing import Dict, Any, Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, Tuple, Iterable, Iterator, TYPE_CHECKING
 from urllib.parse import urlencode
 from datetime import datetime
 
 from .config import (
     BASE_URL, BASE_REPORTS_URL, ENDPOINTS, PARAM_TEMPLATES, 
     VIEW_TYPE_MAPPING, format_date_for_api, build_parameters,
-    ERROR_MESSAGES, DEFAULT_VIEW_TYPE
+    ERROR_MESSAGES, DEFAULT_VIEW_TYPE, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+    RESPONSE_CACHE_TTL, ASSET_ALLOCATION_MAX_WORKERS, BATCH_MAX_CONCURRENCY,
+    BALANCE_SNAPSHOT_TTL, BALANCE_SNAPSHOT_MAX_DATES, STREAM_CHUNK_SIZE,
+    ACCOUNT_RATE_LIMIT, ACCOUNT_RATE_BURST, ACCOUNT_RATE_MAX_WAIT,
+    EXPORT_CHUNK_MAX_BYTES, EXPORT_CHUNK_MAX_RECORDS, EXPORT_MAX_CONCURRENCY
 )
+from .cache import TTLCache, canonical_url, credential_key
+from .disk_cache import DiskCache
+from .single_flight import SingleFlight
+from .resilience import RetryPolicy, CircuitBreaker, account_bucket
+from .deadline import Deadline, DeadlineExceeded, DeadlineLike, request_timeout
+from .metrics import metrics
+from .request_plans import REQUEST_PLANS
 
+logger = logging.getLogger(__name__)
 
-class ComdinheiroAPI:
+if TYPE_CHECKING:
+    import pandas as pd
+    from .export_ledger import ExportBatch, ExportLedger
+
+
+class ComdinheiroRequestBuilder:
     """
-    Simplified Comdinheiro API client with standardized endpoints and methods.
+    Request construction shared by the synchronous and asyncio clients.
     
-    This class replaces the complex URL construction and data fetching patterns
-    with clean, maintainable methods for all Comdinheiro operations.
+    Builds URLs and payloads for every Comdinheiro operation and turns raw
+    responses into results, leaving the HTTP transport to subclasses.
     """
     
-    def __init__(self, username: str, password: str):
+    def __init__(self, username: str, password: str,
+                 cache: Optional[TTLCache] = None,
+                 disk_cache: Optional[DiskCache] = None,
+                 base_url: Optional[str] = None,
+                 reports_base_url: Optional[str] = None):
         """
-        Initialize the API client with credentials.
+        Initialize the request builder with credentials.
         
         Args:
             username (str): Comdinheiro username
             password (str): Comdinheiro password
+            cache (TTLCache, optional): Response cache for GET requests.
+                Responses are not keyed by credentials, so a cache must not
+                be shared between clients of different accounts.
+            disk_cache (DiskCache, optional): Persistent report cache. Entries
+                are keyed by credentials, so it can be shared by every client.
+            base_url (str, optional): Base URL of the import/export API
+                (default: BASE_URL)
+            reports_base_url (str, optional): Base URL of the report endpoints
+                (default: BASE_REPORTS_URL)
         """
         self.credentials = {
             'username': username,
             'password': password
         }
-        self.session = requests.Session()
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.base_url = base_url
+        self.reports_base_url = reports_base_url
+        self._account_key = credential_key(username, password)
         
-    def _build_url(self, endpoint_key: str, params: Dict[str, Any] = None) -> str:
+        # Balance snapshots by API date: {date: (snapshot, fetched_at)}
+        self._balance_snapshots: Dict[str, Tuple[Dict, float]] = {}
+        self._snapshot_lock = threading.Lock()
+        
+    def _endpoint_url(self, endpoint_key: str) -> str:
         """
-        Build complete URL for API request.
+        Build the URL of an endpoint, without query parameters.
         
         Args:
             endpoint_key (str): Key from ENDPOINTS configuration
-            params (dict): Query parameters
             
         Returns:
-            str: Complete URL for the request
+            str: Base URL plus endpoint path
         """
         if endpoint_key not in ENDPOINTS:
             raise ValueError(f"Unknown endpoint: {endpoint_key}")
@@ -60,11 +102,24 @@ class ComdinheiroAPI:
         # Use different base URL for report endpoints
         if endpoint_key in ['portfolio_report', 'asset_allocation', 'performance_analysis', 
                            'consolidated_position', 'portfolio_breakdown', 'transactions']:
-            base_url = BASE_REPORTS_URL
+            base_url = self.reports_base_url or BASE_REPORTS_URL
         else:
-            base_url = BASE_URL
+            base_url = self.base_url or BASE_URL
             
-        url = f"{base_url}{endpoint}"
+        return f"{base_url}{endpoint}"
+    
+    def _build_url(self, endpoint_key: str, params: Dict[str, Any] = None) -> str:
+        """
+        Build complete URL for API request.
+        
+        Args:
+            endpoint_key (str): Key from ENDPOINTS configuration
+            params (dict): Query parameters
+            
+        Returns:
+            str: Complete URL for the request
+        """
+        url = self._endpoint_url(endpoint_key)
         
         if params:
             # Remove None values and empty strings
@@ -74,44 +129,82 @@ class ComdinheiroAPI:
                 
         return url
     
-    def _make_request(self, url: str, method: str = 'GET', data: Dict = None) -> Optional[Dict]:
+    def _planned_url(self, endpoint_key: str, template_name: str, **kwargs) -> str:
         """
-        Make HTTP request to Comdinheiro API.
+        Build the URL of a templated request from its precompiled request plan.
+        
+        Same URL as _build_url(endpoint_key, build_parameters(template_name, **kwargs)),
+        but the static parameters are encoded once at import and the URL
+        carries its canonical cache key (see request_plans).
         
         Args:
-            url (str): Complete URL for the request
-            method (str): HTTP method ('GET' or 'POST')
-            data (dict): Data for POST requests
+            endpoint_key (str): Key from ENDPOINTS configuration
+            template_name (str): Key from PARAM_TEMPLATES
+            **kwargs: Placeholder values
             
         Returns:
-            dict: Parsed response data or None if error
+            str: Complete URL for the request
         """
-        try:
-            if method.upper() == 'POST':
-                response = self.session.post(url, data=data)
-            else:
-                response = self.session.get(url)
-                
-            response.raise_for_status()
-            
-            # Try to parse as JSON
-            try:
-                return response.json()
-            except ValueError:
-                # If not JSON, return raw text
-                return {'raw_response': response.text}
-                
-        except requests.RequestException as e:
-            print(f"API request error: {e}")
-            return None
+        plan = REQUEST_PLANS.get(template_name)
+        if plan is None:
+            return self._build_url(endpoint_key, build_parameters(template_name, **kwargs))
+        return plan.url(self._endpoint_url(endpoint_key), **kwargs)
     
-    def get_portfolio_list(self) -> Optional[list]:
+    def _cache_lookup(self, url: str, method: str,
+                      endpoint_key: str = None) -> Tuple[Optional[str], Optional[Dict]]:
         """
-        Get list of available portfolios and their basic information.
+        Look a request up in the response cache, then in the disk cache.
+        
+        Only GET requests are cacheable: in memory for endpoints with a TTL
+        in RESPONSE_CACHE_TTL, on disk for endpoints in DISK_CACHE_ENDPOINTS.
+        POST requests are never cached. Disk hits are copied to memory.
         
         Returns:
-            list: List of portfolio dictionaries with name, balance, and institution
+            tuple: (cache_key, cached_response) - cache_key is None when the
+                   request is not cacheable
         """
+        if method.upper() != 'GET':
+            return None, None
+            
+        memory_ttl = RESPONSE_CACHE_TTL.get(endpoint_key, 0) if self.cache is not None else 0
+        on_disk = self.disk_cache is not None and self.disk_cache.cacheable(endpoint_key)
+        
+        if memory_ttl <= 0 and not on_disk:
+            return None, None
+            
+        cache_key = canonical_url(url)
+        
+        if memory_ttl > 0:
+            cached = self.cache.get(cache_key)
+            metrics.inc('comdinheiro_cache_lookups_total', endpoint=endpoint_key, layer='memory',
+                        result='miss' if cached is None else 'hit')
+            if cached is not None:
+                return cache_key, cached
+                
+        if on_disk:
+            cached = self.disk_cache.get(self._account_key, endpoint_key, cache_key)
+            metrics.inc('comdinheiro_cache_lookups_total', endpoint=endpoint_key, layer='disk',
+                        result='miss' if cached is None else 'hit')
+            if cached is not None:
+                if memory_ttl > 0:
+                    self.cache.set(cache_key, cached, memory_ttl)
+                return cache_key, cached
+                
+        return cache_key, None
+    
+    def _cache_store(self, cache_key: Optional[str], endpoint_key: str,
+                     response: Dict, size: int) -> None:
+        """Store a parsed response under a key returned by _cache_lookup."""
+        if cache_key is None:
+            return
+            
+        if self.cache is not None and RESPONSE_CACHE_TTL.get(endpoint_key, 0) > 0:
+            self.cache.set(cache_key, response, RESPONSE_CACHE_TTL[endpoint_key], size=size)
+        if self.disk_cache is not None:
+            self.disk_cache.set(self._account_key, endpoint_key, cache_key, response)
+    
+    def _portfolio_list_request(self) -> Tuple[str, str]:
+        """Build the (endpoint_key, url) pair for the portfolio list."""
         current_date = datetime.now().strftime("%d%m%Y")
         
         params = {
@@ -131,8 +224,557 @@ class ComdinheiroAPI:
             'filtro_id': ''
         }
         
-        url = self._build_url('portfolio_report', params)
-        response = self._make_request(url)
+        return 'portfolio_report', self._build_url('portfolio_report', params)
+    
+    def _portfolio_balance_request(self, portfolio: str,
+                                   date: str = None) -> Optional[Tuple[str, str]]:
+        """Build the (endpoint_key, url) pair for a portfolio balance, or None if the date is invalid."""
+        if not date:
+            date = datetime.now().strftime("%Y-%m-%d")
+            
+        formatted_date = format_date_for_api(date)
+        if not formatted_date:
+            return None
+            
+        return 'portfolio_report', self._planned_url('portfolio_report', 'portfolio_balance',
+                                                     portfolio=portfolio,
+                                                     end_date=formatted_date)
+    
+    def _balance_snapshot_request(self, date: str = None) -> Optional[Tuple[str, str]]:
+        """Build the (endpoint_key, url) pair for every portfolio balance on a date, or None if the date is invalid."""
+        return self._portfolio_balance_request('', date)
+    
+    def _cached_snapshot(self, date: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored balance snapshot of a date, if it is still fresh.
+        
+        Past dates are reused as they are, the current date is refreshed
+        after BALANCE_SNAPSHOT_TTL seconds.
+        """
+        is_today = date == datetime.now().strftime("%Y-%m-%d")
+        
+        with self._snapshot_lock:
+            entry = self._balance_snapshots.get(date)
+            if entry and (not is_today or time.monotonic() - entry[1] < BALANCE_SNAPSHOT_TTL):
+                return entry[0]
+        return None
+    
+    def _store_snapshot(self, date: str, response: Dict,
+                        fetched_at: float) -> Optional[Dict[str, Any]]:
+        """Parse a balance snapshot response and keep it for its date, or None if it cannot be parsed."""
+        # Import here to avoid circular imports
+        from .data_processor import DataProcessor
+        snapshot = DataProcessor.parse_balance_snapshot(response)
+        if snapshot is None:
+            return None
+        
+        with self._snapshot_lock:
+            self._balance_snapshots[date] = (snapshot, fetched_at)
+            while len(self._balance_snapshots) > BALANCE_SNAPSHOT_MAX_DATES:
+                oldest = min(self._balance_snapshots, key=lambda d: self._balance_snapshots[d][1])
+                del self._balance_snapshots[oldest]
+                
+        return snapshot
+    
+    def _asset_allocation_request(self, portfolio: str,
+                                  end_date: str) -> Optional[Tuple[str, str]]:
+        """Build the (endpoint_key, url) pair for the allocation report, or None if the date is invalid."""
+        formatted_date = format_date_for_api(end_date)
+        if not formatted_date:
+            return None
+            
+        # Get asset allocation data
+        return 'asset_allocation', self._planned_url('asset_allocation', 'asset_allocation',
+                                                     portfolio=portfolio,
+                                                     start_date=formatted_date,
+                                                     end_date=formatted_date)
+    
+    def _performance_request(self, portfolio: str, end_date: str = None,
+                             start_date: str = None) -> Optional[Tuple[str, str]]:
+        """Build the (endpoint_key, url) pair for performance data, or None if a date is invalid."""
+        if not end_date:
+            end_date = datetime.now().strftime("%Y-%m-%d")
+            
+        if not start_date:
+            # Calculate 6 months before end_date
+            try:
+                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+                # Import here to avoid circular imports
+                from .data_processor import DataProcessor
+                start_dt = DataProcessor.calculate_date_6_months_before(end_dt)
+                start_date = start_dt.strftime("%Y-%m-%d")
+            except ValueError:
+                return None
+                
+        formatted_start = format_date_for_api(start_date)
+        formatted_end = format_date_for_api(end_date)
+        
+        if not formatted_start or not formatted_end:
+            return None
+            
+        return 'performance_analysis', self._planned_url('performance_analysis', 'performance',
+                                                         portfolio=portfolio,
+                                                         start_date=formatted_start,
+                                                         end_date=formatted_end)
+    
+    def _portfolio_data_request(self, portfolio: str, start_date: str = None,
+                                end_date: str = None, view_type: str = DEFAULT_VIEW_TYPE,
+                                bank: str = 'todos', operation: str = 'todos') -> Tuple[str, str]:
+        """Build the (endpoint_key, url) pair for a portfolio view."""
+        # Validate and format dates
+        formatted_start = format_date_for_api(start_date) if start_date else ''
+        formatted_end = format_date_for_api(end_date) if end_date else ''
+        
+        # Get endpoint and parameter template for view type
+        endpoint_key, template_name = VIEW_TYPE_MAPPING.get(
+            view_type, ('portfolio_report', 'consolidated_report')
+        )
+        
+        # Build parameters based on view type
+        return endpoint_key, self._planned_url(endpoint_key, template_name,
+                                               portfolio=portfolio,
+                                               start_date=formatted_start,
+                                               end_date=formatted_end,
+                                               bank=bank.replace(" ", "%20") if bank else "todos",
+                                               operation=operation)
+    
+    def _export_request(self, content_data: 'pd.DataFrame',
+                        on_error: int = 0) -> Tuple[str, str, Dict[str, Any]]:
+        """Build the (endpoint_key, url, payload) triple for a data export."""
+        return self._export_content_request(content_data.to_json(orient="records"), on_error)
+    
+    def _export_content_request(self, content: str,
+                                on_error: int = 0) -> Tuple[str, str, Dict[str, Any]]:
+        """Build the (endpoint_key, url, payload) triple for already serialized records."""
+        if on_error == 1:
+            on_error = 2
+            
+        payload = {
+            **self.credentials,
+            "URL": "ComprasVendas002--0-listar-0-",
+            "format": "json",
+            "content": content,
+            "email_log": "0",
+            "on_error": on_error
+        }
+        
+        return 'export_data', self._build_url('export_data'), payload
+    
+    def _pending_export(self, content_data: 'pd.DataFrame',
+                        ledger: Optional['ExportLedger']) -> Optional['ExportBatch']:
+        """Select the rows the account has not exported yet, or None without a ledger."""
+        if ledger is None:
+            return None
+        return ledger.pending(self._account_key, content_data)
+    
+    @staticmethod
+    def _nothing_to_export(batch: 'ExportBatch') -> str:
+        """Message of an export whose rows were all exported before."""
+        return f"Nenhum registro novo para exportar ({batch.skipped} já exportados)"
+    
+    @staticmethod
+    def _record_export(ledger: 'ExportLedger', batch: 'ExportBatch', response: Optional[Dict],
+                       start: int = 0, stop: Optional[int] = None) -> bool:
+        """
+        Record rows of a batch as exported if the response confirms them all.
+        
+        Returns:
+            bool: True if the rows were recorded (see export_ledger.export_accepted)
+        """
+        # Import here: export_ledger needs pandas and numpy
+        from .export_ledger import export_accepted
+        
+        stop = len(batch.rows) if stop is None else stop
+        if not export_accepted(response, stop - start):
+            logger.warning("Export response does not confirm all %d rows; "
+                           "they are not recorded in the export ledger", stop - start)
+            return False
+            
+        ledger.record(batch, start, stop)
+        return True
+    
+    @staticmethod
+    def _process_portfolio_data(response: Optional[Dict], view_type: str,
+                                portfolio: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """Turn a raw portfolio view response into (data_dict, error_message)."""
+        if not response:
+            return None, ERROR_MESSAGES['api_error']
+            
+        # Process response based on view type
+        # Import here to avoid circular imports
+        from .data_processor import DataProcessor
+        processed_data = DataProcessor.process_response_by_view_type(
+            response, view_type, portfolio
+        )
+        
+        if processed_data is None:
+            return None, ERROR_MESSAGES['no_data']
+            
+        return processed_data, None
+    
+    @staticmethod
+    def _process_export_response(response: Optional[Dict]) -> Optional[str]:
+        """Turn a raw export response into the user-facing message, or None if error."""
+        if response and response.get('status_code') == 200:
+            try:
+                data = response
+                if isinstance(data, dict) and "resposta" in data:
+                    for item in data["resposta"]:
+                        if isinstance(item, dict) and "Comdinheiro informa" in item:
+                            mensagem_raw = item["Comdinheiro informa"]
+                            mensagens = [m.strip() for m in mensagem_raw.split('.') if m.strip()]
+                            return "<ul>" + "".join(f"<li>{msg}.</li>" for msg in mensagens) + "</ul>"
+                return "Dados exportados com sucesso"
+            except Exception as e:
+                print(f"Erro ao processar resposta: {e}")
+                return None
+        else:
+            return None
+
+
+class ComdinheiroAPI(ComdinheiroRequestBuilder):
+    """
+    Simplified Comdinheiro API client with standardized endpoints and methods.
+    
+    This class replaces the complex URL construction and data fetching patterns
+    with clean, maintainable methods for all Comdinheiro operations.
+    """
+    
+    def __init__(self, username: str, password: str,
+                 pool_connections: int = HTTP_POOL_CONNECTIONS,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 cache: Optional[TTLCache] = None,
+                 disk_cache: Optional[DiskCache] = None,
+                 single_flight: bool = True,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breakers: bool = True,
+                 rate_limit: float = ACCOUNT_RATE_LIMIT,
+                 rate_burst: int = ACCOUNT_RATE_BURST,
+                 base_url: Optional[str] = None,
+                 reports_base_url: Optional[str] = None):
+        """
+        Initialize the API client with credentials.
+        
+        Args:
+            username (str): Comdinheiro username
+            password (str): Comdinheiro password
+            pool_connections (int): Number of host connection pools to keep
+            pool_maxsize (int): Maximum keep-alive connections per host
+            cache (TTLCache, optional): Response cache for GET requests.
+                Responses are not keyed by credentials, so a cache must not
+                be shared between clients of different accounts.
+            disk_cache (DiskCache, optional): Persistent report cache, may be
+                shared between clients and processes
+            single_flight (bool): Let concurrent identical GET requests and
+                portfolio/allocation calls share one upstream call. Shared
+                results must be treated as read-only.
+            retry_policy (RetryPolicy, optional): Retries of GET requests
+                (default: RetryPolicy() from the RETRY_* settings; use
+                RetryPolicy(max_attempts=1) to disable retries)
+            circuit_breakers (bool): Keep a circuit breaker per endpoint key
+            rate_limit (float): Requests per second allowed for this account,
+                shared with every client of the same account (0 disables)
+            rate_burst (int): Requests allowed at once above the rate
+            base_url (str, optional): Base URL of the import/export API
+                (default: BASE_URL, settable through COMDINHEIRO_BASE_URL)
+            reports_base_url (str, optional): Base URL of the report endpoints
+                (default: BASE_REPORTS_URL, settable through
+                COMDINHEIRO_REPORTS_BASE_URL)
+        """
+        super().__init__(username, password, cache=cache, disk_cache=disk_cache,
+                         base_url=base_url, reports_base_url=reports_base_url)
+        self.session = requests.Session()
+        self.single_flight = SingleFlight() if single_flight else None
+        
+        # Resilience layer: retries, per-endpoint breakers, per-account bucket
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breakers = (
+            {endpoint_key: CircuitBreaker() for endpoint_key in ENDPOINTS}
+            if circuit_breakers else {}
+        )
+        self.rate_limiter = (
+            account_bucket(self._account_key, rate_limit, rate_burst) if rate_limit > 0 else None
+        )
+        self._counters = {'attempts': 0, 'retries': 0, 'failures': 0,
+                          'circuit_rejections': 0, 'rate_limited': 0}
+        self._counters_lock = threading.Lock()
+        
+        # Keep-alive connection pools shared by every request of this client
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def close(self) -> None:
+        """Close the HTTP session and release its pooled connections."""
+        self.session.close()
+    
+    def single_flight_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get request coalescing counters (see SingleFlight.stats).
+        
+        Returns:
+            dict: Calls, executions and coalesced calls, in total and per
+                  operation, or None when single-flight is disabled
+        """
+        return self.single_flight.stats() if self.single_flight is not None else None
+    
+    def resilience_stats(self) -> Dict[str, Any]:
+        """
+        Get retry, circuit breaker and rate limiter counters.
+        
+        Returns:
+            dict: Request counters (attempts, retries, failures,
+                  circuit_rejections, rate_limited), the state of every
+                  circuit breaker and the account rate limiter counters
+        """
+        with self._counters_lock:
+            stats = dict(self._counters)
+        stats['circuits'] = {endpoint_key: breaker.stats()
+                             for endpoint_key, breaker in self.circuit_breakers.items()}
+        stats['rate_limiter'] = self.rate_limiter.stats() if self.rate_limiter else None
+        return stats
+    
+    def _count(self, counter: str) -> None:
+        with self._counters_lock:
+            self._counters[counter] += 1
+    
+    def _coalesce(self, key: Tuple, fn, *args: Any,
+                  deadline: Optional[Deadline] = None) -> Any:
+        """
+        Run fn(*args) through single-flight when it is enabled.
+        
+        A caller waiting for an identical call in flight gives up when its
+        own deadline runs out. When the call in flight runs out of its
+        caller's deadline, the waiting callers run it again with their own.
+        """
+        if self.single_flight is None:
+            return fn(*args)
+            
+        try:
+            return self.single_flight.do(key, fn, *args,
+                                         timeout=deadline.remaining() if deadline else None,
+                                         unshared_errors=(DeadlineExceeded,))
+        except DeadlineExceeded:
+            raise
+        except TimeoutError as e:
+            raise DeadlineExceeded() from e
+    
+    def _make_request(self, url: str, method: str = 'GET', data: Dict = None,
+                      endpoint_key: str = None,
+                      deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """
+        Make HTTP request to Comdinheiro API.
+        
+        GET requests are served from the response cache when one is
+        configured and the endpoint has a TTL in RESPONSE_CACHE_TTL, and
+        from the disk cache for report endpoints. POST requests are never
+        cached. Concurrent identical GET requests share one HTTP call.
+        
+        Args:
+            url (str): Complete URL for the request
+            method (str): HTTP method ('GET' or 'POST')
+            data (dict): Data for POST requests
+            endpoint_key (str): Key from ENDPOINTS, used to pick the cache TTL
+                and the timeouts
+            deadline (Deadline, optional): Overall deadline of the calling method
+            
+        Returns:
+            dict: Parsed response data or None if error
+            
+        Raises:
+            DeadlineExceeded: If the deadline runs out before a response
+        """
+        cache_key, cached = self._cache_lookup(url, method, endpoint_key)
+        if cached is not None:
+            return cached
+        
+        if method.upper() == 'POST':
+            return self._send_request(url, method, data, endpoint_key, cache_key, deadline)
+        
+        return self._coalesce(('request', cache_key or canonical_url(url)),
+                              self._send_request, url, method, data, endpoint_key,
+                              cache_key, deadline, deadline=deadline)
+    
+    def _send_request(self, url: str, method: str, data: Optional[Dict],
+                      endpoint_key: Optional[str], cache_key: Optional[str],
+                      deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """
+        Send a request upstream and store the parsed response in the caches.
+        
+        GET requests are retried with backoff on connection errors, timeouts
+        and RETRY_STATUS_CODES; POST requests are attempted once. Every
+        attempt first goes through the account rate limiter and the
+        endpoint's circuit breaker, and uses the endpoint's ENDPOINT_TIMEOUTS capped
+        by the time left before the deadline. No retry is started that could
+        not finish before the deadline.
+        """
+        idempotent = method.upper() != 'POST'
+        max_attempts = self.retry_policy.max_attempts if idempotent else 1
+        breaker = self.circuit_breakers.get(endpoint_key)
+        
+        for attempt in range(1, max_attempts + 1):
+            timeout = request_timeout(endpoint_key, deadline)
+            
+            if not self._admit_attempt(endpoint_key, breaker, deadline):
+                return None
+                
+            started = time.perf_counter()
+            
+            try:
+                if idempotent:
+                    response = self.session.get(url, timeout=timeout)
+                else:
+                    response = self.session.post(url, data=data, timeout=timeout)
+                    
+                self._record_response(endpoint_key, response, started)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                if self._retry_after_failure(e, endpoint_key, breaker, started,
+                                             attempt, max_attempts, deadline):
+                    continue
+                return None
+            
+            if breaker is not None:
+                breaker.record_success()
+                
+            # Try to parse as JSON
+            try:
+                with metrics.timer('comdinheiro_decode_seconds', endpoint=endpoint_key):
+                    result = response.json()
+                self._cache_store(cache_key, endpoint_key, result, len(response.content))
+                return result
+            except ValueError:
+                # If not JSON, return raw text
+                return {'raw_response': response.text}
+    
+    def _admit_attempt(self, endpoint_key: Optional[str], breaker: Optional[CircuitBreaker],
+                       deadline: Optional[Deadline] = None) -> bool:
+        """
+        Take a rate limit token and pass the endpoint's circuit breaker.
+        
+        The token is taken first: a half-open breaker lets a single trial
+        through, which must not be lost waiting for the rate limiter.
+        
+        Returns:
+            bool: True if the attempt may be sent (it is counted), False if
+                  it was skipped
+        
+        Raises:
+            DeadlineExceeded: If the deadline ran out waiting for a token
+        """
+        max_wait = ACCOUNT_RATE_MAX_WAIT if deadline is None else min(ACCOUNT_RATE_MAX_WAIT,
+                                                                      deadline.remaining())
+        if self.rate_limiter is not None and not self.rate_limiter.acquire(max_wait):
+            self._count('rate_limited')
+            if deadline is not None:
+                deadline.check()
+            logger.warning("API request skipped: account rate limit reached")
+            return False
+        
+        if breaker is not None and not breaker.allow():
+            self._count('circuit_rejections')
+            logger.warning("API request skipped: circuit open for endpoint %s", endpoint_key)
+            return False
+        
+        self._count('attempts')
+        return True
+    
+    def _retry_after_failure(self, error: requests.RequestException, endpoint_key: Optional[str],
+                             breaker: Optional[CircuitBreaker], started: float, attempt: int,
+                             max_attempts: int, deadline: Optional[Deadline] = None) -> bool:
+        """
+        Record a failed attempt and wait before the next one when it is worth it.
+        
+        Returns:
+            bool: True once the backoff has been slept and another attempt
+                  should be made, False if the request failed for good
+        
+        Raises:
+            DeadlineExceeded: If the deadline ran out or leaves no time to retry
+        """
+        status_code = error.response.status_code if error.response is not None else None
+        if error.response is None:
+            self._record_failure(endpoint_key, error, started)
+        retryable = self.retry_policy.is_retryable(status_code)
+        
+        if breaker is not None:
+            # Client errors (4xx) mean the upstream itself is healthy
+            if retryable:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        
+        if deadline is not None and deadline.expired():
+            self._count('failures')
+            raise DeadlineExceeded() from error
+        
+        if not retryable or attempt == max_attempts:
+            self._count('failures')
+            logger.warning("API request error: %s", error)
+            return False
+        
+        retry_after = self._retry_after(error.response) if error.response is not None else None
+        delay = self.retry_policy.backoff(attempt, retry_after)
+        if deadline is not None and delay >= deadline.remaining():
+            self._count('failures')
+            raise DeadlineExceeded() from error
+        
+        self._count('retries')
+        logger.info("API request attempt %d failed (%s), retrying in %.2fs",
+                    attempt, error, delay)
+        time.sleep(delay)
+        return True
+    
+    @staticmethod
+    def _record_response(endpoint_key: Optional[str], response: requests.Response,
+                         started: float, stream: bool = False) -> None:
+        """
+        Record the latency, status and body size of an upstream response.
+        
+        The body of a streamed response is not read here; its size is
+        recorded once it has been consumed.
+        """
+        status = str(response.status_code)
+        metrics.observe('comdinheiro_request_seconds', time.perf_counter() - started,
+                        endpoint=endpoint_key, status=status)
+        if not stream:
+            metrics.observe('comdinheiro_response_bytes', len(response.content),
+                            endpoint=endpoint_key)
+        metrics.inc('comdinheiro_requests_total', endpoint=endpoint_key, status=status)
+    
+    @staticmethod
+    def _record_failure(endpoint_key: Optional[str], error: Exception, started: float) -> None:
+        """Record an upstream request that got no response (timeout or connection error)."""
+        status = 'timeout' if isinstance(error, requests.Timeout) else 'error'
+        metrics.observe('comdinheiro_request_seconds', time.perf_counter() - started,
+                        endpoint=endpoint_key, status=status)
+        metrics.inc('comdinheiro_requests_total', endpoint=endpoint_key, status=status)
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Get the Retry-After delay of a response, in seconds, if given as a number."""
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+    
+    def get_portfolio_list(self, deadline: Optional[DeadlineLike] = None) -> Optional[list]:
+        """
+        Get list of available portfolios and their basic information.
+        
+        Args:
+            deadline (float or Deadline, optional): Overall time budget in seconds
+            
+        Returns:
+            list: List of portfolio dictionaries with name, balance, and institution
+            
+        Raises:
+            DeadlineExceeded: If the deadline runs out
+        """
+        endpoint_key, url = self._portfolio_list_request()
+        response = self._make_request(url, endpoint_key=endpoint_key,
+                                      deadline=Deadline.coerce(deadline))
         
         if response:
             # Import here to avoid circular imports
@@ -140,81 +782,204 @@ class ComdinheiroAPI:
             return DataProcessor.parse_portfolio_list(response)
         return None
     
-    def get_portfolio_balance(self, portfolio: str, date: str = None) -> Optional[float]:
+    def get_balance_snapshot(self, date: str = None,
+                             deadline: Optional[DeadlineLike] = None) -> Optional[Dict[str, Any]]:
         """
-        Get current balance for a specific portfolio.
+        Get the balances of every portfolio on a date from a single report call.
+        
+        Snapshots are kept per date: past dates are reused as they are, the
+        current date is refreshed after BALANCE_SNAPSHOT_TTL seconds.
         
         Args:
-            portfolio (str): Portfolio name
             date (str): Date in YYYY-MM-DD format (default: current date)
+            deadline (float or Deadline, optional): Overall time budget in seconds
             
         Returns:
-            float: Portfolio balance or None if error
+            dict: Snapshot with 'balances' (name -> balance), 'index'
+                  (lowercase name -> balance) and 'first_balance', or None if error
+                  
+        Raises:
+            DeadlineExceeded: If the deadline runs out
+        """
+        return self._balance_snapshot(date, Deadline.coerce(deadline))[0]
+    
+    def _balance_snapshot(self, date: str = None,
+                          deadline: Optional[Deadline] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Get the snapshot of get_balance_snapshot and whether the upstream call failed.
+        
+        Returns:
+            tuple: (snapshot or None, True if the report request itself failed)
         """
         if not date:
             date = datetime.now().strftime("%Y-%m-%d")
             
-        formatted_date = format_date_for_api(date)
-        if not formatted_date:
-            return None
+        request = self._balance_snapshot_request(date)
+        if not request:
+            return None, False
+            
+        snapshot = self._cached_snapshot(date)
+        if snapshot is not None:
+            return snapshot, False
+        
+        endpoint_key, url = request
+        fetched_at = time.monotonic()
+        response = self._make_request(url, endpoint_key=endpoint_key, deadline=deadline)
+        if response is None:
+            return None, True
+        
+        return self._store_snapshot(date, response, fetched_at), False
+    
+    def get_portfolio_balance(self, portfolio: str, date: str = None,
+                              deadline: Optional[DeadlineLike] = None) -> Optional[float]:
+        """
+        Get current balance for a specific portfolio.
+        
+        The balance is served from the all-portfolio snapshot for the date.
+        Portfolios missing from the snapshot (or a snapshot report that
+        cannot be parsed) fall back to the per-portfolio report request. When
+        the snapshot request itself fails (upstream errors, open circuit,
+        rate limit or deadline) there is no fallback, so an unhealthy
+        upstream does not get a second request.
+        
+        Args:
+            portfolio (str): Portfolio name
+            date (str): Date in YYYY-MM-DD format (default: current date)
+            deadline (float or Deadline, optional): Overall time budget in seconds
+            
+        Returns:
+            float: Portfolio balance or None if error
             
-        params = build_parameters('portfolio_balance', 
-                                portfolio=portfolio, 
-                                end_date=formatted_date)
+        Raises:
+            DeadlineExceeded: If the deadline runs out
+        """
+        # Import here to avoid circular imports
+        from .data_processor import DataProcessor
+        
+        deadline = Deadline.coerce(deadline)
+        snapshot, failed = self._balance_snapshot(date, deadline)
+        if failed:
+            return None
         
-        url = self._build_url('portfolio_report', params)
-        response = self._make_request(url)
+        balance = DataProcessor.lookup_balance(snapshot, portfolio)
+        if balance is not None:
+            return balance
+        
+        request = self._portfolio_balance_request(portfolio, date)
+        if not request:
+            return None
+            
+        endpoint_key, url = request
+        response = self._make_request(url, endpoint_key=endpoint_key, deadline=deadline)
         
         if response:
-            # Import here to avoid circular imports
-            from .data_processor import DataProcessor
             return DataProcessor.parse_portfolio_balance(response, portfolio)
         return None
     
-    def get_asset_allocation(self, portfolio: str, end_date: str = None) -> Optional[Dict]:
+    def get_asset_allocation(self, portfolio: str, end_date: str = None,
+                             deadline: Optional[DeadlineLike] = None) -> Optional[Dict]:
         """
         Get asset allocation data for a portfolio.
         
+        The allocation report, the portfolio balance and the performance data
+        are independent upstream calls, so they are issued concurrently and
+        the latency is that of the slowest one. If the balance or performance
+        call fails, the result is still built without that part. Concurrent
+        identical calls share one execution.
+        
+        With a deadline, all three calls share it. If the balance or the
+        performance data is not ready when the deadline runs out, the partial
+        result is returned with an 'errors' entry ({'balance': message,
+        'performance': message}) for the missing parts.
+        
         Args:
             portfolio (str): Portfolio name
             end_date (str): End date in YYYY-MM-DD format
+            deadline (float or Deadline, optional): Overall time budget in seconds
             
         Returns:
             dict: Asset allocation data with allocations, balance, and performance
+            
+        Raises:
+            DeadlineExceeded: If the allocation report itself is not ready in time
         """
         if not end_date:
             end_date = datetime.now().strftime("%Y-%m-%d")
             
-        formatted_date = format_date_for_api(end_date)
-        if not formatted_date:
+        request = self._asset_allocation_request(portfolio, end_date)
+        if not request:
             return None
             
-        # Get asset allocation data
-        params = build_parameters('asset_allocation',
-                                portfolio=portfolio,
-                                start_date=formatted_date,
-                                end_date=formatted_date)
+        endpoint_key, url = request
+        deadline = Deadline.coerce(deadline)
         
-        url = self._build_url('asset_allocation', params)
-        allocation_response = self._make_request(url)
-        
-        if not allocation_response:
-            return None
+        return self._coalesce(('asset_allocation', canonical_url(url)),
+                              self._fetch_asset_allocation, portfolio, end_date,
+                              endpoint_key, url, deadline, deadline=deadline)
+    
+    def _fetch_asset_allocation(self, portfolio: str, end_date: str, endpoint_key: str,
+                                url: str, deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """Make the allocation, balance and performance calls of get_asset_allocation."""
+        executor = ThreadPoolExecutor(max_workers=ASSET_ALLOCATION_MAX_WORKERS)
+        futures = []
+        try:
+            allocation_future = executor.submit(
+                self._make_request, url, endpoint_key=endpoint_key, deadline=deadline
+            )
+            balance_future = executor.submit(self.get_portfolio_balance, portfolio,
+                                             end_date, deadline)
+            performance_future = executor.submit(self.get_performance_data, portfolio,
+                                                 end_date, None, deadline)
+            futures = [allocation_future, balance_future, performance_future]
             
-        # Get portfolio balance
-        balance = self.get_portfolio_balance(portfolio, end_date)
-        
-        # Get performance data
-        performance_data = self.get_performance_data(portfolio, end_date)
+            allocation_response = allocation_future.result()
+            if not allocation_response:
+                return None
+            
+            # Balance and performance are optional parts of the result
+            balance, balance_timed_out = self._optional_result(balance_future, deadline)
+            performance_data, performance_timed_out = self._optional_result(
+                performance_future, deadline
+            )
+        finally:
+            # shutdown(cancel_futures=True) needs Python 3.9
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
         
         # Import here to avoid circular imports
         from .data_processor import DataProcessor
-        return DataProcessor.parse_asset_allocation(
+        result = DataProcessor.parse_asset_allocation(
             allocation_response, balance, performance_data
         )
+        
+        timed_out = [part for part, flag in (('balance', balance_timed_out),
+                                             ('performance', performance_timed_out)) if flag]
+        if result is not None and timed_out:
+            result['errors'] = {part: ERROR_MESSAGES['deadline_exceeded'] for part in timed_out}
+        return result
+    
+    @staticmethod
+    def _optional_result(future, deadline: Optional[Deadline] = None) -> Tuple[Any, bool]:
+        """
+        Get the result of an optional branch, treating a failure as missing data.
+        
+        Returns:
+            tuple: (result or None, True if the branch ran out of time)
+        """
+        try:
+            return future.result(timeout=deadline.remaining() if deadline else None), False
+        except FutureTimeoutError:
+            # Not the builtin TimeoutError before Python 3.11
+            logger.warning("API request error: %s", ERROR_MESSAGES['deadline_exceeded'])
+            return None, True
+        except Exception as e:
+            logger.warning("API request error: %s", e)
+            return None, False
     
     def get_performance_data(self, portfolio: str, end_date: str = None, 
-                           start_date: str = None) -> Optional[Dict]:
+                           start_date: str = None,
+                           deadline: Optional[DeadlineLike] = None) -> Optional[Dict]:
         """
         Get performance/rentability data for a portfolio.
         
@@ -222,37 +987,21 @@ class ComdinheiroAPI:
             portfolio (str): Portfolio name
             end_date (str): End date in YYYY-MM-DD format
             start_date (str): Start date in YYYY-MM-DD format (default: 6 months before end_date)
+            deadline (float or Deadline, optional): Overall time budget in seconds
             
         Returns:
             dict: Performance data including annual and 3-month returns
-        """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
             
-        if not start_date:
-            # Calculate 6 months before end_date
-            try:
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-                # Import here to avoid circular imports
-                from .data_processor import DataProcessor
-                start_dt = DataProcessor.calculate_date_6_months_before(end_dt)
-                start_date = start_dt.strftime("%Y-%m-%d")
-            except ValueError:
-                return None
-                
-        formatted_start = format_date_for_api(start_date)
-        formatted_end = format_date_for_api(end_date)
-        
-        if not formatted_start or not formatted_end:
+        Raises:
+            DeadlineExceeded: If the deadline runs out
+        """
+        request = self._performance_request(portfolio, end_date, start_date)
+        if not request:
             return None
             
-        params = build_parameters('performance',
-                                portfolio=portfolio,
-                                start_date=formatted_start,
-                                end_date=formatted_end)
-        
-        url = self._build_url('performance_analysis', params)
-        response = self._make_request(url)
+        endpoint_key, url = request
+        response = self._make_request(url, endpoint_key=endpoint_key,
+                                      deadline=Deadline.coerce(deadline))
         
         if response:
             # Import here to avoid circular imports
@@ -262,11 +1011,13 @@ class ComdinheiroAPI:
     
     def get_portfolio_data(self, portfolio: str, start_date: str = None, 
                           end_date: str = None, view_type: str = DEFAULT_VIEW_TYPE,
-                          bank: str = 'todos', operation: str = 'todos') -> Tuple[Optional[Dict], Optional[str]]:
+                          bank: str = 'todos', operation: str = 'todos',
+                          deadline: Optional[DeadlineLike] = None) -> Tuple[Optional[Dict], Optional[str]]:
         """
         Get comprehensive portfolio data based on view type.
         
         This is the main method that replaces the complex get_comdinheiro_data function.
+        Concurrent identical calls share one request and its processed result.
         
         Args:
             portfolio (str): Portfolio name
@@ -275,98 +1026,296 @@ class ComdinheiroAPI:
             view_type (str): Type of view ('consolidado', 'relatorio', 'movimentacoes', etc.)
             bank (str): Bank filter for transactions
             operation (str): Operation filter for transactions
+            deadline (float or Deadline, optional): Overall time budget in
+                seconds; when it runs out the error message says so
             
         Returns:
             tuple: (data_dict, error_message) - data_dict is None if error occurred
         """
-        # Validate and format dates
-        formatted_start = format_date_for_api(start_date) if start_date else ''
-        formatted_end = format_date_for_api(end_date) if end_date else ''
-        
-        # Get endpoint and parameter template for view type
-        endpoint_key, template_name = VIEW_TYPE_MAPPING.get(
-            view_type, ('portfolio_report', 'consolidated_report')
+        endpoint_key, url = self._portfolio_data_request(
+            portfolio, start_date, end_date, view_type, bank, operation
         )
+        deadline = Deadline.coerce(deadline)
         
-        # Build parameters based on view type
-        params = build_parameters(template_name,
-                                portfolio=portfolio,
-                                start_date=formatted_start,
-                                end_date=formatted_end,
-                                bank=bank.replace(" ", "%20") if bank else "todos",
-                                operation=operation)
+        # Identical concurrent calls share the request and the processing
+        try:
+            return self._coalesce(('portfolio_data', canonical_url(url), view_type),
+                                  self._fetch_portfolio_data, url, endpoint_key,
+                                  view_type, portfolio, deadline, deadline=deadline)
+        except DeadlineExceeded as e:
+            return None, str(e)
+    
+    def _fetch_portfolio_data(self, url: str, endpoint_key: str, view_type: str, portfolio: str,
+                              deadline: Optional[Deadline] = None) -> Tuple[Optional[Dict], Optional[str]]:
+        """Make the API request of get_portfolio_data and process its response."""
+        with metrics.timer('comdinheiro_call_seconds', view_type=view_type):
+            response = self._make_request(url, endpoint_key=endpoint_key, deadline=deadline)
+            return self._process_portfolio_data(response, view_type, portfolio)
+    
+    def get_portfolio_data_many(self, portfolios: Iterable[str],
+                                view_type: str = DEFAULT_VIEW_TYPE, end_date: str = None,
+                                start_date: str = None, bank: str = 'todos',
+                                operation: str = 'todos',
+                                max_concurrency: int = BATCH_MAX_CONCURRENCY,
+                                deadline: Optional[DeadlineLike] = None
+                                ) -> Iterator[Tuple[str, Optional[Dict], Optional[str]]]:
+        """
+        Get portfolio data for many portfolios with bounded concurrency.
         
-        # Make API request
-        url = self._build_url(endpoint_key, params)
-        response = self._make_request(url)
+        Results are yielded as soon as each portfolio finishes, not in input
+        order. A failure only affects its own portfolio: it is reported as an
+        error message and the rest of the batch keeps going. With a deadline,
+        the whole batch shares it: portfolios not done in time are reported
+        with the timeout error and the ones already done are kept.
         
-        if not response:
-            return None, ERROR_MESSAGES['api_error']
+        Args:
+            portfolios (iterable): Portfolio names
+            view_type (str): Type of view ('consolidado', 'relatorio', 'movimentacoes', etc.)
+            end_date (str): End date in YYYY-MM-DD format
+            start_date (str): Start date in YYYY-MM-DD format
+            bank (str): Bank filter for transactions
+            operation (str): Operation filter for transactions
+            max_concurrency (int): Maximum portfolio requests in flight
+            deadline (float or Deadline, optional): Time budget in seconds for the whole batch
             
-        # Process response based on view type
+        Yields:
+            tuple: (portfolio, data_dict, error_message) - data_dict is None if error occurred
+            
+        Example:
+            for portfolio, data, error in api.get_portfolio_data_many(carteiras):
+                print(portfolio, error or data.get('total_geral'))
+        """
+        deadline = Deadline.coerce(deadline)
+        executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+        futures = {}
+        try:
+            futures = {
+                executor.submit(self.get_portfolio_data, portfolio, start_date,
+                                end_date, view_type, bank, operation, deadline): portfolio
+                for portfolio in portfolios
+            }
+            
+            for future in as_completed(futures):
+                portfolio = futures[future]
+                try:
+                    data, error = future.result()
+                except Exception as e:
+                    data, error = None, str(e)
+                yield portfolio, data, error
+        finally:
+            # Also runs when the caller stops iterating early; shutdown(cancel_futures=True)
+            # needs Python 3.9
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def iter_portfolio_data(self, portfolio: str, start_date: str = None,
+                            end_date: str = None, view_type: str = 'movimentacoes',
+                            bank: str = 'todos', operation: str = 'todos',
+                            chunk_size: int = STREAM_CHUNK_SIZE,
+                            deadline: Optional[DeadlineLike] = None
+                            ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream the rows of a portfolio view, one cleaned row at a time.
+        
+        The response body is parsed incrementally, so peak memory stays
+        bounded by chunk_size plus one row however many rows the view
+        returns (e.g. movimentacoes of long-lived portfolios). Rows go through
+        the same cleaning and per-row processing as get_portfolio_data;
+        table-wide results such as total_geral are not computed. Streamed
+        responses bypass the response cache, but go through the rate limiter,
+        the circuit breaker, the retry policy (until the body starts) and the
+        metrics like any other request.
+        
+        Args:
+            portfolio (str): Portfolio name
+            start_date (str): Start date in YYYY-MM-DD format
+            end_date (str): End date in YYYY-MM-DD format
+            view_type (str): Type of view ('movimentacoes', 'relatorio', etc.)
+            bank (str): Bank filter for transactions
+            operation (str): Operation filter for transactions
+            chunk_size (int): Bytes read from the connection at a time
+            deadline (float or Deadline, optional): Time budget in seconds for
+                the whole stream; rows yielded before it runs out are kept
+            
+        Yields:
+            tuple: (row_key, row_dict), header row (lin0) first
+            
+        Raises:
+            requests.RequestException: If the request fails, or is skipped by
+                the rate limiter or an open circuit
+            ValueError: If the response body is malformed JSON
+            DeadlineExceeded: If the deadline runs out before the last row
+        """
         # Import here to avoid circular imports
         from .data_processor import DataProcessor
-        processed_data = DataProcessor.process_response_by_view_type(
-            response, view_type, portfolio
+        from .streaming import iter_table_rows
+        
+        endpoint_key, url = self._portfolio_data_request(
+            portfolio, start_date, end_date, view_type, bank, operation
         )
+        deadline = Deadline.coerce(deadline)
+        response = self._open_stream(url, endpoint_key, deadline)
+        size = 0
         
-        if processed_data is None:
-            return None, ERROR_MESSAGES['no_data']
+        def chunks() -> Iterator[bytes]:
+            nonlocal size
+            for chunk in response.iter_content(chunk_size):
+                size += len(chunk)
+                yield chunk
             
-        return processed_data, None
+        with response:
+            # Same default as response.json() when no charset is declared
+            rows = iter_table_rows(chunks(), encoding=response.encoding or 'utf-8')
+            
+            try:
+                for row_key, row in DataProcessor.clean_rows(rows, view_type):
+                    if deadline is not None:
+                        deadline.check()
+                    yield row_key, DataProcessor.process_row_by_view_type(row_key, row, view_type)
+            except requests.RequestException:
+                # The connection broke mid-body: an upstream failure, not retried
+                self._count('failures')
+                breaker = self.circuit_breakers.get(endpoint_key)
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            finally:
+                metrics.observe('comdinheiro_response_bytes', size, endpoint=endpoint_key)
+    
+    def _open_stream(self, url: str, endpoint_key: str,
+                     deadline: Optional[Deadline] = None) -> requests.Response:
+        """
+        Open a streamed GET request, with the same guards and retries as _send_request.
+        
+        Returns:
+            requests.Response: Successful response whose body is still unread
+        
+        Raises:
+            requests.RequestException: If the request fails or is skipped
+            DeadlineExceeded: If the deadline runs out
+        """
+        max_attempts = self.retry_policy.max_attempts
+        breaker = self.circuit_breakers.get(endpoint_key)
+        
+        for attempt in range(1, max_attempts + 1):
+            timeout = request_timeout(endpoint_key, deadline)
+            
+            if not self._admit_attempt(endpoint_key, breaker, deadline):
+                raise requests.RequestException(ERROR_MESSAGES['api_error'])
+            
+            started = time.perf_counter()
+            response = None
+            
+            try:
+                response = self.session.get(url, stream=True, timeout=timeout)
+                self._record_response(endpoint_key, response, started, stream=True)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                if response is not None:
+                    response.close()
+                if self._retry_after_failure(e, endpoint_key, breaker, started,
+                                             attempt, max_attempts, deadline):
+                    continue
+                raise
+            
+            if breaker is not None:
+                breaker.record_success()
+            return response
     
-    def export_data(self, content_data: pd.DataFrame, 
-                   on_error: int = 0) -> Optional[str]:
+    def export_data(self, content_data: 'pd.DataFrame', 
+                   on_error: int = 0,
+                   deadline: Optional[DeadlineLike] = None,
+                   ledger: Optional['ExportLedger'] = None) -> Optional[str]:
         """
         Export data to Comdinheiro API.
         
+        With a ledger, rows this account exported before are left out and
+        the rows sent are recorded once the response confirms that all of
+        them were accepted (see comdinheiro.export_ledger).
+        
         Args:
             content_data (pd.DataFrame): Data to export
             on_error (int): Error handling mode
+            deadline (float or Deadline, optional): Overall time budget in seconds
+            ledger (ExportLedger, optional): Ledger of rows already exported
             
         Returns:
             str: Response message or None if error
+            
+        Raises:
+            DeadlineExceeded: If the deadline runs out
         """
-        if on_error == 1:
-            on_error = 2
+        batch = self._pending_export(content_data, ledger)
+        if batch is not None:
+            if batch.rows.empty:
+                return self._nothing_to_export(batch)
+            content_data = batch.rows
             
-        payload = {
-            **self.credentials,
-            "URL": "ComprasVendas002--0-listar-0-",
-            "format": "json",
-            "content": content_data.to_json(orient="records"),
-            "email_log": "0",
-            "on_error": on_error
-        }
+        endpoint_key, url, payload = self._export_request(content_data, on_error)
+        response = self._make_request(url, method='POST', data=payload,
+                                      endpoint_key=endpoint_key,
+                                      deadline=Deadline.coerce(deadline))
+        message = self._process_export_response(response)
         
-        url = self._build_url('export_data')
-        response = self._make_request(url, method='POST', data=payload)
+        if message is not None and batch is not None:
+            self._record_export(ledger, batch, response)
+        return message
+    
+    def export_data_bulk(self, content_data: 'pd.DataFrame',
+                         on_error: int = 0,
+                         max_bytes: int = EXPORT_CHUNK_MAX_BYTES,
+                         max_records: int = EXPORT_CHUNK_MAX_RECORDS,
+                         max_concurrency: int = EXPORT_MAX_CONCURRENCY,
+                         progress_path: Optional[str] = None,
+                         deadline: Optional[DeadlineLike] = None,
+                         ledger: Optional['ExportLedger'] = None) -> Dict[str, Any]:
+        """
+        Export a large DataFrame in size-bounded chunks, several at a time.
         
-        if response and response.get('status_code') == 200:
-            try:
-                data = response
-                if isinstance(data, dict) and "resposta" in data:
-                    for item in data["resposta"]:
-                        if isinstance(item, dict) and "Comdinheiro informa" in item:
-                            mensagem_raw = item["Comdinheiro informa"]
-                            mensagens = [m.strip() for m in mensagem_raw.split('.') if m.strip()]
-                            return "<ul>" + "".join(f"<li>{msg}.</li>" for msg in mensagens) + "</ul>"
-                return "Dados exportados com sucesso"
-            except Exception as e:
-                print(f"Erro ao processar resposta: {e}")
-                return None
-        else:
-            return None
+        With progress_path, committed chunks are recorded as they finish and
+        a later call with the same data skips them, so a failed import
+        resumes instead of starting over (see comdinheiro.bulk_export).
+        
+        Args:
+            content_data (pd.DataFrame): Data to export
+            on_error (int): Error handling mode; with 0 no new chunk is
+                started after a failed one
+            max_bytes (int): Maximum JSON bytes per chunk
+            max_records (int): Maximum records per chunk
+            max_concurrency (int): Maximum chunks uploaded at once
+            progress_path (str, optional): Progress file for resuming the export
+            deadline (float or Deadline, optional): Time budget for the whole export
+            ledger (ExportLedger, optional): Ledger of rows already exported;
+                those rows are left out and each committed chunk is recorded
+        
+        Returns:
+            dict: 'complete', 'chunks_sent', 'chunks_resumed', 'rows_sent',
+                  'rows_skipped', 'messages' and 'failed' (one entry per
+                  failed chunk)
+        
+        Example:
+            result = api.export_data_bulk(df_transactions, progress_path='import.progress')
+            if not result['complete']:
+                print(result['failed'])  # run again to resume
+        """
+        # Import here to avoid circular imports
+        from .bulk_export import bulk_export
+        return bulk_export(self, content_data, on_error, max_bytes, max_records,
+                           max_concurrency, progress_path, Deadline.coerce(deadline), ledger)
     
-    def test_connection(self) -> bool:
+    def test_connection(self, deadline: Optional[DeadlineLike] = None) -> bool:
         """
         Test API connection with current credentials.
         
+        Args:
+            deadline (float or Deadline, optional): Overall time budget in seconds
+            
         Returns:
             bool: True if connection successful, False otherwise
         """
         try:
-            portfolios = self.get_portfolio_list()
+            portfolios = self.get_portfolio_list(deadline)
             return portfolios is not None
         except Exception:
             return False
\ No newline at end of file
@@ -0,0 +1,405 @@
+"""
+Native asyncio client for Comdinheiro integration.
+
+AsyncComdinheiroAPI mirrors the public methods of ComdinheiroAPI on top of an
+aiohttp transport, so asyncio services no longer need to push blocking calls
+into thread pools. URLs, parameters and response parsing are shared with the
+synchronous client through ComdinheiroRequestBuilder.
+
+aiohttp is an optional dependency, imported when the first request is made.
+Disk cache and export ledger reads and writes are blocking file/SQLite I/O
+and run in the default executor, off the event loop. Requests use the same
+per-endpoint ENDPOINT_TIMEOUTS as the synchronous client.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple, TYPE_CHECKING
+
+from .api_client import ComdinheiroRequestBuilder
+from .cache import TTLCache
+from .disk_cache import DiskCache
+from .config import DEFAULT_VIEW_TYPE, ASYNC_MAX_CONCURRENCY
+from .deadline import request_timeout
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .export_ledger import ExportLedger
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_blocking(fn: Callable, *args: Any) -> Any:
+    """Run a blocking call in the default executor (asyncio.to_thread needs Python 3.9)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(fn, *args))
+
+
+class AsyncComdinheiroAPI(ComdinheiroRequestBuilder):
+    """
+    Asyncio Comdinheiro API client with the same methods as ComdinheiroAPI.
+
+    At most max_concurrency requests of a client are in flight at a time.
+    Use it as an async context manager, or call close() when done:
+
+        async with AsyncComdinheiroAPI(username, password) as api:
+            data, error = await api.get_portfolio_data("Carteira_Principal")
+    """
+
+    def __init__(self, username: str, password: str,
+                 max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+                 cache: Optional[TTLCache] = None,
+                 disk_cache: Optional[DiskCache] = None,
+                 base_url: Optional[str] = None,
+                 reports_base_url: Optional[str] = None):
+        """
+        Initialize the asyncio API client with credentials.
+
+        Args:
+            username (str): Comdinheiro username
+            password (str): Comdinheiro password
+            max_concurrency (int): Maximum in-flight requests for this client
+            cache (TTLCache, optional): Response cache for GET requests
+            disk_cache (DiskCache, optional): Persistent report cache
+            base_url (str, optional): Base URL of the import/export API
+            reports_base_url (str, optional): Base URL of the report endpoints
+        """
+        super().__init__(username, password, cache=cache, disk_cache=disk_cache,
+                         base_url=base_url, reports_base_url=reports_base_url)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+
+    async def __aenter__(self) -> 'AsyncComdinheiroAPI':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP session and release its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        """Create the aiohttp session on first use, inside the running loop."""
+        if self._session is None:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def _make_request(self, url: str, method: str = 'GET', data: Dict = None,
+                            endpoint_key: str = None) -> Optional[Dict]:
+        """
+        Make HTTP request to Comdinheiro API.
+
+        Args:
+            url (str): Complete URL for the request
+            method (str): HTTP method ('GET' or 'POST')
+            data (dict): Data for POST requests
+            endpoint_key (str): Key from ENDPOINTS, used to pick the cache TTL
+
+        Returns:
+            dict: Parsed response data or None if error
+        """
+        import aiohttp
+
+        if self.disk_cache is not None:
+            cache_key, cached = await _run_blocking(self._cache_lookup, url, method,
+                                                    endpoint_key)
+        else:
+            cache_key, cached = self._cache_lookup(url, method, endpoint_key)
+        if cached is not None:
+            return cached
+
+        session = self._get_session()
+        connect_timeout, read_timeout = request_timeout(endpoint_key)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        status = 'error'
+
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                if method.upper() == 'POST':
+                    form = {k: str(v) for k, v in (data or {}).items()}
+                    request = session.post(url, data=form, timeout=timeout)
+                else:
+                    request = session.get(url, timeout=timeout)
+
+                try:
+                    async with request as response:
+                        status = str(response.status)
+                        response.raise_for_status()
+                        body = await response.read()
+                        text = body.decode(response.get_encoding() or 'utf-8', errors='replace')
+                except asyncio.TimeoutError:
+                    status = 'timeout'
+                    raise
+                finally:
+                    metrics.observe('comdinheiro_request_seconds', time.perf_counter() - started,
+                                    endpoint=endpoint_key, status=status)
+                    metrics.inc('comdinheiro_requests_total', endpoint=endpoint_key, status=status)
+
+            metrics.observe('comdinheiro_response_bytes', len(body), endpoint=endpoint_key)
+
+            # Try to parse as JSON
+            try:
+                with metrics.timer('comdinheiro_decode_seconds', endpoint=endpoint_key):
+                    result = json.loads(text)
+            except ValueError:
+                # If not JSON, return raw text
+                return {'raw_response': text}
+
+            if self.disk_cache is not None:
+                await _run_blocking(self._cache_store, cache_key, endpoint_key, result,
+                                    len(body))
+            else:
+                self._cache_store(cache_key, endpoint_key, result, len(body))
+            return result
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("API request error: %s", e)
+            return None
+
+    async def get_portfolio_list(self) -> Optional[list]:
+        """
+        Get list of available portfolios and their basic information.
+
+        Returns:
+            list: List of portfolio dictionaries with name, balance, and institution
+        """
+        endpoint_key, url = self._portfolio_list_request()
+        response = await self._make_request(url, endpoint_key=endpoint_key)
+
+        if response:
+            from .data_processor import DataProcessor
+            return DataProcessor.parse_portfolio_list(response)
+        return None
+
+    async def get_balance_snapshot(self, date: str = None) -> Optional[Dict]:
+        """
+        Get the balances of every portfolio on a date from a single report call.
+
+        Snapshots are kept per date: past dates are reused as they are, the
+        current date is refreshed after BALANCE_SNAPSHOT_TTL seconds.
+
+        Args:
+            date (str): Date in YYYY-MM-DD format (default: current date)
+
+        Returns:
+            dict: Snapshot with 'balances' (name -> balance), 'index'
+                  (lowercase name -> balance) and 'first_balance', or None if error
+        """
+        return (await self._balance_snapshot(date))[0]
+
+    async def _balance_snapshot(self, date: str = None) -> Tuple[Optional[Dict], bool]:
+        """
+        Get the snapshot of get_balance_snapshot and whether the upstream call failed.
+
+        Returns:
+            tuple: (snapshot or None, True if the report request itself failed)
+        """
+        if not date:
+            date = datetime.now().strftime("%Y-%m-%d")
+
+        request = self._balance_snapshot_request(date)
+        if not request:
+            return None, False
+
+        snapshot = self._cached_snapshot(date)
+        if snapshot is not None:
+            return snapshot, False
+
+        endpoint_key, url = request
+        fetched_at = time.monotonic()
+        response = await self._make_request(url, endpoint_key=endpoint_key)
+        if response is None:
+            return None, True
+
+        return self._store_snapshot(date, response, fetched_at), False
+
+    async def get_portfolio_balance(self, portfolio: str, date: str = None) -> Optional[float]:
+        """
+        Get current balance for a specific portfolio.
+
+        As in ComdinheiroAPI, the balance is served from the all-portfolio
+        snapshot for the date; only portfolios missing from it fall back to
+        the per-portfolio report request, and a failed snapshot request gets
+        no fallback.
+
+        Args:
+            portfolio (str): Portfolio name
+            date (str): Date in YYYY-MM-DD format (default: current date)
+
+        Returns:
+            float: Portfolio balance or None if error
+        """
+        from .data_processor import DataProcessor
+
+        snapshot, failed = await self._balance_snapshot(date)
+        if failed:
+            return None
+
+        balance = DataProcessor.lookup_balance(snapshot, portfolio)
+        if balance is not None:
+            return balance
+
+        request = self._portfolio_balance_request(portfolio, date)
+        if not request:
+            return None
+
+        endpoint_key, url = request
+        response = await self._make_request(url, endpoint_key=endpoint_key)
+
+        if response:
+            return DataProcessor.parse_portfolio_balance(response, portfolio)
+        return None
+
+    async def get_asset_allocation(self, portfolio: str, end_date: str = None) -> Optional[Dict]:
+        """
+        Get asset allocation data for a portfolio.
+
+        The allocation report, balance and performance data are fetched
+        concurrently; a failed balance or performance call is treated as
+        missing data.
+
+        Args:
+            portfolio (str): Portfolio name
+            end_date (str): End date in YYYY-MM-DD format
+
+        Returns:
+            dict: Asset allocation data with allocations, balance, and performance
+        """
+        if not end_date:
+            end_date = datetime.now().strftime("%Y-%m-%d")
+
+        request = self._asset_allocation_request(portfolio, end_date)
+        if not request:
+            return None
+
+        endpoint_key, url = request
+        allocation_response, balance, performance_data = await asyncio.gather(
+            self._make_request(url, endpoint_key=endpoint_key),
+            self.get_portfolio_balance(portfolio, end_date),
+            self.get_performance_data(portfolio, end_date),
+            return_exceptions=True
+        )
+
+        if isinstance(allocation_response, BaseException):
+            raise allocation_response
+        if not allocation_response:
+            return None
+
+        # Balance and performance are optional parts of the result
+        if isinstance(balance, BaseException):
+            balance = None
+        if isinstance(performance_data, BaseException):
+            performance_data = None
+
+        from .data_processor import DataProcessor
+        return DataProcessor.parse_asset_allocation(
+            allocation_response, balance, performance_data
+        )
+
+    async def get_performance_data(self, portfolio: str, end_date: str = None,
+                                   start_date: str = None) -> Optional[Dict]:
+        """
+        Get performance/rentability data for a portfolio.
+
+        Args:
+            portfolio (str): Portfolio name
+            end_date (str): End date in YYYY-MM-DD format
+            start_date (str): Start date in YYYY-MM-DD format (default: 6 months before end_date)
+
+        Returns:
+            dict: Performance data including annual and 3-month returns
+        """
+        request = self._performance_request(portfolio, end_date, start_date)
+        if not request:
+            return None
+
+        endpoint_key, url = request
+        response = await self._make_request(url, endpoint_key=endpoint_key)
+
+        if response:
+            from .data_processor import DataProcessor
+            return DataProcessor.parse_performance_data(response)
+        return None
+
+    async def get_portfolio_data(self, portfolio: str, start_date: str = None,
+                                 end_date: str = None, view_type: str = DEFAULT_VIEW_TYPE,
+                                 bank: str = 'todos', operation: str = 'todos') -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Get comprehensive portfolio data based on view type.
+
+        Args:
+            portfolio (str): Portfolio name
+            start_date (str): Start date in YYYY-MM-DD format
+            end_date (str): End date in YYYY-MM-DD format
+            view_type (str): Type of view ('consolidado', 'relatorio', 'movimentacoes', etc.)
+            bank (str): Bank filter for transactions
+            operation (str): Operation filter for transactions
+
+        Returns:
+            tuple: (data_dict, error_message) - data_dict is None if error occurred
+        """
+        endpoint_key, url = self._portfolio_data_request(
+            portfolio, start_date, end_date, view_type, bank, operation
+        )
+
+        response = await self._make_request(url, endpoint_key=endpoint_key)
+        return self._process_portfolio_data(response, view_type, portfolio)
+
+    async def export_data(self, content_data: 'pd.DataFrame',
+                          on_error: int = 0,
+                          ledger: Optional['ExportLedger'] = None) -> Optional[str]:
+        """
+        Export data to Comdinheiro API.
+
+        Args:
+            content_data (pd.DataFrame): Data to export
+            on_error (int): Error handling mode
+            ledger (ExportLedger, optional): Ledger of rows already exported;
+                those rows are left out and the rows sent are recorded once
+                the response confirms them
+
+        Returns:
+            str: Response message or None if error
+        """
+        batch = None
+        if ledger is not None:
+            batch = await _run_blocking(self._pending_export, content_data, ledger)
+        if batch is not None:
+            if batch.rows.empty:
+                return self._nothing_to_export(batch)
+            content_data = batch.rows
+
+        endpoint_key, url, payload = self._export_request(content_data, on_error)
+        response = await self._make_request(url, method='POST', data=payload,
+                                            endpoint_key=endpoint_key)
+        message = self._process_export_response(response)
+
+        if message is not None and batch is not None:
+            await _run_blocking(self._record_export, ledger, batch, response)
+        return message
+
+    async def test_connection(self) -> bool:
+        """
+        Test API connection with current credentials.
+
+        Returns:
+            bool: True if connection successful, False otherwise
+        """
+        try:
+            portfolios = await self.get_portfolio_list()
+            return portfolios is not None
+        except Exception:
+            return False
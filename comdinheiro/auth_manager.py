@@ -5,9 +5,55 @@ This module centralizes all authentication logic, replacing the scattered
 credential management patterns with a clean, secure interface.
 """
 
+import os
+import threading
 from typing import Tuple, Optional
 from flask import session
 
+from .cache import TTLCache
+from .config import (
+    CREDENTIALS_CACHE_TTL, CREDENTIALS_CACHE_MAX_ENTRIES,
+    DB_POOL_MIN_CONNECTIONS, DB_POOL_MAX_CONNECTIONS
+)
+
+# Credentials found per user email, shared by every request of the process
+_credentials_cache = TTLCache(max_entries=CREDENTIALS_CACHE_MAX_ENTRIES)
+
+# Process-wide pool of credentials database connections, created on first use
+_db_pool = None
+_db_pool_pid = None
+_db_pool_lock = threading.Lock()
+
+
+def _db_params() -> dict:
+    """Get the credentials database connection parameters from the environment."""
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'database': os.getenv('DB_NAME', 'dashboard_reino'),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'password': os.getenv('DB_PASSWORD', ''),
+        'port': os.getenv('DB_PORT', '5432')
+    }
+
+
+def _get_db_pool():
+    """
+    Get the process-wide ThreadedConnectionPool, creating it if needed.
+    
+    Connections must not be shared across fork (the wrapper server forks its
+    workers), so a child process builds its own pool and leaves the parent's
+    connections untouched.
+    """
+    global _db_pool, _db_pool_pid
+    
+    with _db_pool_lock:
+        if _db_pool is None or _db_pool_pid != os.getpid():
+            from psycopg2.pool import ThreadedConnectionPool
+            _db_pool = ThreadedConnectionPool(DB_POOL_MIN_CONNECTIONS, DB_POOL_MAX_CONNECTIONS,
+                                              **_db_params())
+            _db_pool_pid = os.getpid()
+        return _db_pool
+
 
 class AuthManager:
     """
@@ -78,24 +124,51 @@ class AuthManager:
         if not user_email:
             return None, None
             
+        cached = _credentials_cache.get(user_email)
+        if cached is not None:
+            return cached
+            
         try:
             # Try to import consulta_bd if available
             try:
                 from consulta_bd import get_comdinheiro_credentials
-                return get_comdinheiro_credentials(user_email)
+                credentials = get_comdinheiro_credentials(user_email)
             except ImportError:
                 # Fallback implementation if consulta_bd is not available
-                return AuthManager._get_credentials_fallback(user_email)
+                credentials = AuthManager._get_credentials_fallback(user_email)
         except Exception as e:
             print(f"Error getting credentials: {e}")
             return None, None
+            
+        # Only found credentials are cached, so new users work right away
+        if credentials and credentials[0] and credentials[1]:
+            _credentials_cache.set(user_email, tuple(credentials), CREDENTIALS_CACHE_TTL)
+        return credentials
+    
+    @staticmethod
+    def invalidate_credentials(user_email: str = None) -> None:
+        """
+        Drop cached Comdinheiro credentials.
+        
+        Call it whenever credentials are changed from this process, so the
+        next lookup reads them from the database instead of waiting for
+        CREDENTIALS_CACHE_TTL. Changes made elsewhere (e.g. by the Node
+        side) are picked up once the cached entry expires.
+        
+        Args:
+            user_email (str, optional): User whose credentials changed. If
+                None, every cached credential is dropped.
+        """
+        _credentials_cache.invalidate(user_email)
     
     @staticmethod
     def _get_credentials_fallback(user_email: str) -> Tuple[Optional[str], Optional[str]]:
         """
         Fallback method to get credentials when consulta_bd is not available.
         
-        This method should query the database directly using a standard connection.
+        This method queries the database directly, on a connection borrowed
+        from the process-wide pool (a one-off connection when the pool is
+        exhausted).
         
         Args:
             user_email (str): User email
@@ -103,32 +176,42 @@ class AuthManager:
         Returns:
             tuple: (username, password) or (None, None) if not found
         """
+        query = """
+            SELECT comdinheiro_username, comdinheiro_password 
+            FROM comdinheiro_credenciais 
+            WHERE salesforce_user_id = %s
+        """
+        
         try:
             import psycopg2
-            import os
-            
-            # Get database connection parameters from environment or config
-            db_params = {
-                'host': os.getenv('DB_HOST', 'localhost'),
-                'database': os.getenv('DB_NAME', 'dashboard_reino'),
-                'user': os.getenv('DB_USER', 'postgres'),
-                'password': os.getenv('DB_PASSWORD', ''),
-                'port': os.getenv('DB_PORT', '5432')
-            }
+            from psycopg2.pool import PoolError
             
-            with psycopg2.connect(**db_params) as conn:
-                with conn.cursor() as cursor:
-                    query = """
-                        SELECT comdinheiro_username, comdinheiro_password 
-                        FROM comdinheiro_credenciais 
-                        WHERE salesforce_user_id = %s
-                    """
-                    cursor.execute(query, (user_email,))
-                    result = cursor.fetchone()
+            pool = _get_db_pool()
+            try:
+                conn = pool.getconn()
+            except PoolError:
+                with psycopg2.connect(**_db_params()) as conn:
+                    with conn.cursor() as cursor:
+                        cursor.execute(query, (user_email,))
+                        result = cursor.fetchone()
+                conn.close()
+            else:
+                broken = False
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(query, (user_email,))
+                        result = cursor.fetchone()
+                    # End the read transaction before handing the connection back
+                    conn.rollback()
+                except Exception:
+                    broken = True
+                    raise
+                finally:
+                    pool.putconn(conn, close=broken)
                     
-                    if result:
-                        return result[0], result[1]
-                    return None, None
+            if result:
+                return result[0], result[1]
+            return None, None
                     
         except Exception as e:
             print(f"Error getting credentials: {e}")
@@ -156,6 +239,9 @@ class AuthManager:
         """
         Create a ComdinheiroAPI client with current user's credentials.
         
+        The client is taken from the shared registry, so it is reused (along
+        with its pooled connections) across requests of the same user.
+        
         Returns:
             ComdinheiroAPI: Authenticated API client or None if no credentials
         """
@@ -164,8 +250,8 @@ class AuthManager:
         if not username or not password:
             return None
             
-        from .api_client import ComdinheiroAPI
-        return ComdinheiroAPI(username, password)
+        from .client_registry import get_client
+        return get_client(username, password)
     
     @staticmethod
     def has_permission(required_group: str = 'convidado') -> bool:
@@ -0,0 +1,272 @@
+"""
+Chunked, parallel and resumable bulk export (EndPoint001.php export_data).
+
+export_data serializes a whole DataFrame into one form field and sends it in
+one POST, so large transaction imports hit the upstream request size limit
+or time out, and a failure means starting over. A bulk export splits the
+records into chunks bounded in bytes and records, serializes them a batch of
+rows at a time while the upload goes on, sends up to max_concurrency chunks
+at once and writes every committed chunk to a progress file, so a failed
+import resumes from the chunks still missing.
+
+Chunks are deterministic for a given DataFrame and chunk limits; the
+progress file stores a fingerprint of both and is ignored when they change.
+With an ExportLedger, rows exported before are left out and the rows of each
+chunk whose response confirms them are recorded, so a resumed import also
+skips them without a progress file.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set
+
+import pandas as pd
+
+from .config import (
+    EXPORT_CHUNK_MAX_BYTES, EXPORT_CHUNK_MAX_RECORDS, EXPORT_MAX_CONCURRENCY,
+    EXPORT_SERIALIZE_BATCH_ROWS, ERROR_MESSAGES
+)
+from .deadline import Deadline, DeadlineExceeded
+from .metrics import metrics
+
+
+class ExportChunk(NamedTuple):
+    """Records sent in one export POST."""
+
+    index: int
+    first_row: int  # position of the first record in the DataFrame
+    rows: int
+    content: str  # JSON array, as DataFrame.to_json(orient="records")
+
+
+def iter_export_chunks(content_data: pd.DataFrame,
+                       max_bytes: int = EXPORT_CHUNK_MAX_BYTES,
+                       max_records: int = EXPORT_CHUNK_MAX_RECORDS,
+                       batch_rows: int = EXPORT_SERIALIZE_BATCH_ROWS) -> Iterator[ExportChunk]:
+    """
+    Split a DataFrame into size-bounded JSON chunks.
+
+    Rows are serialized batch_rows at a time, so only one batch and one chunk
+    are held as JSON. Joined back together, the chunks give exactly
+    content_data.to_json(orient="records"). A single record larger than
+    max_bytes is sent in a chunk of its own.
+
+    Args:
+        content_data (pd.DataFrame): Records to export
+        max_bytes (int): Maximum JSON bytes per chunk
+        max_records (int): Maximum records per chunk
+        batch_rows (int): Rows serialized at a time
+
+    Yields:
+        ExportChunk: Chunks in row order
+    """
+    index = 0
+    first_row = 0
+    records: List[str] = []
+    size = 2  # the enclosing brackets
+
+    for start in range(0, len(content_data), max(1, batch_rows)):
+        batch = content_data.iloc[start:start + batch_rows]
+        # One record per line; newlines inside values are escaped by the JSON encoder
+        for record in batch.to_json(orient="records", lines=True).split('\n'):
+            if not record:
+                continue
+            # to_json escapes non-ASCII characters, so characters are bytes
+            record_size = len(record) + (1 if records else 0)
+            if records and (size + record_size > max_bytes or len(records) >= max_records):
+                yield ExportChunk(index, first_row, len(records), f"[{','.join(records)}]")
+                index += 1
+                first_row += len(records)
+                records = []
+                size = 2
+                record_size = len(record)
+            records.append(record)
+            size += record_size
+
+    if records:
+        yield ExportChunk(index, first_row, len(records), f"[{','.join(records)}]")
+
+
+def export_fingerprint(content_data: pd.DataFrame, max_bytes: int, max_records: int) -> str:
+    """
+    Identify a DataFrame and the chunk limits it is split with.
+
+    Returns:
+        str: SHA-256 hex digest of the row hashes, columns and limits
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([list(map(str, content_data.columns)), max_bytes, max_records])
+                  .encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(content_data, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class ExportProgress:
+    """
+    Committed chunks of a bulk export, kept in a JSON file.
+
+    The file is rewritten atomically after each committed chunk and removed
+    once the export completes. Without a path, progress is only kept in
+    memory.
+    """
+
+    def __init__(self, path: Optional[str], fingerprint: str):
+        """
+        Load the progress of an export, if the file belongs to the same export.
+
+        Args:
+            path (str, optional): Progress file path
+            fingerprint (str): export_fingerprint of the export
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.committed: Set[int] = set()
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    saved = json.load(f)
+                if saved.get('fingerprint') == fingerprint:
+                    self.committed = set(saved.get('committed', []))
+            except (OSError, ValueError):
+                self.committed = set()
+
+    def commit(self, chunk: ExportChunk) -> None:
+        """Record a chunk accepted upstream."""
+        with self._lock:
+            self.committed.add(chunk.index)
+            if not self.path:
+                return
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            temp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'fingerprint': self.fingerprint,
+                           'committed': sorted(self.committed)}, f)
+            os.replace(temp_path, self.path)
+
+    def finish(self) -> None:
+        """Drop the progress file of a completed export."""
+        with self._lock:
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def bulk_export(api, content_data: pd.DataFrame, on_error: int = 0,
+                max_bytes: int = EXPORT_CHUNK_MAX_BYTES,
+                max_records: int = EXPORT_CHUNK_MAX_RECORDS,
+                max_concurrency: int = EXPORT_MAX_CONCURRENCY,
+                progress_path: Optional[str] = None,
+                deadline: Optional[Deadline] = None,
+                ledger=None) -> Dict[str, Any]:
+    """
+    Export a DataFrame in chunks with bounded concurrency.
+
+    on_error keeps its export_data meaning for the records of each chunk,
+    and also applies between chunks: with 0 (stop on error) no new chunk is
+    started after a failed one, otherwise the remaining chunks are still
+    sent. Chunks already committed in progress_path are skipped. When the
+    deadline runs out, chunks not sent in time are left for the next run.
+
+    Args:
+        api (ComdinheiroAPI): Client used for the uploads
+        content_data (pd.DataFrame): Records to export
+        on_error (int): Error handling mode
+        max_bytes (int): Maximum JSON bytes per chunk
+        max_records (int): Maximum records per chunk
+        max_concurrency (int): Maximum chunks uploaded at once
+        progress_path (str, optional): Progress file for resuming the export
+        deadline (Deadline, optional): Time budget for the whole export
+        ledger (ExportLedger, optional): Ledger of rows already exported
+
+    Returns:
+        dict: 'complete', 'chunks_sent', 'chunks_resumed', 'rows_sent',
+              'rows_skipped' (already in the ledger), 'messages' (upstream
+              message per chunk sent, in chunk order) and 'failed' (chunk,
+              first_row, rows and error per failed chunk)
+    """
+    batch = api._pending_export(content_data, ledger)
+    if batch is not None:
+        content_data = batch.rows
+
+    progress = ExportProgress(progress_path,
+                              export_fingerprint(content_data, max_bytes, max_records))
+    chunks = iter_export_chunks(content_data, max_bytes, max_records)
+    max_concurrency = max(1, max_concurrency)
+
+    def upload(chunk: ExportChunk) -> Optional[str]:
+        endpoint_key, url, payload = api._export_content_request(chunk.content, on_error)
+        response = api._make_request(url, method='POST', data=payload,
+                                     endpoint_key=endpoint_key, deadline=deadline)
+        message = api._process_export_response(response)
+        if message is not None and batch is not None:
+            api._record_export(ledger, batch, response, chunk.first_row,
+                               chunk.first_row + chunk.rows)
+        return message
+
+    result: Dict[str, Any] = {'complete': False, 'chunks_sent': 0, 'chunks_resumed': 0,
+                              'rows_sent': 0, 'rows_skipped': batch.skipped if batch else 0,
+                              'messages': [], 'failed': []}
+    messages: Dict[int, str] = {}
+    stopped = False
+    exhausted = False
+    in_flight = {}
+
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    try:
+        while True:
+            while not stopped and len(in_flight) < max_concurrency:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                if chunk.index in progress.committed:
+                    result['chunks_resumed'] += 1
+                    metrics.inc('comdinheiro_export_chunks_total', status='resumed')
+                    continue
+                in_flight[executor.submit(upload, chunk)] = chunk
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = in_flight.pop(future)
+                try:
+                    message = future.result()
+                    error = None if message is not None else ERROR_MESSAGES['api_error']
+                except DeadlineExceeded:
+                    message, error = None, ERROR_MESSAGES['deadline_exceeded']
+                    stopped = True
+                except Exception as e:
+                    message, error = None, str(e)
+
+                if error is None:
+                    progress.commit(chunk)
+                    messages[chunk.index] = message
+                    result['chunks_sent'] += 1
+                    result['rows_sent'] += chunk.rows
+                    metrics.inc('comdinheiro_export_chunks_total', status='committed')
+                else:
+                    result['failed'].append({'chunk': chunk.index, 'first_row': chunk.first_row,
+                                             'rows': chunk.rows, 'error': error})
+                    metrics.inc('comdinheiro_export_chunks_total', status='failed')
+                    if on_error == 0:
+                        stopped = True
+    finally:
+        # shutdown(cancel_futures=True) needs Python 3.9
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    result['messages'] = [messages[index] for index in sorted(messages)]
+    result['failed'].sort(key=lambda failure: failure['chunk'])
+    result['complete'] = exhausted and not result['failed']
+    if result['complete']:
+        progress.finish()
+    return result
@@ -0,0 +1,177 @@
+"""
+In-process TTL + LRU cache for Comdinheiro API responses.
+
+Report URLs such as RelatorioGerencialCarteiras001.php are requested again and
+again within minutes. This module provides a small thread-safe cache bounded
+both by entry count and by total payload bytes, with per-entry expiration and
+hit/miss counters.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES
+
+
+def canonical_url(url: str) -> str:
+    """
+    Build a canonical form of a URL for use as a cache key.
+
+    Query parameters are sorted so that equivalent requests built with a
+    different parameter order map to the same key. URLs built from a request
+    plan already carry their canonical form, which is returned as is.
+
+    Args:
+        url (str): URL as built by ComdinheiroAPI._build_url
+
+    Returns:
+        str: Canonical URL
+    """
+    cache_key = getattr(url, 'cache_key', None)
+    if cache_key is not None:
+        return cache_key
+
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+
+
+def credential_key(username: str, password: str) -> str:
+    """
+    Build a stable key for a set of credentials without keeping the raw password.
+
+    Args:
+        username (str): Comdinheiro username
+        password (str): Comdinheiro password
+
+    Returns:
+        str: Hex digest identifying the credentials
+    """
+    raw = f"{username}\0{password}".encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry time-to-live.
+
+    Entries are evicted least recently used first whenever the cache exceeds
+    max_entries or max_bytes. Expired entries are dropped on access.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of entries
+            max_bytes (int): Maximum total size of the cached payloads
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Cached value or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: float, size: int = 0) -> None:
+        """
+        Store a value.
+
+        Args:
+            key (str): Cache key
+            value: Value to cache
+            ttl (float): Time to live in seconds
+            size (int): Payload size in bytes, used for the byte bound
+        """
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, time.monotonic() + ttl, size)
+            self._bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: str = None) -> None:
+        """
+        Drop one entry, or every entry when no key is given.
+
+        Args:
+            key (str, optional): Cache key to drop
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hits, misses, hit ratio, evictions, entries and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry; must be called with the lock held."""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,174 @@
+"""
+Shared registry of long-lived ComdinheiroAPI clients.
+
+Creating a ComdinheiroAPI per call means a new requests.Session, and with it a
+fresh TCP+TLS handshake for every request. This module keeps one client per set
+of credentials alive across calls so that repeated dashboard requests reuse
+warm keep-alive connections.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from .api_client import ComdinheiroAPI
+from .cache import TTLCache, credential_key
+from .config import CLIENT_IDLE_TIMEOUT, CLIENT_REGISTRY_MAX_SIZE
+
+
+class ClientRegistry:
+    """
+    Thread-safe registry handing out long-lived ComdinheiroAPI clients.
+
+    Clients are keyed by credentials, evicted after sitting idle for
+    idle_timeout seconds and bounded to max_size entries (least recently
+    used first). Evicted clients have their sessions closed.
+    """
+
+    def __init__(self, idle_timeout: float = CLIENT_IDLE_TIMEOUT,
+                 max_size: int = CLIENT_REGISTRY_MAX_SIZE, cache_responses: bool = False,
+                 **client_options: Any):
+        """
+        Initialize the registry.
+
+        Args:
+            idle_timeout (float): Seconds without use before a client is evicted
+            max_size (int): Maximum number of clients kept alive
+            cache_responses (bool): Give each new client its own response cache
+            **client_options: Extra keyword arguments for ComdinheiroAPI
+                              (e.g. pool_connections, pool_maxsize)
+        """
+        self.idle_timeout = idle_timeout
+        self.max_size = max_size
+        self.cache_responses = cache_responses
+        self.client_options = client_options
+        self._clients: "OrderedDict[str, Tuple[ComdinheiroAPI, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str, password: str) -> ComdinheiroAPI:
+        """
+        Get the shared client for the given credentials, creating it if needed.
+
+        Args:
+            username (str): Comdinheiro username
+            password (str): Comdinheiro password
+
+        Returns:
+            ComdinheiroAPI: Long-lived API client
+        """
+        key = credential_key(username, password)
+        now = time.monotonic()
+
+        with self._lock:
+            expired = self._pop_idle(now)
+            entry = self._clients.pop(key, None)
+            client = entry[0] if entry else self._create_client(username, password)
+            self._clients[key] = (client, now)
+
+            while len(self._clients) > self.max_size:
+                _, (oldest, _) = self._clients.popitem(last=False)
+                expired.append(oldest)
+
+        self._close_all(expired)
+        return client
+
+    def evict_idle(self) -> int:
+        """
+        Close and drop clients that have been idle longer than idle_timeout.
+
+        Returns:
+            int: Number of evicted clients
+        """
+        with self._lock:
+            expired = self._pop_idle(time.monotonic())
+
+        self._close_all(expired)
+        return len(expired)
+
+    def remove(self, username: str, password: str) -> bool:
+        """
+        Close and drop the client for the given credentials.
+
+        Returns:
+            bool: True if a client was registered for these credentials
+        """
+        with self._lock:
+            entry = self._clients.pop(credential_key(username, password), None)
+
+        if entry:
+            self._close_all([entry[0]])
+        return entry is not None
+
+    def clear(self) -> None:
+        """Close and drop every registered client."""
+        with self._lock:
+            clients = [client for client, _ in self._clients.values()]
+            self._clients.clear()
+
+        self._close_all(clients)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get registry size and configuration."""
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'max_size': self.max_size,
+                'idle_timeout': self.idle_timeout
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def _create_client(self, username: str, password: str) -> ComdinheiroAPI:
+        """Create a client; each one gets its own cache so accounts never share data."""
+        options = dict(self.client_options)
+        if self.cache_responses:
+            options.setdefault('cache', TTLCache())
+        return ComdinheiroAPI(username, password, **options)
+
+    def _pop_idle(self, now: float) -> List[ComdinheiroAPI]:
+        """Remove idle entries; must be called with the lock held."""
+        expired = []
+
+        # Entries are kept in last-used order, so idle ones are at the front
+        while self._clients:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if now - last_used < self.idle_timeout:
+                break
+            del self._clients[key]
+            expired.append(client)
+
+        return expired
+
+    @staticmethod
+    def _close_all(clients: List[ComdinheiroAPI]) -> None:
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+
+# Process-wide registry used by the simplified interface
+_default_registry = ClientRegistry()
+
+
+def get_default_registry() -> ClientRegistry:
+    """Get the process-wide client registry."""
+    return _default_registry
+
+
+def get_client(username: str, password: str) -> ComdinheiroAPI:
+    """
+    Get a shared, long-lived ComdinheiroAPI client for the given credentials.
+
+    Args:
+        username (str): Comdinheiro username
+        password (str): Comdinheiro password
+
+    Returns:
+        ComdinheiroAPI: API client reused across calls
+    """
+    return _default_registry.get(username, password)
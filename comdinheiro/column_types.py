@@ -0,0 +1,258 @@
+"""
+Per-column type inference and conversion for report tables.
+
+Instead of guessing for every cell whether it holds a number, each column's
+type is decided once per table: from the per-view schema in config when the
+column is known, otherwise from its header label and a sample of its values.
+Every column is then converted by a single converter for its type, so a text
+column (asset codes, account numbers...) never turns into a mix of strings and
+floats from row to row.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .columnar import ColumnarTable, HEADER_KEY, MISSING
+from .config import (
+    COLUMN_TYPE_TEXT, COLUMN_TYPE_NUMBER, VIEW_COLUMN_SCHEMAS, DEFAULT_COLUMN_SCHEMA,
+    COLUMN_TEXT_HEADER_HINTS, COLUMN_EMPTY_PLACEHOLDERS, COLUMN_TYPE_SAMPLE_SIZE
+)
+from .data_processor import DataProcessor
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def looks_numeric(value: str) -> bool:
+    """
+    Check whether a decoded cell holds a Brazilian-formatted number.
+
+    Args:
+        value (str): Decoded cell text
+
+    Returns:
+        bool: True for values such as "1.234,56" or "-12"
+    """
+    return value.replace('.', '').replace(',', '').replace('-', '').isdigit()
+
+
+def column_schema(view_type: str = None) -> Dict[str, str]:
+    """
+    Get the known column types for a view type.
+
+    Args:
+        view_type (str): View type ('relatorio', 'consolidado', ...)
+
+    Returns:
+        dict: Column key -> column type
+    """
+    schema = dict(DEFAULT_COLUMN_SCHEMA)
+    schema.update(VIEW_COLUMN_SCHEMAS.get(view_type, {}))
+    return schema
+
+
+def infer_column_type(values: Iterable[Any], label: Any = None,
+                      sample_size: int = COLUMN_TYPE_SAMPLE_SIZE) -> str:
+    """
+    Infer a column type from its header label and a sample of its values.
+
+    A column is text when its label contains a text hint (e.g. "Código") or
+    when any sampled value is not a number. Absent cells and placeholders
+    such as "" or "nd" are not counted.
+
+    Args:
+        values (iterable): Raw column values (MISSING for absent cells)
+        label: Header label of the column
+        sample_size (int): Maximum number of values to inspect
+
+    Returns:
+        str: COLUMN_TYPE_TEXT or COLUMN_TYPE_NUMBER
+    """
+    if isinstance(label, str):
+        words = _WORD_PATTERN.findall(DataProcessor.decode_special_characters(label).lower())
+        if any(hint in words for hint in COLUMN_TEXT_HEADER_HINTS):
+            return COLUMN_TYPE_TEXT
+
+    sampled = 0
+    for value in values:
+        if value is MISSING:
+            continue
+
+        if isinstance(value, str):
+            decoded_value = DataProcessor.decode_special_characters(value)
+            if decoded_value.lower() in COLUMN_EMPTY_PLACEHOLDERS:
+                continue
+            if not looks_numeric(decoded_value):
+                return COLUMN_TYPE_TEXT
+
+        sampled += 1
+        if sampled >= sample_size:
+            break
+
+    return COLUMN_TYPE_NUMBER
+
+
+def infer_column_types(header: Optional[Dict[str, Any]], rows: List[Dict[str, Any]],
+                       view_type: str = None) -> Dict[str, str]:
+    """
+    Infer the type of every column seen in a header and a sample of rows.
+
+    Args:
+        header (dict): Raw header row (lin0) or None
+        rows (list): Sample of raw rows
+        view_type (str): View type, used to pick the schema
+
+    Returns:
+        dict: Column key -> column type
+    """
+    column_types = column_schema(view_type)
+    header = header or {}
+
+    for col_key in _column_keys(header, rows):
+        if col_key not in column_types:
+            column_types[col_key] = infer_column_type(
+                (row.get(col_key, MISSING) for row in rows), header.get(col_key)
+            )
+
+    return column_types
+
+
+def convert_header(header: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode a header row; header labels are always text."""
+    decode = DataProcessor.decode_special_characters
+    return {col_key: decode(value) if isinstance(value, str) else value
+            for col_key, value in header.items()}
+
+
+def convert_row(row: Dict[str, Any], column_types: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Convert one raw row with the converter of each column's type.
+
+    Columns without a known type use the number converter, which only parses
+    cells that look numeric (the historical behaviour).
+
+    Args:
+        row (dict): Raw row (colN -> value)
+        column_types (dict): Column key -> column type
+
+    Returns:
+        dict: Converted row
+    """
+    decode = DataProcessor.decode_special_characters
+    converted = {}
+
+    for col_key, value in row.items():
+        if not isinstance(value, str):
+            converted[col_key] = value
+            continue
+
+        decoded_value = decode(value)
+        if column_types.get(col_key) != COLUMN_TYPE_TEXT and looks_numeric(decoded_value):
+            try:
+                converted[col_key] = float(decoded_value.replace('.', '').replace(',', '.'))
+            except ValueError:
+                converted[col_key] = 0.0
+        else:
+            converted[col_key] = decoded_value
+
+    return converted
+
+
+def build_columnar_table(table_data: Dict[str, Dict[str, Any]], view_type: str = None,
+                         sample_size: int = COLUMN_TYPE_SAMPLE_SIZE) -> ColumnarTable:
+    """
+    Build a typed ColumnarTable straight from a raw API table.
+
+    Args:
+        table_data (dict): Raw table (lin/col) from the API
+        view_type (str): View type, used to pick the schema
+        sample_size (int): Values sampled per column when inferring its type
+
+    Returns:
+        ColumnarTable: Table with one converted column per column key
+    """
+    raw_header = table_data.get(HEADER_KEY)
+    header = convert_header(raw_header) if raw_header is not None else None
+    row_keys = [key for key in table_data if key != HEADER_KEY]
+    rows = [table_data[key] for key in row_keys]
+
+    schema = column_schema(view_type)
+    columns = {}
+    overrides = {}
+
+    for col_key in _column_keys(raw_header or {}, rows):
+        values = [row.get(col_key, MISSING) for row in rows]
+        column_type = schema.get(col_key) or infer_column_type(
+            values, (raw_header or {}).get(col_key), sample_size
+        )
+
+        if column_type == COLUMN_TYPE_TEXT:
+            columns[col_key] = _convert_text_column(values)
+        else:
+            columns[col_key], column_overrides = _convert_number_column(values)
+            if column_overrides:
+                overrides[col_key] = column_overrides
+
+    return ColumnarTable(header, row_keys, columns, overrides)
+
+
+def _column_keys(header: Dict[str, Any], rows: List[Dict[str, Any]]) -> List[str]:
+    """Column keys in header order, followed by any extra keys found in rows."""
+    column_keys = list(header)
+    seen = set(column_keys)
+
+    for row in rows:
+        for col_key in row:
+            if col_key not in seen:
+                seen.add(col_key)
+                column_keys.append(col_key)
+
+    return column_keys
+
+
+def _convert_text_column(values: List[Any]) -> List[Any]:
+    """Decode every text cell of a column."""
+    decode = DataProcessor.decode_special_characters
+    return [decode(value) if isinstance(value, str) else value for value in values]
+
+
+def _convert_number_column(values: List[Any]) -> Tuple[Any, Optional[Dict[int, Any]]]:
+    """
+    Convert a number column to a float array.
+
+    Cells that are not numbers (empty, placeholders, absent) keep their
+    decoded value in the overrides and hold NaN in the array. A column
+    without any number is returned as a list of decoded values.
+    """
+    decode = DataProcessor.decode_special_characters
+    text_positions = []
+    text_values = []
+    number_positions = []
+    number_values = []
+    overrides = {}
+
+    for index, value in enumerate(values):
+        if isinstance(value, str):
+            decoded_value = decode(value)
+            if looks_numeric(decoded_value):
+                text_positions.append(index)
+                text_values.append(decoded_value)
+            else:
+                overrides[index] = decoded_value
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            number_positions.append(index)
+            number_values.append(value)
+        else:
+            overrides[index] = value
+
+    if not text_positions and not number_positions:
+        return [overrides[index] for index in range(len(values))], None
+
+    array = np.full(len(values), np.nan, dtype=np.float64)
+    if text_positions:
+        array[text_positions] = DataProcessor.parse_brazilian_currency_many(text_values)
+    if number_positions:
+        array[number_positions] = number_values
+
+    return array, overrides
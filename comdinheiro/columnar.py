@@ -0,0 +1,288 @@
+"""
+Columnar representation of Comdinheiro report tables.
+
+Report views return tables as ``{'lin0': header, 'lin1': {'col0': ...}, ...}``:
+one dict per row, with the ``colN`` keys repeated on every row. ColumnarTable
+keeps the header once and one array per column (NumPy float arrays for numeric
+columns), so totals and per-row calculations become vectorized column
+operations. to_rows() and legacy_view() give existing callers the legacy
+``lin/col`` shape back.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+HEADER_KEY = 'lin0'
+
+
+class _Missing:
+    """Marker for a cell that is absent from its row."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return '<missing>'
+
+
+MISSING = _Missing()
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ColumnarTable:
+    """
+    Column-oriented report table.
+
+    Attributes:
+        header (dict): Header row (lin0) or None when the table has no header
+        row_keys (list): Row keys ('lin1', 'lin2', ...) in order
+        columns (dict): Column key -> np.ndarray (numeric) or list (other)
+        overrides (dict): Column key -> {row index: value} for cells of a
+                          numeric column that are not numbers (empty strings,
+                          absent cells); their array slot holds NaN
+    """
+
+    def __init__(self, header: Optional[Dict[str, Any]], row_keys: List[str],
+                 columns: Dict[str, Any], overrides: Dict[str, Dict[int, Any]] = None):
+        self.header = header
+        self.row_keys = row_keys
+        self.columns = columns
+        self.overrides = overrides or {}
+
+    @classmethod
+    def from_rows(cls, table_data: Dict[str, Dict[str, Any]]) -> 'ColumnarTable':
+        """
+        Build a columnar table from a legacy ``lin/col`` table.
+
+        A column becomes a float array when it holds at least one number and
+        its other cells are empty strings or absent; anything else is kept as
+        a list of the original values.
+
+        Args:
+            table_data (dict): Legacy table (already cleaned)
+
+        Returns:
+            ColumnarTable: Columnar table
+        """
+        header = table_data.get(HEADER_KEY)
+        row_keys = [key for key in table_data if key != HEADER_KEY]
+        rows = [table_data[key] for key in row_keys]
+
+        column_keys = list(header) if header else []
+        seen = set(column_keys)
+        for row in rows:
+            for col_key in row:
+                if col_key not in seen:
+                    seen.add(col_key)
+                    column_keys.append(col_key)
+
+        columns = {}
+        overrides = {}
+        for col_key in column_keys:
+            values = [row.get(col_key, MISSING) for row in rows]
+            columns[col_key], column_overrides = cls._type_column(values)
+            if column_overrides:
+                overrides[col_key] = column_overrides
+
+        return cls(header, row_keys, columns, overrides)
+
+    @staticmethod
+    def _type_column(values: List[Any]):
+        """Turn a list of cell values into a float array when possible."""
+        has_number = False
+        column_overrides = {}
+
+        for index, value in enumerate(values):
+            if _is_number(value):
+                has_number = True
+            elif value is MISSING or value == '':
+                column_overrides[index] = value
+            else:
+                return values, None
+
+        if not has_number:
+            return values, None
+
+        array = np.array(
+            [np.nan if index in column_overrides else value
+             for index, value in enumerate(values)],
+            dtype=np.float64
+        )
+        return array, column_overrides
+
+    def __len__(self) -> int:
+        return len(self.row_keys)
+
+    @property
+    def column_keys(self) -> List[str]:
+        return list(self.columns)
+
+    def is_numeric(self, col_key: str) -> bool:
+        """Check whether a column is stored as a float array."""
+        return isinstance(self.columns.get(col_key), np.ndarray)
+
+    def numeric_column(self, col_key: str, missing: float = 0.0) -> np.ndarray:
+        """
+        Get a column as a float array.
+
+        Absent cells (and absent columns) become ``missing``; cells that
+        cannot be converted with float() become NaN.
+
+        Args:
+            col_key (str): Column key
+            missing (float): Value used for absent cells
+
+        Returns:
+            np.ndarray: Float array with one entry per row
+        """
+        column = self.columns.get(col_key)
+
+        if column is None:
+            return np.full(len(self.row_keys), missing, dtype=np.float64)
+
+        if isinstance(column, np.ndarray):
+            result = column.copy()
+            for index, value in self.overrides.get(col_key, {}).items():
+                if value is MISSING:
+                    result[index] = missing
+            return result
+
+        result = np.empty(len(column), dtype=np.float64)
+        for index, value in enumerate(column):
+            if value is MISSING:
+                result[index] = missing
+                continue
+            try:
+                result[index] = float(value)
+            except (ValueError, TypeError):
+                result[index] = np.nan
+        return result
+
+    def column_sum(self, col_key: str) -> float:
+        """
+        Sum a column, reading text cells as Brazilian numbers.
+
+        Cells that are not numbers count as zero.
+
+        Args:
+            col_key (str): Column key
+
+        Returns:
+            float: Column total
+        """
+        column = self.columns.get(col_key)
+
+        if column is None:
+            return 0.0
+        if isinstance(column, np.ndarray):
+            return float(np.nansum(column))
+
+        # Import here to avoid circular imports
+        from .data_processor import DataProcessor
+        values = [value for value in column if value is not MISSING]
+        return float(DataProcessor.parse_brazilian_currency_many(values).sum())
+
+    def set_column(self, col_key: str, values: Any, label: Any = None) -> None:
+        """
+        Add or replace a column.
+
+        Args:
+            col_key (str): Column key
+            values: np.ndarray or list with one value per row
+            label: Header label for the column (added when the table has a header)
+        """
+        self.columns[col_key] = values
+        self.overrides.pop(col_key, None)
+
+        if label is not None and self.header is not None:
+            self.header[col_key] = label
+
+    def _column_values(self, col_key: str) -> List[Any]:
+        """Get a column as a list of Python values, restoring overridden cells."""
+        column = self.columns[col_key]
+
+        if not isinstance(column, np.ndarray):
+            return column
+
+        values = column.tolist()
+        for index, value in self.overrides.get(col_key, {}).items():
+            values[index] = value
+        return values
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Build the legacy dict for one row."""
+        row = {}
+        for col_key in self.columns:
+            column = self.columns[col_key]
+            overrides = self.overrides.get(col_key)
+
+            if overrides and index in overrides:
+                value = overrides[index]
+            elif isinstance(column, np.ndarray):
+                value = float(column[index])
+            else:
+                value = column[index]
+
+            if value is not MISSING:
+                row[col_key] = value
+        return row
+
+    def to_rows(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Materialize the legacy ``lin/col`` table.
+
+        Returns:
+            dict: Table in the legacy format, header first
+        """
+        col_keys = list(self.columns)
+        column_values = [self._column_values(col_key) for col_key in col_keys]
+
+        table = {}
+        if self.header is not None:
+            table[HEADER_KEY] = self.header
+
+        for row_key, cells in zip(self.row_keys, zip(*column_values)):
+            table[row_key] = {col_key: value for col_key, value in zip(col_keys, cells)
+                              if value is not MISSING}
+
+        # Tables without columns still keep their (empty) rows
+        if not col_keys:
+            for row_key in self.row_keys:
+                table[row_key] = {}
+
+        return table
+
+    def legacy_view(self) -> 'LegacyTableView':
+        """Get a read-only legacy view that builds rows only when accessed."""
+        return LegacyTableView(self)
+
+
+class LegacyTableView(Mapping):
+    """
+    Read-only ``lin/col`` mapping over a ColumnarTable.
+
+    Rows are built on access, so no per-row dicts exist until a caller asks
+    for them. Use dict(view) or ColumnarTable.to_rows() where a real dict is
+    needed (e.g. json.dumps).
+    """
+
+    def __init__(self, table: ColumnarTable):
+        self._table = table
+        self._positions = {row_key: index for index, row_key in enumerate(table.row_keys)}
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        if key == HEADER_KEY and self._table.header is not None:
+            return self._table.header
+        return self._table.row(self._positions[key])
+
+    def __iter__(self) -> Iterator[str]:
+        if self._table.header is not None:
+            yield HEADER_KEY
+        yield from self._table.row_keys
+
+    def __len__(self) -> int:
+        return len(self._table.row_keys) + (self._table.header is not None)
@@ -5,12 +5,16 @@ This module centralizes all API endpoints, parameter templates, and configuratio
 constants to eliminate hardcoded values scattered throughout the codebase.
 """
 
+import os
 from typing import Dict, Any
 from datetime import datetime
 
-# Base API Configuration
-BASE_URL = "https://www.comdinheiro.com.br/Clientes/API/"
-BASE_REPORTS_URL = "https://www.comdinheiro.com.br/"
+# Base API Configuration (override through the environment to point clients
+# at a stand-in server, see scripts/comdinheiro_standin_server.py)
+BASE_URL = os.environ.get('COMDINHEIRO_BASE_URL',
+                          "https://www.comdinheiro.com.br/Clientes/API/")
+BASE_REPORTS_URL = os.environ.get('COMDINHEIRO_REPORTS_BASE_URL',
+                                  "https://www.comdinheiro.com.br/")
 
 # API Endpoints
 ENDPOINTS = {
@@ -212,6 +216,196 @@ VIEW_TYPE_MAPPING = {
     'saldo': ('portfolio_report', 'portfolio_balance')
 }
 
+# HTTP connection pooling (per ComdinheiroAPI session)
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 10
+
+# Shared client registry
+CLIENT_IDLE_TIMEOUT = 300  # seconds without use before a client is closed
+CLIENT_REGISTRY_MAX_SIZE = 64
+
+# Comdinheiro credential lookups (see AuthManager): cached per user email and
+# served from a process-wide pool of credentials database connections.
+# Credentials are updated outside this process (Node side, consulta_bd), so a
+# rotated credential can be served stale for up to CREDENTIALS_CACHE_TTL
+# seconds unless AuthManager.invalidate_credentials is called.
+CREDENTIALS_CACHE_TTL = float(os.environ.get('COMDINHEIRO_CREDENTIALS_CACHE_TTL', '15'))
+CREDENTIALS_CACHE_MAX_ENTRIES = 512
+DB_POOL_MIN_CONNECTIONS = 1
+DB_POOL_MAX_CONNECTIONS = 8
+
+# In-process response cache (see comdinheiro.cache)
+RESPONSE_CACHE_MAX_ENTRIES = 256
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Response cache TTL in seconds per endpoint key; endpoints not listed here
+# (such as export_data and import_data) are never cached
+RESPONSE_CACHE_TTL = {
+    'portfolio_report': 300,
+    'asset_allocation': 300,
+    'performance_analysis': 300,
+    'consolidated_position': 300,
+    'portfolio_breakdown': 300,
+    'transactions': 60
+}
+
+# HTTP (connect, read) timeouts in seconds per endpoint key. The read timeout
+# bounds each wait for data, so an overall Deadline is still needed to bound
+# a whole call (see comdinheiro.deadline)
+DEFAULT_REQUEST_TIMEOUT = (5, 20)
+ENDPOINT_TIMEOUTS = {
+    'portfolio_report': (5, 20),
+    'asset_allocation': (5, 20),
+    'performance_analysis': (5, 20),
+    'consolidated_position': (5, 20),
+    'portfolio_breakdown': (5, 20),
+    'transactions': (5, 25),
+    'export_data': (5, 60),
+    'import_data': (5, 60)
+}
+
+# Retries of idempotent GET requests (see comdinheiro.resilience)
+RETRY_MAX_ATTEMPTS = 3  # attempts per request, the first one included
+RETRY_BACKOFF_BASE = 0.25  # seconds, doubled on every retry (with full jitter)
+RETRY_BACKOFF_MAX = 4.0
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Circuit breaker per endpoint key
+CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive failed attempts before opening
+CIRCUIT_RESET_TIMEOUT = 30  # seconds open before a trial request is let through
+
+# Token bucket per Comdinheiro account, shared by the clients of a process
+ACCOUNT_RATE_LIMIT = 10  # requests per second (0 disables the limiter)
+ACCOUNT_RATE_BURST = 20
+ACCOUNT_RATE_MAX_WAIT = 5  # seconds a request waits for a token before failing
+
+# Persistent on-disk report cache (see comdinheiro.disk_cache), shared between
+# processes. Reports for past dates never change and are kept until evicted;
+# reports up to today expire after DISK_CACHE_TODAY_TTL seconds.
+DISK_CACHE_DIR = os.environ.get(
+    'COMDINHEIRO_DISK_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'comdinheiro', 'reports')
+)
+DISK_CACHE_MAX_BYTES = 512 * 1024 * 1024
+DISK_CACHE_TODAY_TTL = 300
+DISK_CACHE_EVICT_EVERY = 64  # writes between two size checks
+DISK_CACHE_ENDPOINTS = (
+    'portfolio_report', 'asset_allocation', 'performance_analysis', 'portfolio_breakdown'
+)
+
+# Query parameters holding the last date covered by a report, in priority order
+REPORT_DATE_PARAMS = ('data_fim', 'data_analise', 'data_cadastro_fim')
+
+# Histogram bucket bounds of the metrics registry (see comdinheiro.metrics)
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # seconds
+METRICS_BYTES_BUCKETS = (1024, 10240, 102400, 1048576, 10485760, 104857600)
+
+# All-portfolio balance snapshots (one report call per date)
+BALANCE_SNAPSHOT_TTL = 60  # seconds, for today's date; past dates do not change
+BALANCE_SNAPSHOT_MAX_DATES = 32
+
+# Concurrent upstream calls made by get_asset_allocation
+ASSET_ALLOCATION_MAX_WORKERS = 3
+
+# Concurrent portfolio requests in get_portfolio_data_many (keep it at or
+# below HTTP_POOL_MAXSIZE so every worker gets a pooled connection)
+BATCH_MAX_CONCURRENCY = 8
+
+# Maximum in-flight requests per AsyncComdinheiroAPI client
+ASYNC_MAX_CONCURRENCY = 8
+
+# Bytes read at a time when streaming a report (iter_portfolio_data)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Column types for report tables (see comdinheiro.column_types)
+COLUMN_TYPE_TEXT = 'text'
+COLUMN_TYPE_NUMBER = 'number'
+
+# Known column types per view type; columns not listed are inferred from the
+# header and a sample of rows. With filtro=all, col0 is the portfolio name
+# and the 'variaveis' of the template follow from col1 on.
+_PORTFOLIO_REPORT_SCHEMA = {
+    'col0': COLUMN_TYPE_TEXT,    # nome_portfolio
+    'col1': COLUMN_TYPE_TEXT,    # instituicao_financeira
+    'col2': COLUMN_TYPE_TEXT,    # ativo
+    'col3': COLUMN_TYPE_TEXT,    # desc
+    'col4': COLUMN_TYPE_NUMBER,  # quant
+    'col5': COLUMN_TYPE_NUMBER   # saldo_bruto
+}
+
+VIEW_COLUMN_SCHEMAS = {
+    'relatorio': {
+        **_PORTFOLIO_REPORT_SCHEMA,
+        'col6': COLUMN_TYPE_TEXT,    # data_aplicacao
+        'col7': COLUMN_TYPE_NUMBER,  # pu_aplic
+        'col8': COLUMN_TYPE_NUMBER   # pu
+    },
+    'consolidado': {
+        **_PORTFOLIO_REPORT_SCHEMA,
+        'col6': COLUMN_TYPE_TEXT,    # tipo_ativo
+        'col7': COLUMN_TYPE_NUMBER   # saldo_liquido
+    },
+    'relatorio2': {
+        **_PORTFOLIO_REPORT_SCHEMA,
+        'col6': COLUMN_TYPE_TEXT,    # tipo_ativo
+        'col7': COLUMN_TYPE_NUMBER   # saldo_liquido
+    }
+}
+
+# Applies to every view: col0 holds names/years and is never parsed
+DEFAULT_COLUMN_SCHEMA = {'col0': COLUMN_TYPE_TEXT}
+
+# Header words that mark a column as text even when its values look numeric
+COLUMN_TEXT_HEADER_HINTS = (
+    'código', 'codigo', 'conta', 'cnpj', 'cpf', 'agência', 'agencia', 'isin', 'cetip'
+)
+
+# Values ignored when inferring a column type
+COLUMN_EMPTY_PLACEHOLDERS = ('', '-', '--', 'nd', 'n/d')
+
+# Rows sampled per column to infer its type
+COLUMN_TYPE_SAMPLE_SIZE = 50
+
+# Local transaction ledger (see comdinheiro.ledger)
+LEDGER_DEFAULT_PATH = os.environ.get(
+    'COMDINHEIRO_LEDGER_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'comdinheiro', 'ledger.sqlite3')
+)
+LEDGER_RECHECK_DAYS = 7  # trailing synced days fetched again on each sync
+LEDGER_SYNC_INTERVAL = 60  # seconds during which a synced range is served locally only
+
+# Header word identifying the registration date column. The transactions
+# view filters on data_cadastro, so rows are filed by that date only.
+LEDGER_DATE_HEADER_HINT = 'cadastro'
+LEDGER_ROW_DATE_FORMATS = ('%d/%m/%Y', '%Y-%m-%d')
+
+# Bulk export (see comdinheiro.bulk_export). Chunk sizes count the JSON
+# content; form encoding of the POST body roughly doubles it.
+EXPORT_CHUNK_MAX_BYTES = 1024 * 1024
+EXPORT_CHUNK_MAX_RECORDS = 5000
+EXPORT_MAX_CONCURRENCY = 3  # chunks uploaded at once
+EXPORT_SERIALIZE_BATCH_ROWS = 2000  # DataFrame rows serialized at a time
+
+# Ledger of rows already accepted by export_data (see comdinheiro.export_ledger).
+# The simplified interface skips exported rows unless COMDINHEIRO_EXPORT_SKIP_EXPORTED=0.
+EXPORT_LEDGER_PATH = os.environ.get(
+    'COMDINHEIRO_EXPORT_LEDGER_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'comdinheiro', 'export_ledger.sqlite3')
+)
+EXPORT_SKIP_EXPORTED = os.environ.get('COMDINHEIRO_EXPORT_SKIP_EXPORTED', '1') != '0'
+
+# Column names (lowercase) identifying the portfolio of each exported row
+EXPORT_LEDGER_PORTFOLIO_COLUMNS = ('carteira', 'portfolio', 'nome_portfolio')
+
+# Words (lowercase) in the "Comdinheiro informa" message of an export meaning
+# that some records were refused; the rows are then not recorded as exported
+EXPORT_REJECTION_MARKERS = ('erro', 'rejeitad', 'recusad', 'inválid', 'invalid',
+                            'não importad', 'nao importad', 'falha', 'ignorad')
+
+# Wrapper columnar-json output (see comdinheiro.wire_format): text columns are
+# dictionary-encoded when distinct values are at most this share of the rows
+WIRE_DICT_MAX_RATIO = 0.5
+
 # Date format constants
 DATE_FORMAT_INPUT = '%Y-%m-%d'
 DATE_FORMAT_API = '%d%m%Y'
@@ -229,7 +423,9 @@ ERROR_MESSAGES = {
     'no_data': 'Nenhum dado encontrado para os parâmetros fornecidos',
     'session_expired': 'Sessão expirada. Faça login novamente',
     'portfolio_not_found': 'Carteira não encontrada',
-    'invalid_view_type': 'Tipo de visualização não suportado'
+    'invalid_view_type': 'Tipo de visualização não suportado',
+    'deadline_exceeded': 'Tempo limite excedido ao consultar a API do ComDinheiro',
+    'ledger_date_column': 'Coluna de data de cadastro não encontrada nas movimentações'
 }
 
 # Data processing constants
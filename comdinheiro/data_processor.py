@@ -6,9 +6,16 @@ replacing the scattered parsing patterns with clean, reusable methods.
 """
 
 import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple, TYPE_CHECKING
 from datetime import datetime, timedelta
-from math import isclose
+from itertools import chain, islice
+from math import isclose, isfinite
+
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .columnar import ColumnarTable
 
 
 class DataProcessor:
@@ -68,6 +75,47 @@ class DataProcessor:
         except (ValueError, TypeError):
             return 0.0
     
+    @staticmethod
+    def parse_brazilian_currency_many(values: Iterable[Any]) -> 'np.ndarray':
+        """
+        Parse a whole column of Brazilian currency values.
+        
+        Same rules as parse_brazilian_currency, applied to every value in one
+        pass: values that cannot be parsed become 0.0.
+        
+        Args:
+            values: Sequence or array of currency strings / numbers
+            
+        Returns:
+            np.ndarray: Float64 array with one entry per value
+        """
+        import numpy as np
+        
+        if isinstance(values, np.ndarray) and values.dtype.kind in 'fiub':
+            return values.astype(np.float64)
+        
+        cleaned = [
+            (value.replace('.', '').replace(',', '.') or '0') if isinstance(value, str) else (value or 0)
+            for value in values
+        ]
+        
+        try:
+            return np.fromiter(map(float, cleaned), dtype=np.float64, count=len(cleaned))
+        except (ValueError, TypeError):
+            # Some value is not a number; fall back to the per-value rules
+            return np.fromiter(
+                (DataProcessor._parse_cleaned_currency(value) for value in cleaned),
+                dtype=np.float64, count=len(cleaned)
+            )
+    
+    @staticmethod
+    def _parse_cleaned_currency(value: Any) -> float:
+        """Convert an already normalized currency value, returning 0.0 on failure."""
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return 0.0
+    
     @staticmethod
     def format_brazilian_currency(value: float) -> str:
         """
@@ -85,6 +133,28 @@ class DataProcessor:
         except (ValueError, TypeError):
             return "0,00"
     
+    @staticmethod
+    def format_brazilian_currency_many(values: Iterable[Any]) -> List[str]:
+        """
+        Format a whole column of numbers to Brazilian currency format.
+        
+        Args:
+            values: Sequence or array of numeric values
+            
+        Returns:
+            list: Formatted currency strings, "0,00" for non-numeric values
+        """
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+        
+        try:
+            return [
+                format(value, ',.2f').replace(',', '_').replace('.', ',').replace('_', '.')
+                for value in values
+            ]
+        except (ValueError, TypeError):
+            return [DataProcessor.format_brazilian_currency(value) for value in values]
+    
     @staticmethod
     def decode_special_characters(value: str) -> str:
         """
@@ -105,42 +175,77 @@ class DataProcessor:
             return value.strip().strip('"')
     
     @staticmethod
-    def clean_table_data(table_data: Dict[str, Any]) -> Dict[str, Any]:
+    def clean_table_data(table_data: Dict[str, Any], view_type: str = None) -> Dict[str, Any]:
         """
         Clean and process table data from API response.
         
+        Column types come from the view's schema or are inferred once per
+        column (see comdinheiro.column_types), so a column is either parsed
+        as numbers or kept as text for every row.
+        
         Args:
             table_data (dict): Raw table data from API
+            view_type (str, optional): View type, used to pick the column schema
             
         Returns:
             dict: Cleaned table data
         """
-        cleaned_data = {}
+        # Import here to avoid circular imports
+        from .column_types import build_columnar_table
+        with metrics.timer('comdinheiro_stage_seconds', stage='clean_table_data', view_type=view_type):
+            return build_columnar_table(table_data, view_type).to_rows()
+    
+    @staticmethod
+    def clean_row(row_data: Dict[str, Any], column_types: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Clean one table row: decode text and parse numeric cells.
         
-        for row_key, row_data in table_data.items():
-            cleaned_row = {}
+        Args:
+            row_data (dict): Raw row (colN -> value) from API
+            column_types (dict, optional): Column types from
+                column_types.infer_column_types; without them only col0 is
+                treated as text
             
-            for col_key, value in row_data.items():
-                if isinstance(value, str):
-                    decoded_value = DataProcessor.decode_special_characters(value)
-                    
-                    # Don't modify year column (col0)
-                    if col_key == "col0":
-                        cleaned_row[col_key] = decoded_value
-                        continue
-                    
-                    # Try to parse as number
-                    numeric_value = DataProcessor.parse_brazilian_currency(decoded_value)
-                    if decoded_value.replace('.', '').replace(',', '').replace('-', '').isdigit():
-                        cleaned_row[col_key] = numeric_value
-                    else:
-                        cleaned_row[col_key] = decoded_value
-                else:
-                    cleaned_row[col_key] = value
-                    
-            cleaned_data[row_key] = cleaned_row
+        Returns:
+            dict: Cleaned row
+        """
+        # Import here to avoid circular imports
+        from .column_types import convert_row
+        from .config import DEFAULT_COLUMN_SCHEMA
+        return convert_row(row_data, column_types or DEFAULT_COLUMN_SCHEMA)
+    
+    @staticmethod
+    def clean_rows(rows: Iterable[Tuple[str, Dict[str, Any]]],
+                   view_type: str = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Clean a stream of (row_key, row) pairs with per-column types.
+        
+        The header and the first COLUMN_TYPE_SAMPLE_SIZE rows are buffered to
+        infer the column types; every row is then converted with them.
+        
+        Args:
+            rows (iterable): (row_key, raw_row) pairs, e.g. from iter_table_rows
+            view_type (str, optional): View type, used to pick the column schema
             
-        return cleaned_data
+        Yields:
+            tuple: (row_key, cleaned_row)
+        """
+        # Import here to avoid circular imports
+        from .column_types import infer_column_types, convert_header, convert_row
+        from .config import COLUMN_TYPE_SAMPLE_SIZE
+        
+        rows = iter(rows)
+        buffered = list(islice(rows, COLUMN_TYPE_SAMPLE_SIZE + 1))
+        header = next((row for row_key, row in buffered if row_key == 'lin0'), None)
+        column_types = infer_column_types(
+            header, [row for row_key, row in buffered if row_key != 'lin0'], view_type
+        )
+        
+        for row_key, row in chain(buffered, rows):
+            if row_key == 'lin0':
+                yield row_key, convert_header(row)
+            else:
+                yield row_key, convert_row(row, column_types)
     
     @staticmethod
     def parse_portfolio_list(response_data: Dict) -> Optional[List[Dict]]:
@@ -173,6 +278,65 @@ class DataProcessor:
         
         return portfolios
     
+    @staticmethod
+    def parse_balance_snapshot(response_data: Dict) -> Optional[Dict[str, Any]]:
+        """
+        Parse every portfolio balance from a balance report response.
+        
+        The report with filtro=all returns the saldo_bruto of all portfolios,
+        so one response can answer the balance of any portfolio for that date.
+        
+        Args:
+            response_data (dict): Raw API response
+            
+        Returns:
+            dict: Snapshot with 'balances' (name -> balance), 'index'
+                  (lowercase name -> balance) and 'first_balance', or None
+        """
+        if not response_data or 'tables' not in response_data or 'tab0' not in response_data['tables']:
+            return None
+            
+        balances = {}
+        index = {}
+        first_balance = None
+        
+        for key, row in response_data['tables']['tab0'].items():
+            if key == 'lin0':  # Skip header
+                continue
+                
+            name = row.get('col0', '').strip()
+            balance = DataProcessor.parse_brazilian_currency(row.get('col1', '0'))
+            
+            if first_balance is None:
+                first_balance = balance
+            if name:
+                balances[name] = balance
+            
+            # Keep the first row for a name, as the linear scan did
+            index.setdefault(name.lower(), balance)
+        
+        return {
+            'balances': balances,
+            'index': index,
+            'first_balance': first_balance
+        }
+    
+    @staticmethod
+    def lookup_balance(snapshot: Dict[str, Any], portfolio_name: str) -> Optional[float]:
+        """
+        Find a portfolio balance in a snapshot (case-insensitive).
+        
+        Args:
+            snapshot (dict): Snapshot built by parse_balance_snapshot
+            portfolio_name (str): Name of the portfolio to find
+            
+        Returns:
+            float: Portfolio balance or None if not found
+        """
+        if not snapshot:
+            return None
+        return snapshot['index'].get(portfolio_name.lower())
+    
     @staticmethod
     def parse_portfolio_balance(response_data: Dict, portfolio_name: str) -> Optional[float]:
         """
@@ -185,27 +349,16 @@ class DataProcessor:
         Returns:
             float: Portfolio balance or None if not found
         """
-        if not response_data or 'tables' not in response_data or 'tab0' not in response_data['tables']:
+        snapshot = DataProcessor.parse_balance_snapshot(response_data)
+        if snapshot is None:
             return None
             
-        tab0 = response_data['tables']['tab0']
-        
-        for key, row in tab0.items():
-            if key != 'lin0':  # Skip header
-                name = row.get('col0', '').strip()
-                balance_str = row.get('col1', '0')
-                
-                # Check if it's the correct portfolio
-                if name.lower() == portfolio_name.lower():
-                    return DataProcessor.parse_brazilian_currency(balance_str)
+        balance = DataProcessor.lookup_balance(snapshot, portfolio_name)
+        if balance is not None:
+            return balance
         
         # If specific portfolio not found, return first balance (fallback behavior)
-        for key, row in tab0.items():
-            if key != 'lin0':
-                balance_str = row.get('col1', '0')
-                return DataProcessor.parse_brazilian_currency(balance_str)
-                
-        return None
+        return snapshot['first_balance']
     
     @staticmethod
     def parse_asset_allocation(allocation_response: Dict, balance: float = None, 
@@ -348,7 +501,7 @@ class DataProcessor:
     
     @staticmethod
     def process_response_by_view_type(response_data: Dict, view_type: str, 
-                                    portfolio: str) -> Optional[Dict]:
+                                    portfolio: str, columnar: bool = False) -> Optional[Dict]:
         """
         Process API response based on view type.
         
@@ -356,6 +509,8 @@ class DataProcessor:
             response_data (dict): Raw API response
             view_type (str): Type of view being processed
             portfolio (str): Portfolio name
+            columnar (bool): Return tables.tab0 as a ColumnarTable instead of
+                             the legacy lin/col dict
             
         Returns:
             dict: Processed data or None if error
@@ -363,95 +518,129 @@ class DataProcessor:
         if not response_data or 'tables' not in response_data or 'tab0' not in response_data['tables']:
             return None
             
-        # Clean the table data
-        tab0 = DataProcessor.clean_table_data(response_data['tables']['tab0'])
+        # Import here so numpy is only loaded when a report is processed
+        from .column_types import build_columnar_table
+        
+        # Clean the table data, one converter per column
+        with metrics.timer('comdinheiro_stage_seconds', stage='clean_table_data', view_type=view_type):
+            table = build_columnar_table(response_data['tables']['tab0'], view_type)
         
         # Process based on view type
-        if view_type == "relatorio":
-            return DataProcessor._process_detailed_report(tab0)
-        elif view_type == "consolidado":
-            return DataProcessor._process_consolidated_report(tab0)
-        elif view_type == "movimentacoes":
-            return DataProcessor._process_transactions(tab0)
+        process = {
+            'relatorio': DataProcessor._process_detailed_report,
+            'consolidado': DataProcessor._process_consolidated_report,
+            'movimentacoes': DataProcessor._process_transactions
+        }.get(view_type)
+        
+        if process is not None:
+            with metrics.timer('comdinheiro_stage_seconds', stage=process.__name__,
+                               view_type=view_type):
+                result = process(table)
         else:
             # Default processing
-            return {'tables': {'tab0': tab0}}
+            result = {'tables': {'tab0': table}}
+        
+        if not columnar:
+            with metrics.timer('comdinheiro_stage_seconds', stage='to_rows', view_type=view_type):
+                result['tables']['tab0'] = table.to_rows()
+        return result
     
     @staticmethod
-    def _process_detailed_report(tab0: Dict) -> Dict:
+    def _process_detailed_report(table: 'ColumnarTable') -> Dict:
         """Process detailed report data with percentage calculations."""
-        total_float = 0.0
+        import numpy as np
         
-        # Add difference column to header
-        tab0['lin0']['col_diff'] = 'Diferença %'
+        # Sum col5 values
+        total_float = table.column_sum('col5')
         
-        for key, row in tab0.items():
-            if key == "lin0":
-                continue
-                
-            # Sum col5 values
-            value = row.get('col5', '')
-            try:
-                total_float += DataProcessor.parse_brazilian_currency(value)
-            except Exception:
-                pass
-            
-            # Calculate percentage difference between col8 and col7
-            col7_raw = row.get('col7', 0)
-            col8_raw = row.get('col8', 0)
-            
-            try:
-                col7 = float(col7_raw)
-                col8 = float(col8_raw)
-                
-                if col7 != 0:
-                    diff_percent = ((col8 - col7) / col7) * 100
-                    formatted = DataProcessor.format_brazilian_currency(diff_percent) + '%'
-                    
-                    if diff_percent > 0:
-                        row['col_diff'] = f'<span style="color:green;">⬆ {formatted}</span>'
-                    elif diff_percent < 0:
-                        row['col_diff'] = f'<span style="color:red;">⬇ {formatted}</span>'
-                    else:
-                        row['col_diff'] = formatted
-                else:
-                    row['col_diff'] = "--"
-            except Exception:
-                row['col_diff'] = "--"
+        # Calculate percentage difference between col8 and col7
+        col7 = table.numeric_column('col7')
+        col8 = table.numeric_column('col8')
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diff_percent = ((col8 - col7) / col7) * 100
+        valid = np.isfinite(col7) & np.isfinite(col8) & (col7 != 0)
+        
+        col_diff = ["--"] * len(table)
+        indices = np.flatnonzero(valid)
+        diffs = diff_percent[indices].tolist()
+        formatted_diffs = DataProcessor.format_brazilian_currency_many(diffs)
+        
+        for index, diff, formatted in zip(indices.tolist(), diffs, formatted_diffs):
+            col_diff[index] = DataProcessor._diff_label(diff, formatted)
+        
+        # Add difference column (and its header)
+        table.set_column('col_diff', col_diff, label='Diferença %')
         
         # Format total
         total_geral = DataProcessor.format_brazilian_currency(total_float)
         
         return {
-            'tables': {'tab0': tab0},
+            'tables': {'tab0': table},
             'total_geral': total_geral
         }
     
     @staticmethod
-    def _process_consolidated_report(tab0: Dict) -> Dict:
-        """Process consolidated report data."""
-        total_geral_float = 0.0
+    def _diff_label(diff_percent: float, formatted: str) -> str:
+        """Render a percentage difference with its up/down marker."""
+        formatted += '%'
+        
+        if diff_percent > 0:
+            return f'<span style="color:green;">⬆ {formatted}</span>'
+        elif diff_percent < 0:
+            return f'<span style="color:red;">⬇ {formatted}</span>'
+        return formatted
+    
+    @staticmethod
+    def _row_diff(row: Dict[str, Any]) -> str:
+        """Percentage difference between col8 and col7 of a single row."""
+        try:
+            col7 = float(row.get('col7', 0))
+            col8 = float(row.get('col8', 0))
+        except (ValueError, TypeError):
+            return "--"
         
-        for key, row in tab0.items():
-            if key == "lin0":
-                continue
-                
-            # Sum col5 values for total
-            value = row.get('col5', '')
-            try:
-                total_geral_float += DataProcessor.parse_brazilian_currency(value)
-            except Exception:
-                pass
+        if col7 == 0 or not (isfinite(col7) and isfinite(col8)):
+            return "--"
+        
+        diff_percent = ((col8 - col7) / col7) * 100
+        return DataProcessor._diff_label(
+            diff_percent, DataProcessor.format_brazilian_currency(diff_percent)
+        )
+    
+    @staticmethod
+    def process_row_by_view_type(row_key: str, row: Dict[str, Any], view_type: str) -> Dict[str, Any]:
+        """
+        Apply the per-row part of a view's processing to one cleaned row.
+        
+        Used when streaming a report: table-wide results such as total_geral
+        are left to the caller.
         
-        total_geral = DataProcessor.format_brazilian_currency(total_geral_float)
+        Args:
+            row_key (str): Row key ('lin0' is the header)
+            row (dict): Cleaned row
+            view_type (str): Type of view being processed
+            
+        Returns:
+            dict: Processed row (modified in place)
+        """
+        if view_type == "relatorio":
+            row['col_diff'] = 'Diferença %' if row_key == 'lin0' else DataProcessor._row_diff(row)
+        return row
+    
+    @staticmethod
+    def _process_consolidated_report(table: 'ColumnarTable') -> Dict:
+        """Process consolidated report data."""
+        # Sum col5 values for total
+        total_geral = DataProcessor.format_brazilian_currency(table.column_sum('col5'))
         
         return {
-            'tables': {'tab0': tab0},
+            'tables': {'tab0': table},
             'total_geral': total_geral
         }
     
     @staticmethod
-    def _process_transactions(tab0: Dict) -> Dict:
+    def _process_transactions(table: 'ColumnarTable') -> Dict:
         """Process transaction data."""
         # Simple processing for transaction data
-        return {'tables': {'tab0': tab0}}
\ No newline at end of file
+        return {'tables': {'tab0': table}}
@@ -0,0 +1,120 @@
+"""
+Overall deadlines for Comdinheiro calls.
+
+A public call such as get_asset_allocation makes several upstream requests.
+A Deadline is created once per call and handed down to every sub-request,
+which caps its connect/read timeouts (ENDPOINT_TIMEOUTS) by the time left.
+When the deadline runs out, DeadlineExceeded is raised so callers get a
+clear timeout error (and whatever partial result was already available)
+instead of being killed from outside.
+"""
+
+import time
+from typing import Optional, Tuple, Union
+
+from .config import ENDPOINT_TIMEOUTS, DEFAULT_REQUEST_TIMEOUT, ERROR_MESSAGES
+
+# Smallest timeout handed to an HTTP request, so that a nearly spent
+# deadline fails fast instead of passing 0 (no timeout) to requests
+_MIN_TIMEOUT = 0.05
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the overall deadline of a call runs out."""
+
+    def __init__(self, message: str = ERROR_MESSAGES['deadline_exceeded']):
+        super().__init__(message)
+
+
+class Deadline:
+    """A point in time by which a call and all its sub-requests must finish."""
+
+    def __init__(self, seconds: float):
+        """
+        Start a deadline.
+
+        Args:
+            seconds (float): Time budget from now
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def coerce(cls, deadline: Union[None, float, 'Deadline']) -> Optional['Deadline']:
+        """
+        Accept a deadline given as seconds or as a Deadline.
+
+        Args:
+            deadline: None (no deadline), a time budget in seconds or a Deadline
+
+        Returns:
+            Deadline: The deadline, or None when none was given
+        """
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(float(deadline))
+
+    def remaining(self) -> float:
+        """Get the seconds left, never below zero."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Check whether the deadline has run out."""
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """
+        Raise if the deadline has run out.
+
+        Raises:
+            DeadlineExceeded: If no time is left
+        """
+        if self.expired():
+            raise DeadlineExceeded()
+
+    def share(self, fraction: float) -> 'Deadline':
+        """
+        Get a sub-deadline holding a fraction of the remaining time.
+
+        Used for the first of several sequential sub-requests, so that the
+        ones after it keep part of the budget.
+
+        Args:
+            fraction (float): Share of the remaining time (0 to 1)
+
+        Returns:
+            Deadline: Deadline ending no later than this one
+        """
+        return Deadline(self.remaining() * fraction)
+
+
+def request_timeout(endpoint_key: Optional[str],
+                    deadline: Optional[Deadline] = None) -> Tuple[float, float]:
+    """
+    Get the (connect, read) timeout of a request.
+
+    Args:
+        endpoint_key (str): Key from ENDPOINTS
+        deadline (Deadline, optional): Overall deadline capping the timeouts
+
+    Returns:
+        tuple: (connect_timeout, read_timeout) in seconds
+
+    Raises:
+        DeadlineExceeded: If the deadline has already run out
+    """
+    connect_timeout, read_timeout = ENDPOINT_TIMEOUTS.get(endpoint_key, DEFAULT_REQUEST_TIMEOUT)
+
+    if deadline is None:
+        return connect_timeout, read_timeout
+
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded()
+
+    return (max(_MIN_TIMEOUT, min(connect_timeout, remaining)),
+            max(_MIN_TIMEOUT, min(read_timeout, remaining)))
+
+
+# Accepted wherever a deadline can be passed: seconds from now or a Deadline
+DeadlineLike = Union[float, Deadline]
@@ -0,0 +1,356 @@
+"""
+Persistent on-disk cache for Comdinheiro report responses.
+
+A report for a date in the past never changes, yet the in-process cache of
+each worker drops it after a few minutes and every new process fetches it
+again. DiskCache keeps parsed report responses as JSON files keyed by
+(credential hash, endpoint, canonical URL). Past-date reports are kept until
+evicted; reports covering today are short-lived.
+
+Files are written to a temporary name and renamed into place, so several
+processes can share one directory without readers ever seeing a partial
+entry. The directory is bounded in size: least recently used entries (by
+file mtime, refreshed on every hit) are removed first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+from .config import (
+    DISK_CACHE_DIR, DISK_CACHE_MAX_BYTES, DISK_CACHE_TODAY_TTL, DISK_CACHE_EVICT_EVERY,
+    DISK_CACHE_ENDPOINTS, REPORT_DATE_PARAMS, DATE_FORMAT_API
+)
+
+_ENTRY_SUFFIX = '.json'
+_TEMP_PREFIX = '.tmp-'
+_STALE_TEMP_AGE = 3600  # seconds before an orphaned temporary file is removed
+
+logger = logging.getLogger(__name__)
+
+
+def report_end_date(url: str) -> Optional[datetime]:
+    """
+    Get the last date covered by a report URL.
+
+    Args:
+        url (str): Report URL with its query string
+
+    Returns:
+        datetime: First date found in REPORT_DATE_PARAMS, or None when the
+                  URL carries no valid report date
+    """
+    params = dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))
+
+    for name in REPORT_DATE_PARAMS:
+        value = params.get(name)
+        if not value:
+            continue
+        try:
+            return datetime.strptime(value, DATE_FORMAT_API)
+        except ValueError:
+            continue
+
+    return None
+
+
+def is_report(value: Any) -> bool:
+    """
+    Check whether a response is a report worth keeping.
+
+    Upstream errors and empty answers also come back as 200 JSON bodies;
+    they must not be kept, least of all for past dates, which never expire.
+
+    Returns:
+        bool: True if the response has a 'tables' dict with at least one
+              non-empty table
+    """
+    tables = value.get('tables') if isinstance(value, dict) else None
+    return isinstance(tables, dict) and any(tables.values())
+
+
+class DiskCache:
+    """
+    Size-bounded report cache stored as one JSON file per entry.
+
+    Only endpoints listed in ``endpoints`` are cached. Cached values are parsed
+    JSON responses; each get() returns a fresh copy read from disk.
+    """
+
+    def __init__(self, directory: str = DISK_CACHE_DIR,
+                 max_bytes: int = DISK_CACHE_MAX_BYTES,
+                 today_ttl: float = DISK_CACHE_TODAY_TTL,
+                 endpoints: Iterable[str] = DISK_CACHE_ENDPOINTS,
+                 evict_every: int = DISK_CACHE_EVICT_EVERY):
+        """
+        Initialize the cache, creating its directory if needed.
+
+        Args:
+            directory (str): Cache directory, may be shared between processes
+            max_bytes (int): Maximum total size of the cache files
+            today_ttl (float): Seconds a report covering today (or a later
+                               date, or no date at all) is kept
+            endpoints (iterable): Endpoint keys whose responses are cached
+            evict_every (int): Writes of this process between two size checks
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.today_ttl = today_ttl
+        self.endpoints = frozenset(endpoints)
+        self.evict_every = max(1, evict_every)
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def cacheable(self, endpoint_key: Optional[str]) -> bool:
+        """Check whether responses of an endpoint go to the disk cache."""
+        return endpoint_key in self.endpoints
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        """
+        Get the time to live of a report URL.
+
+        Returns:
+            float: None for past-date reports (immutable), today_ttl otherwise
+        """
+        end_date = report_end_date(url)
+        if end_date is not None and end_date.date() < datetime.now().date():
+            return None
+        return self.today_ttl
+
+    @staticmethod
+    def entry_key(account_key: str, endpoint_key: str, url: str) -> str:
+        """
+        Build the file key of an entry.
+
+        Args:
+            account_key (str): Credential hash (see cache.credential_key)
+            endpoint_key (str): Key from ENDPOINTS
+            url (str): Canonical report URL
+
+        Returns:
+            str: Hex digest naming the entry
+        """
+        raw = f"{account_key}\0{endpoint_key}\0{url}".encode('utf-8')
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, account_key: str, endpoint_key: str, url: str) -> Optional[Any]:
+        """
+        Get a cached response.
+
+        Args:
+            account_key (str): Credential hash
+            endpoint_key (str): Key from ENDPOINTS
+            url (str): Canonical report URL
+
+        Returns:
+            Cached response or None if missing, expired or unreadable
+        """
+        if not self.cacheable(endpoint_key):
+            return None
+
+        path = self._path(self.entry_key(account_key, endpoint_key, url))
+
+        try:
+            with open(path, 'r', encoding='utf-8') as entry_file:
+                entry = json.load(entry_file)
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        except (OSError, ValueError):
+            # Unreadable or corrupted entry: drop it and fetch again
+            self._unlink(path)
+            self._count('misses')
+            return None
+
+        expires_at = entry.get('expires_at')
+        if expires_at is not None and expires_at <= time.time():
+            self._unlink(path)
+            self._count('misses')
+            return None
+
+        # Refresh the mtime so eviction sees this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self._count('hits')
+        return entry.get('value')
+
+    def set(self, account_key: str, endpoint_key: str, url: str, value: Any) -> bool:
+        """
+        Store a response.
+
+        Args:
+            account_key (str): Credential hash
+            endpoint_key (str): Key from ENDPOINTS
+            url (str): Canonical report URL
+            value: JSON-serializable response
+
+        Returns:
+            bool: True if the response was written (upstream errors and
+                  empty reports are not, see is_report)
+        """
+        if not self.cacheable(endpoint_key) or not is_report(value):
+            return False
+
+        ttl = self.ttl_for(url)
+        if ttl is not None and ttl <= 0:
+            return False
+
+        entry = {
+            'expires_at': time.time() + ttl if ttl is not None else None,
+            'value': value
+        }
+
+        try:
+            payload = json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        except (TypeError, ValueError):
+            return False
+
+        if len(payload) > self.max_bytes:
+            return False
+
+        path = self._path(self.entry_key(account_key, endpoint_key, url))
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=_TEMP_PREFIX)
+            try:
+                with os.fdopen(fd, 'wb') as temp_file:
+                    temp_file.write(payload)
+                os.replace(temp_path, path)
+            except BaseException:
+                self._unlink(temp_path)
+                raise
+        except OSError as e:
+            logger.warning("Disk cache write error: %s", e)
+            return False
+
+        with self._lock:
+            self.writes += 1
+            self._writes_since_evict += 1
+            evict = self._writes_since_evict >= self.evict_every
+            if evict:
+                self._writes_since_evict = 0
+
+        if evict:
+            self.evict()
+        return True
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        Orphaned temporary files left by crashed writers are removed as well.
+        Safe to run concurrently from several processes.
+
+        Returns:
+            int: Number of removed entries
+        """
+        entries, total = self._scan()
+        removed = 0
+
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if self._unlink(path):
+                    removed += 1
+                total -= size
+
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry of the cache directory."""
+        for _, _, path in self._scan()[0]:
+            self._unlink(path)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters for this process and the size of the directory.
+
+        Returns:
+            dict: Hits, misses, hit ratio, writes, evictions, entries and bytes
+        """
+        entries, total = self._scan(remove_stale=False)
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'entries': len(entries),
+                'bytes': total
+            }
+
+    def _path(self, key: str) -> str:
+        """Path of an entry; entries are spread over 256 subdirectories."""
+        return os.path.join(self.directory, key[:2], key + _ENTRY_SUFFIX)
+
+    def _scan(self, remove_stale: bool = True) -> Tuple[List[Tuple[float, int, str]], int]:
+        """List (mtime, size, path) of every entry and their total size."""
+        entries = []
+        total = 0
+        now = time.time()
+
+        try:
+            subdirectories = os.scandir(self.directory)
+        except FileNotFoundError:
+            return entries, total
+
+        with subdirectories:
+            for subdirectory in subdirectories:
+                if not subdirectory.is_dir():
+                    continue
+                try:
+                    files = list(os.scandir(subdirectory.path))
+                except FileNotFoundError:
+                    continue
+
+                for entry in files:
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+
+                    if entry.name.startswith(_TEMP_PREFIX):
+                        if remove_stale and now - stat.st_mtime > _STALE_TEMP_AGE:
+                            self._unlink(entry.path)
+                    elif entry.name.endswith(_ENTRY_SUFFIX):
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+
+        return entries, total
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def _unlink(path: str) -> bool:
+        """Remove a file, ignoring files already removed by another process."""
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,260 @@
+"""
+Idempotent exports backed by a local ledger of row hashes.
+
+Re-running an export of transactions used to send every row again, including
+the ones Comdinheiro had already imported. ExportLedger keeps a SQLite table
+with a content hash of each row accepted upstream, per account and
+portfolio, so an export only sends new or changed rows.
+
+Hashing is vectorized with pandas.util.hash_pandas_object and the lookup
+with numpy.isin, so diffing a 100k-row file against its ledger takes a
+fraction of a second. Identical rows in one file are told apart by their position
+among equal rows, the same way TransactionLedger does.
+
+EndPoint001.php answers 200 even when it refuses records, so rows are only
+recorded once the "Comdinheiro informa" message confirms them (see
+export_accepted).
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    EXPORT_LEDGER_PATH, EXPORT_LEDGER_PORTFOLIO_COLUMNS, EXPORT_REJECTION_MARKERS
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS export_rows (
+    scope TEXT NOT NULL,
+    row_hash INTEGER NOT NULL,
+    PRIMARY KEY (scope, row_hash)
+) WITHOUT ROWID;
+"""
+
+# Odd 64-bit constant spreading the occurrence count of equal rows
+_OCCURRENCE_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+# "120 registros recebidos", "1 registro importado"...
+_RECORD_COUNT = re.compile(r'(\d+)\s+registros?\s+(?:recebid|importad|inserid|processad)')
+# "0 erros", "sem erros", "nenhum erro" are not rejections
+_NO_ERRORS = re.compile(r'\b(?:0|sem|nenhum)\s+erros?\b')
+
+
+class ExportBatch(NamedTuple):
+    """Rows of an export not accepted upstream yet, with their ledger keys."""
+
+    rows: pd.DataFrame
+    scopes: np.ndarray  # scope key of each row
+    hashes: np.ndarray  # int64 content hash of each row
+    skipped: int  # rows left out because they were already exported
+
+
+def find_portfolio_column(content_data: pd.DataFrame) -> Optional[str]:
+    """
+    Find the portfolio column of an export by its name.
+
+    Returns:
+        str: Column name, or None if no column matches EXPORT_LEDGER_PORTFOLIO_COLUMNS
+    """
+    names = {str(column).strip().lower(): column for column in content_data.columns}
+    for hint in EXPORT_LEDGER_PORTFOLIO_COLUMNS:
+        if hint in names:
+            return names[hint]
+    return None
+
+
+def row_hashes(content_data: pd.DataFrame) -> np.ndarray:
+    """
+    Hash every row of a DataFrame by content.
+
+    The hash covers the column names and values but not the index or the
+    column order. The n-th copy of a row gets a different hash than the
+    first, so repeated transactions are not mistaken for re-sent ones.
+
+    Args:
+        content_data (pd.DataFrame): Rows to hash
+
+    Returns:
+        np.ndarray: int64 hash per row (SQLite INTEGER range)
+    """
+    columns = sorted(content_data.columns, key=str)
+    hashes = pd.util.hash_pandas_object(content_data[columns], index=False).to_numpy(np.uint64)
+
+    names = json.dumps([str(column) for column in columns], ensure_ascii=False)
+    hashes = hashes ^ np.uint64(int.from_bytes(hashlib.sha1(names.encode('utf-8')).digest()[:8],
+                                               'little'))
+
+    occurrence = pd.Series(hashes).groupby(hashes).cumcount().to_numpy(np.uint64)
+    with np.errstate(over='ignore'):
+        hashes = hashes + occurrence * _OCCURRENCE_MIX
+    return hashes.view(np.int64)
+
+
+def export_accepted(response: Optional[Dict[str, Any]], rows: int) -> bool:
+    """
+    Check whether an export response confirms that every row sent was accepted.
+
+    Args:
+        response (dict): Raw EndPoint001.php response
+        rows (int): Number of rows sent
+
+    Returns:
+        bool: True if a "Comdinheiro informa" message is present, mentions
+              no rejection (EXPORT_REJECTION_MARKERS) and, when it counts
+              the records, counts all of them
+    """
+    if not isinstance(response, dict) or response.get('status_code') != 200:
+        return False
+
+    messages = [str(item['Comdinheiro informa']) for item in response.get('resposta') or []
+                if isinstance(item, dict) and 'Comdinheiro informa' in item]
+    if not messages:
+        return False
+
+    text = _NO_ERRORS.sub('', ' '.join(messages).lower())
+    if any(marker in text for marker in EXPORT_REJECTION_MARKERS):
+        return False
+    return all(int(count) == rows for count in _RECORD_COUNT.findall(text))
+
+
+class ExportLedger:
+    """
+    SQLite store of the rows each account and portfolio already exported.
+
+    The database can be shared between processes; within a process the
+    connection is guarded by a lock.
+    """
+
+    def __init__(self, path: str = EXPORT_LEDGER_PATH):
+        """
+        Open (or create) the ledger database.
+
+        Args:
+            path (str): SQLite file path, or ':memory:'
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+
+        with self._lock, self._connection:
+            if path != ':memory:':
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def scope_key(account: str, portfolio: str = '') -> str:
+        """Build the key identifying the exported rows of one portfolio."""
+        return json.dumps([account, portfolio], ensure_ascii=False)
+
+    def pending(self, account: str, content_data: pd.DataFrame,
+                portfolio_column: Optional[str] = None) -> ExportBatch:
+        """
+        Select the rows of an export that were not accepted upstream yet.
+
+        Args:
+            account (str): Account key (see cache.credential_key)
+            content_data (pd.DataFrame): Rows to export
+            portfolio_column (str, optional): Column naming each row's
+                portfolio (default: found by find_portfolio_column; without
+                one, the whole account is a single scope)
+
+        Returns:
+            ExportBatch: New or changed rows, in their original order
+        """
+        hashes = row_hashes(content_data)
+        portfolio_column = portfolio_column or find_portfolio_column(content_data)
+
+        if portfolio_column is None:
+            codes = np.zeros(len(content_data), dtype=np.intp)
+            portfolios: List[str] = ['']
+        else:
+            codes, uniques = pd.factorize(content_data[portfolio_column].astype(str))
+            portfolios = list(uniques)
+
+        scope_keys = np.array([self.scope_key(account, portfolio) for portfolio in portfolios],
+                              dtype=object)
+        new = np.ones(len(content_data), dtype=bool)
+
+        with self._lock:
+            for code, scope in enumerate(scope_keys):
+                in_scope = codes == code
+                known = np.fromiter(
+                    (row_hash for (row_hash,) in self._connection.execute(
+                        'SELECT row_hash FROM export_rows WHERE scope = ?', (scope,))),
+                    dtype=np.int64
+                )
+                if len(known):
+                    new[in_scope] = ~np.isin(hashes[in_scope], known)
+
+        return ExportBatch(
+            rows=content_data[new],
+            scopes=scope_keys[codes[new]],
+            hashes=hashes[new],
+            skipped=int(len(content_data) - new.sum())
+        )
+
+    def record(self, batch: ExportBatch, start: int = 0, stop: Optional[int] = None) -> int:
+        """
+        Record rows of a batch as accepted upstream.
+
+        Args:
+            batch (ExportBatch): Batch returned by pending()
+            start (int): Position of the first accepted row in batch.rows
+            stop (int, optional): Position after the last accepted row
+                (default: end of the batch)
+
+        Returns:
+            int: Number of rows recorded
+        """
+        scopes = batch.scopes[start:stop].tolist()
+        hashes = batch.hashes[start:stop].tolist()
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO export_rows (scope, row_hash) VALUES (?, ?)',
+                zip(scopes, hashes)
+            )
+        return len(hashes)
+
+    def clear(self, scope: str = None) -> None:
+        """
+        Forget the exported rows of one scope, or of every scope.
+
+        Args:
+            scope (str, optional): Scope key from scope_key()
+        """
+        with self._lock, self._connection:
+            if scope is None:
+                self._connection.execute('DELETE FROM export_rows')
+            else:
+                self._connection.execute('DELETE FROM export_rows WHERE scope = ?', (scope,))
+
+
+_default_ledger = None
+_default_ledger_lock = threading.Lock()
+
+
+def get_export_ledger() -> ExportLedger:
+    """Get the process-wide export ledger at EXPORT_LEDGER_PATH, opening it on first use."""
+    global _default_ledger
+
+    with _default_ledger_lock:
+        if _default_ledger is None:
+            _default_ledger = ExportLedger()
+        return _default_ledger
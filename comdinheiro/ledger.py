@@ -0,0 +1,442 @@
+"""
+Incremental transaction sync backed by a local SQLite ledger.
+
+The movimentacoes view (ComprasVendas002.php) returns every transaction
+registered in the data_cadastro_ini..data_cadastro_fim range, and old
+transactions almost never change. TransactionSync keeps the transactions of
+each portfolio in a SQLite ledger together with a sync watermark (the
+synced date range). A request only fetches the dates outside the watermark
+plus a short trailing re-check window, and range queries are answered from
+the ledger. The simplified interface (main_interface.get_transactions) and
+the wrapper's get_transactions action sync through the process-wide ledger
+of get_transaction_ledger().
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import (
+    LEDGER_DEFAULT_PATH, LEDGER_RECHECK_DAYS, LEDGER_SYNC_INTERVAL,
+    LEDGER_DATE_HEADER_HINT, LEDGER_ROW_DATE_FORMATS, DATE_FORMAT_INPUT,
+    ERROR_MESSAGES
+)
+from .deadline import Deadline, DeadlineLike
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger_rows (
+    scope TEXT NOT NULL,
+    row_date TEXT NOT NULL,
+    row_hash TEXT NOT NULL,
+    row_json TEXT NOT NULL,
+    PRIMARY KEY (scope, row_hash)
+);
+CREATE INDEX IF NOT EXISTS ledger_rows_by_date ON ledger_rows (scope, row_date);
+CREATE TABLE IF NOT EXISTS ledger_state (
+    scope TEXT PRIMARY KEY,
+    synced_from TEXT NOT NULL,
+    synced_to TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    header_json TEXT
+);
+"""
+
+
+def find_date_column(header: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Find the registration date (data de cadastro) column from the header row.
+
+    Other date columns (operation, settlement) are not used: the sync
+    windows are data_cadastro ranges, so rows must be filed by that date.
+
+    Args:
+        header (dict): Cleaned header row (lin0)
+
+    Returns:
+        str: Column key, or None if no header label mentions the registration date
+    """
+    if not header:
+        return None
+
+    for col_key, label in header.items():
+        if LEDGER_DATE_HEADER_HINT in str(label).lower():
+            return col_key
+    return None
+
+
+def parse_row_date(value: Any) -> Optional[date]:
+    """
+    Parse a transaction date cell (e.g. "12/03/2024").
+
+    Args:
+        value: Cell value
+
+    Returns:
+        date: Parsed date or None
+    """
+    if not isinstance(value, str):
+        return None
+
+    text = value.strip()
+    for date_format in LEDGER_ROW_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+class TransactionLedger:
+    """
+    SQLite store for synced transactions and their watermarks.
+
+    Each scope (account, portfolio, bank filter, operation filter) has its
+    own rows and watermark. The database can be shared between processes;
+    within a process the connection is guarded by a lock.
+    """
+
+    def __init__(self, path: str = LEDGER_DEFAULT_PATH):
+        """
+        Open (or create) the ledger database.
+
+        Args:
+            path (str): SQLite file path, or ':memory:'
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+
+        with self._lock, self._connection:
+            if path != ':memory:':
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def scope_key(account: str, portfolio: str, bank: str = 'todos',
+                  operation: str = 'todos') -> str:
+        """Build the key identifying one synced transaction listing."""
+        return json.dumps([account, portfolio, bank or 'todos', operation or 'todos'],
+                          ensure_ascii=False)
+
+    def get_state(self, scope: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the watermark of a scope.
+
+        Returns:
+            dict: 'synced_from', 'synced_to' (date), 'synced_at' (epoch
+                  seconds) and 'header', or None if never synced
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT synced_from, synced_to, synced_at, header_json '
+                'FROM ledger_state WHERE scope = ?', (scope,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            'synced_from': date.fromisoformat(row[0]),
+            'synced_to': date.fromisoformat(row[1]),
+            'synced_at': row[2],
+            'header': json.loads(row[3]) if row[3] else None
+        }
+
+    def replace_window(self, scope: str, window_start: date, window_end: date,
+                       table: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Store the transactions fetched for a date window.
+
+        Rows dated inside the window are replaced by the fetched ones, and
+        the watermark is widened to cover the window. Identical rows fetched
+        again are deduplicated by content (and position among equal rows).
+        Rows without a readable registration date are not stored: they cannot
+        be placed in any window, so a later re-check could not replace them.
+
+        Args:
+            scope (str): Scope key from scope_key()
+            window_start (date): First date of the fetched window
+            window_end (date): Last date of the fetched window
+            table (dict): Cleaned lin/col table returned by the transactions view
+
+        Returns:
+            int: Number of rows stored (undated rows are not counted)
+
+        Raises:
+            ValueError: If the table has rows but no registration date column
+        """
+        header = table.get('lin0')
+        date_column = find_date_column(header)
+        if date_column is None and any(row_key != 'lin0' for row_key in table):
+            raise ValueError(ERROR_MESSAGES['ledger_date_column'])
+        occurrences: Dict[str, int] = {}
+        records = []
+        undated = 0
+
+        for row_key, row in table.items():
+            if row_key == 'lin0':
+                continue
+
+            row_date = parse_row_date(row.get(date_column))
+            if row_date is None:
+                undated += 1
+                continue
+
+            row_json = json.dumps(row, sort_keys=True, ensure_ascii=False)
+            occurrence = occurrences.get(row_json, 0)
+            occurrences[row_json] = occurrence + 1
+            row_hash = hashlib.sha1(f"{row_json}#{occurrence}".encode('utf-8')).hexdigest()
+            records.append((scope, row_date.isoformat(), row_hash, row_json))
+
+        if undated:
+            logger.warning("Ledger skipped %d transactions without a registration date", undated)
+
+        header_json = json.dumps(header, ensure_ascii=False) if header is not None else None
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM ledger_rows WHERE scope = ? AND row_date BETWEEN ? AND ?',
+                (scope, window_start.isoformat(), window_end.isoformat())
+            )
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO ledger_rows (scope, row_date, row_hash, row_json) '
+                'VALUES (?, ?, ?, ?)', records
+            )
+            self._connection.execute(
+                'INSERT INTO ledger_state (scope, synced_from, synced_to, synced_at, header_json) '
+                'VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(scope) DO UPDATE SET '
+                'synced_from = MIN(synced_from, excluded.synced_from), '
+                'synced_to = MAX(synced_to, excluded.synced_to), '
+                'synced_at = excluded.synced_at, '
+                'header_json = COALESCE(excluded.header_json, header_json)',
+                (scope, window_start.isoformat(), window_end.isoformat(), time.time(), header_json)
+            )
+
+        return len(records)
+
+    def query(self, scope: str, start: date, end: date) -> List[Dict[str, Any]]:
+        """
+        Get the stored transactions dated between start and end (inclusive).
+
+        Args:
+            scope (str): Scope key from scope_key()
+            start (date): First date
+            end (date): Last date
+
+        Returns:
+            list: Rows in date order
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT row_json FROM ledger_rows '
+                'WHERE scope = ? AND row_date BETWEEN ? AND ? ORDER BY row_date, rowid',
+                (scope, start.isoformat(), end.isoformat())
+            ).fetchall()
+
+        return [json.loads(row_json) for (row_json,) in rows]
+
+    def clear(self, scope: str = None) -> None:
+        """
+        Drop the rows and watermark of one scope, or of every scope.
+
+        Args:
+            scope (str, optional): Scope key from scope_key()
+        """
+        with self._lock, self._connection:
+            if scope is None:
+                self._connection.execute('DELETE FROM ledger_rows')
+                self._connection.execute('DELETE FROM ledger_state')
+            else:
+                self._connection.execute('DELETE FROM ledger_rows WHERE scope = ?', (scope,))
+                self._connection.execute('DELETE FROM ledger_state WHERE scope = ?', (scope,))
+
+
+class TransactionSync:
+    """
+    Incremental sync of the movimentacoes view into a TransactionLedger.
+
+    Example:
+        sync = TransactionSync(api, TransactionLedger())
+        data, error = sync.get_transactions("Carteira_Principal", "2024-01-01", "2024-12-31")
+    """
+
+    def __init__(self, api, ledger: TransactionLedger = None,
+                 recheck_days: int = LEDGER_RECHECK_DAYS,
+                 sync_interval: float = LEDGER_SYNC_INTERVAL):
+        """
+        Initialize the sync.
+
+        Args:
+            api (ComdinheiroAPI): Client used to fetch transaction windows
+            ledger (TransactionLedger): Ledger store (default: LEDGER_DEFAULT_PATH)
+            recheck_days (int): Trailing synced days fetched again on each sync
+            sync_interval (float): Seconds during which a synced range is
+                                   answered without any upstream call
+        """
+        self.api = api
+        self.ledger = ledger if ledger is not None else TransactionLedger()
+        self.recheck_days = recheck_days
+        self.sync_interval = sync_interval
+
+    def _scope(self, portfolio: str, bank: str, operation: str) -> str:
+        return TransactionLedger.scope_key(self.api.credentials['username'],
+                                           portfolio, bank, operation)
+
+    def plan_windows(self, state: Optional[Dict[str, Any]], start: date,
+                     end: date) -> List[Tuple[date, date]]:
+        """
+        Decide which date windows must be fetched upstream.
+
+        Args:
+            state (dict): Current watermark from TransactionLedger.get_state
+            start (date): First requested date
+            end (date): Last requested date
+
+        Returns:
+            list: (window_start, window_end) pairs, possibly empty
+        """
+        if state is None:
+            return [(start, end)]
+
+        windows = []
+        synced_from, synced_to = state['synced_from'], state['synced_to']
+
+        # Older dates than ever synced
+        if start < synced_from:
+            windows.append((start, synced_from - timedelta(days=1)))
+
+        # New dates, plus the trailing re-check window
+        recheck_from = max(synced_to - timedelta(days=self.recheck_days), synced_from)
+        is_fresh = time.time() - state['synced_at'] < self.sync_interval
+
+        if end > synced_to or (end >= recheck_from and not is_fresh):
+            windows.append((recheck_from, end))
+
+        return windows
+
+    def sync(self, portfolio: str, start_date: str, end_date: str = None,
+             bank: str = 'todos', operation: str = 'todos',
+             deadline: Optional[DeadlineLike] = None) -> Optional[str]:
+        """
+        Bring the ledger up to date for a date range.
+
+        Args:
+            portfolio (str): Portfolio name
+            start_date (str): Start date in YYYY-MM-DD format
+            end_date (str): End date in YYYY-MM-DD format (default: today)
+            bank (str): Bank filter for transactions
+            operation (str): Operation filter for transactions
+            deadline (float or Deadline, optional): Time budget in seconds
+                shared by every window fetched
+
+        Returns:
+            str: Error message, or None on success
+        """
+        try:
+            start, end = self._parse_range(start_date, end_date)
+        except ValueError:
+            return ERROR_MESSAGES['invalid_date']
+
+        scope = self._scope(portfolio, bank, operation)
+        deadline = Deadline.coerce(deadline)
+
+        # Nothing can be registered after today, so the range is synced up to today
+        end = min(end, date.today())
+        if end < start:
+            return None
+
+        for window_start, window_end in self.plan_windows(self.ledger.get_state(scope), start, end):
+            data, error = self.api.get_portfolio_data(
+                portfolio,
+                start_date=window_start.strftime(DATE_FORMAT_INPUT),
+                end_date=window_end.strftime(DATE_FORMAT_INPUT),
+                view_type='movimentacoes', bank=bank, operation=operation,
+                deadline=deadline
+            )
+
+            # A window without transactions is still a synced window
+            if error == ERROR_MESSAGES['no_data']:
+                data = {'tables': {'tab0': {}}}
+            elif error:
+                return error
+
+            try:
+                self.ledger.replace_window(scope, window_start, window_end,
+                                           data['tables']['tab0'])
+            except ValueError as e:
+                return str(e)
+
+        return None
+
+    def get_transactions(self, portfolio: str, start_date: str, end_date: str = None,
+                         bank: str = 'todos', operation: str = 'todos',
+                         deadline: Optional[DeadlineLike] = None
+                         ) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Get transactions for a date range, syncing only what is missing.
+
+        Args:
+            portfolio (str): Portfolio name
+            start_date (str): Start date in YYYY-MM-DD format
+            end_date (str): End date in YYYY-MM-DD format (default: today)
+            bank (str): Bank filter for transactions
+            operation (str): Operation filter for transactions
+            deadline (float or Deadline, optional): Time budget in seconds for the sync
+
+        Returns:
+            tuple: (data_dict, error_message) in the same shape as
+                   get_portfolio_data(view_type='movimentacoes')
+        """
+        error = self.sync(portfolio, start_date, end_date, bank, operation, deadline)
+        if error:
+            return None, error
+
+        start, end = self._parse_range(start_date, end_date)
+        scope = self._scope(portfolio, bank, operation)
+        state = self.ledger.get_state(scope)
+
+        tab0 = {}
+        if state and state['header'] is not None:
+            tab0['lin0'] = state['header']
+        for index, row in enumerate(self.ledger.query(scope, start, end), start=1):
+            tab0[f'lin{index}'] = row
+
+        return {'tables': {'tab0': tab0}}, None
+
+    @staticmethod
+    def _parse_range(start_date: str, end_date: str = None) -> Tuple[date, date]:
+        start = datetime.strptime(start_date, DATE_FORMAT_INPUT).date()
+        end = (datetime.strptime(end_date, DATE_FORMAT_INPUT).date()
+               if end_date else date.today())
+        return start, end
+
+
+_default_ledger = None
+_default_ledger_lock = threading.Lock()
+
+
+def get_transaction_ledger() -> TransactionLedger:
+    """Get the process-wide transaction ledger at LEDGER_DEFAULT_PATH, opening it on first use."""
+    global _default_ledger
+
+    with _default_ledger_lock:
+        if _default_ledger is None:
+            _default_ledger = TransactionLedger()
+        return _default_ledger
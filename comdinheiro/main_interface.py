@@ -6,50 +6,88 @@ legacy implementation while maintaining backward compatibility.
 """
 
 import warnings
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, Iterable, Iterator
 from datetime import datetime
 
-from .api_client import ComdinheiroAPI
-from .auth_manager import AuthManager
 from .data_processor import DataProcessor
-from .config import ERROR_MESSAGES, DEFAULT_VIEW_TYPE
+from .config import (
+    ERROR_MESSAGES, DEFAULT_VIEW_TYPE, BATCH_MAX_CONCURRENCY, EXPORT_MAX_CONCURRENCY,
+    EXPORT_SKIP_EXPORTED
+)
+from .deadline import DeadlineLike
+
+
+def _get_api_client(username: str = None, password: str = None):
+    """
+    Get an API client for explicit credentials or the current session.
+    
+    Clients come from the shared registry, so repeated calls with the same
+    credentials reuse one session and its keep-alive connections. The client
+    and authentication modules are imported here so that the formatting
+    helpers of this module can be used without loading requests or flask.
+    
+    Returns:
+        ComdinheiroAPI: API client or None if no credentials are available
+    """
+    if username and password:
+        from .client_registry import get_client
+        return get_client(username, password)
+    
+    from .auth_manager import AuthManager
+    return AuthManager.create_authenticated_api_client()
+
+
+def _export_ledger(skip_exported: bool):
+    """
+    Get the process-wide export ledger, or None when exported rows are not skipped.
+    
+    Imported here so that pandas and sqlite3 are only loaded by exports.
+    """
+    if not skip_exported:
+        return None
+    
+    from .export_ledger import get_export_ledger
+    return get_export_ledger()
 
 
 # ==========================================
 # NEW SIMPLIFIED INTERFACE
 # ==========================================
 
-def get_portfolio_list(username: str = None, password: str = None) -> List[Dict]:
+def get_portfolio_list(username: str = None, password: str = None,
+                       deadline: Optional[DeadlineLike] = None) -> List[Dict]:
     """
     Get list of available portfolios with their balances and institutions.
     
     Args:
         username (str, optional): Comdinheiro username. If None, uses session credentials.
         password (str, optional): Comdinheiro password. If None, uses session credentials.
+        deadline (float or Deadline, optional): Overall time budget in seconds
         
     Returns:
         list: List of portfolio dictionaries
         
+    Raises:
+        DeadlineExceeded: If the deadline runs out
+        
     Example:
         portfolios = get_portfolio_list()
         for portfolio in portfolios:
             print(f"{portfolio['nome_portfolio']}: {portfolio['saldo_bruto']}")
     """
-    if username and password:
-        api = ComdinheiroAPI(username, password)
-    else:
-        api = AuthManager.create_authenticated_api_client()
-        if not api:
-            return []
+    api = _get_api_client(username, password)
+    if not api:
+        return []
     
-    result = api.get_portfolio_list()
+    result = api.get_portfolio_list(deadline)
     return result if result else []
 
 
 def get_portfolio_data(portfolio: str, start_date: str = None, end_date: str = None,
                       view_type: str = DEFAULT_VIEW_TYPE, bank: str = 'todos', 
                       operation: str = 'todos', username: str = None, 
-                      password: str = None) -> Tuple[Optional[Dict], Optional[str]]:
+                      password: str = None,
+                      deadline: Optional[DeadlineLike] = None) -> Tuple[Optional[Dict], Optional[str]]:
     """
     Get comprehensive portfolio data based on view type.
     
@@ -64,6 +102,8 @@ def get_portfolio_data(portfolio: str, start_date: str = None, end_date: str = N
         operation (str): Operation filter for transactions
         username (str, optional): Comdinheiro username
         password (str, optional): Comdinheiro password
+        deadline (float or Deadline, optional): Overall time budget in seconds;
+            when it runs out the error message says so
         
     Returns:
         tuple: (data_dict, error_message) - data_dict is None if error occurred
@@ -75,18 +115,146 @@ def get_portfolio_data(portfolio: str, start_date: str = None, end_date: str = N
         else:
             print(f"Error: {error}")
     """
-    if username and password:
-        api = ComdinheiroAPI(username, password)
-    else:
-        api = AuthManager.create_authenticated_api_client()
-        if not api:
-            return None, ERROR_MESSAGES['invalid_credentials']
+    api = _get_api_client(username, password)
+    if not api:
+        return None, ERROR_MESSAGES['invalid_credentials']
+    
+    return api.get_portfolio_data(portfolio, start_date, end_date, view_type, bank, operation,
+                                  deadline)
+
+
+def get_portfolio_data_many(portfolios: Iterable[str], view_type: str = DEFAULT_VIEW_TYPE,
+                            end_date: str = None, start_date: str = None,
+                            bank: str = 'todos', operation: str = 'todos',
+                            max_concurrency: int = BATCH_MAX_CONCURRENCY,
+                            username: str = None, password: str = None,
+                            deadline: Optional[DeadlineLike] = None
+                            ) -> Iterator[Tuple[str, Optional[Dict], Optional[str]]]:
+    """
+    Get portfolio data for a whole book of portfolios.
+    
+    Requests run with bounded concurrency and results are streamed back as
+    they finish, so wall time scales with max_concurrency rather than with
+    the number of portfolios. Errors are reported per portfolio.
+    
+    Args:
+        portfolios (iterable): Portfolio names
+        view_type (str): View type ('consolidado', 'relatorio', 'movimentacoes', etc.)
+        end_date (str, optional): End date in YYYY-MM-DD format
+        start_date (str, optional): Start date in YYYY-MM-DD format
+        bank (str): Bank filter for transactions
+        operation (str): Operation filter for transactions
+        max_concurrency (int): Maximum portfolio requests in flight
+        username (str, optional): Comdinheiro username
+        password (str, optional): Comdinheiro password
+        deadline (float or Deadline, optional): Time budget in seconds for the
+            whole batch; portfolios not done in time get the timeout error
+        
+    Yields:
+        tuple: (portfolio, data_dict, error_message) - data_dict is None if error occurred
+        
+    Example:
+        for portfolio, data, error in get_portfolio_data_many(carteiras, end_date="2025-09-22"):
+            if data:
+                print(f"{portfolio}: {data.get('total_geral', '0,00')}")
+            else:
+                print(f"{portfolio}: {error}")
+    """
+    api = _get_api_client(username, password)
+    if not api:
+        for portfolio in portfolios:
+            yield portfolio, None, ERROR_MESSAGES['invalid_credentials']
+        return
     
-    return api.get_portfolio_data(portfolio, start_date, end_date, view_type, bank, operation)
+    yield from api.get_portfolio_data_many(portfolios, view_type, end_date, start_date,
+                                           bank, operation, max_concurrency, deadline)
+
+
+def iter_portfolio_data(portfolio: str, start_date: str = None, end_date: str = None,
+                        view_type: str = 'movimentacoes', bank: str = 'todos',
+                        operation: str = 'todos', username: str = None,
+                        password: str = None,
+                        deadline: Optional[DeadlineLike] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream portfolio view rows without loading the whole report in memory.
+    
+    Meant for large views such as the transaction history (movimentacoes)
+    of long-lived portfolios.
+    
+    Args:
+        portfolio (str): Portfolio name
+        start_date (str, optional): Start date in YYYY-MM-DD format
+        end_date (str, optional): End date in YYYY-MM-DD format
+        view_type (str): View type ('movimentacoes', 'relatorio', etc.)
+        bank (str): Bank filter for transactions
+        operation (str): Operation filter for transactions
+        username (str, optional): Comdinheiro username
+        password (str, optional): Comdinheiro password
+        deadline (float or Deadline, optional): Time budget in seconds for the whole stream
+        
+    Yields:
+        tuple: (row_key, row_dict), header row (lin0) first
+        
+    Raises:
+        ValueError: If no credentials are available or the response is malformed
+        requests.RequestException: If the request fails
+        DeadlineExceeded: If the deadline runs out before the last row
+        
+    Example:
+        for row_key, row in iter_portfolio_data("Carteira_Principal", "2020-01-01"):
+            if row_key != 'lin0':
+                process(row)
+    """
+    api = _get_api_client(username, password)
+    if not api:
+        raise ValueError(ERROR_MESSAGES['invalid_credentials'])
+    
+    yield from api.iter_portfolio_data(portfolio, start_date, end_date, view_type,
+                                       bank, operation, deadline=deadline)
+
+
+def get_transactions(portfolio: str, start_date: str, end_date: str = None,
+                     bank: str = 'todos', operation: str = 'todos',
+                     username: str = None, password: str = None,
+                     deadline: Optional[DeadlineLike] = None) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Get the transactions (movimentacoes) of a portfolio, syncing only what is missing.
+    
+    Transactions are kept in the local ledger at LEDGER_DEFAULT_PATH (see
+    comdinheiro.ledger): only dates not synced yet and a short re-check
+    window are fetched upstream, the rest is answered locally.
+    
+    Args:
+        portfolio (str): Portfolio name
+        start_date (str): Start date in YYYY-MM-DD format
+        end_date (str, optional): End date in YYYY-MM-DD format (default: today)
+        bank (str): Bank filter for transactions
+        operation (str): Operation filter for transactions
+        username (str, optional): Comdinheiro username
+        password (str, optional): Comdinheiro password
+        deadline (float or Deadline, optional): Overall time budget in seconds
+        
+    Returns:
+        tuple: (data_dict, error_message) in the same shape as
+               get_portfolio_data(view_type='movimentacoes')
+        
+    Example:
+        data, error = get_transactions("Carteira_Principal", "2024-01-01", "2024-12-31")
+    """
+    api = _get_api_client(username, password)
+    if not api:
+        return None, ERROR_MESSAGES['invalid_credentials']
+    
+    # Imported here so that sqlite3 is only loaded by transaction syncs
+    from .ledger import TransactionSync, get_transaction_ledger
+    return TransactionSync(api, get_transaction_ledger()).get_transactions(
+        portfolio, start_date, end_date, bank, operation, deadline
+    )
 
 
 def get_asset_allocation(portfolio: str, end_date: str = None, 
-                        username: str = None, password: str = None) -> Optional[Dict]:
+                        username: str = None, password: str = None,
+                        deadline: Optional[DeadlineLike] = None) -> Optional[Dict]:
     """
     Get asset allocation data for a portfolio.
     
@@ -95,28 +263,31 @@ def get_asset_allocation(portfolio: str, end_date: str = None,
         end_date (str, optional): End date in YYYY-MM-DD format
         username (str, optional): Comdinheiro username
         password (str, optional): Comdinheiro password
+        deadline (float or Deadline, optional): Overall time budget in seconds;
+            balance or performance not ready in time are reported in 'errors'
         
     Returns:
         dict: Asset allocation data with chart, balance, and performance
         
+    Raises:
+        DeadlineExceeded: If the allocation report is not ready in time
+        
     Example:
         allocation = get_asset_allocation("Carteira_Principal")
         if allocation:
             print(f"Balance: {allocation['saldo_bruto']}")
             print(f"Allocations: {allocation['grafico1']}")
     """
-    if username and password:
-        api = ComdinheiroAPI(username, password)
-    else:
-        api = AuthManager.create_authenticated_api_client()
-        if not api:
-            return None
+    api = _get_api_client(username, password)
+    if not api:
+        return None
     
-    return api.get_asset_allocation(portfolio, end_date)
+    return api.get_asset_allocation(portfolio, end_date, deadline)
 
 
 def get_portfolio_balance(portfolio: str, date: str = None,
-                         username: str = None, password: str = None) -> Optional[float]:
+                         username: str = None, password: str = None,
+                         deadline: Optional[DeadlineLike] = None) -> Optional[float]:
     """
     Get current balance for a specific portfolio.
     
@@ -125,51 +296,100 @@ def get_portfolio_balance(portfolio: str, date: str = None,
         date (str, optional): Date in YYYY-MM-DD format
         username (str, optional): Comdinheiro username
         password (str, optional): Comdinheiro password
+        deadline (float or Deadline, optional): Overall time budget in seconds
         
     Returns:
         float: Portfolio balance or None if error
         
+    Raises:
+        DeadlineExceeded: If the deadline runs out
+        
     Example:
         balance = get_portfolio_balance("Carteira_Principal")
         print(f"Current balance: R$ {balance:,.2f}")
     """
-    if username and password:
-        api = ComdinheiroAPI(username, password)
-    else:
-        api = AuthManager.create_authenticated_api_client()
-        if not api:
-            return None
+    api = _get_api_client(username, password)
+    if not api:
+        return None
     
-    return api.get_portfolio_balance(portfolio, date)
+    return api.get_portfolio_balance(portfolio, date, deadline)
 
 
 def export_portfolio_data(content_data, on_error: int = 0,
-                         username: str = None, password: str = None) -> Optional[str]:
+                         username: str = None, password: str = None,
+                         deadline: Optional[DeadlineLike] = None,
+                         skip_exported: bool = EXPORT_SKIP_EXPORTED) -> Optional[str]:
     """
     Export data to Comdinheiro API.
     
+    Rows this account exported before are skipped, using the local export
+    ledger at EXPORT_LEDGER_PATH (see comdinheiro.export_ledger).
+    
     Args:
         content_data: DataFrame or data to export
         on_error (int): Error handling mode
         username (str, optional): Comdinheiro username
         password (str, optional): Comdinheiro password
+        deadline (float or Deadline, optional): Overall time budget in seconds
+        skip_exported (bool): Send only rows not exported before
         
     Returns:
         str: Response message or None if error
         
+    Raises:
+        DeadlineExceeded: If the deadline runs out
+        
     Example:
         result = export_portfolio_data(df_transactions)
         if result:
             print(f"Export result: {result}")
     """
-    if username and password:
-        api = ComdinheiroAPI(username, password)
-    else:
-        api = AuthManager.create_authenticated_api_client()
-        if not api:
-            return None
+    api = _get_api_client(username, password)
+    if not api:
+        return None
+    
+    return api.export_data(content_data, on_error, deadline, _export_ledger(skip_exported))
+
+
+def export_portfolio_data_bulk(content_data, on_error: int = 0,
+                               username: str = None, password: str = None,
+                               progress_path: str = None,
+                               max_concurrency: int = EXPORT_MAX_CONCURRENCY,
+                               deadline: Optional[DeadlineLike] = None,
+                               skip_exported: bool = EXPORT_SKIP_EXPORTED
+                               ) -> Optional[Dict[str, Any]]:
+    """
+    Export a large DataFrame to Comdinheiro in chunks, resumable after a failure.
+    
+    Rows this account exported before are skipped, as in export_portfolio_data.
+    
+    Args:
+        content_data: DataFrame to export
+        on_error (int): Error handling mode
+        username (str, optional): Comdinheiro username
+        password (str, optional): Comdinheiro password
+        progress_path (str, optional): Progress file; calling again with the
+            same data and file only sends the chunks still missing
+        max_concurrency (int): Maximum chunks uploaded at once
+        deadline (float or Deadline, optional): Overall time budget in seconds
+        skip_exported (bool): Send only rows not exported before
+        
+    Returns:
+        dict: Export summary (see ComdinheiroAPI.export_data_bulk) or None
+              if no credentials are available
+        
+    Example:
+        result = export_portfolio_data_bulk(df_transactions, progress_path='import.progress')
+        if not result['complete']:
+            print(f"Failed chunks: {result['failed']}")
+    """
+    api = _get_api_client(username, password)
+    if not api:
+        return None
     
-    return api.export_data(content_data, on_error)
+    return api.export_data_bulk(content_data, on_error, max_concurrency=max_concurrency,
+                                progress_path=progress_path, deadline=deadline,
+                                ledger=_export_ledger(skip_exported))
 
 
 # ==========================================
@@ -217,24 +437,16 @@ def carteiras_patrimonio(username: str, password: str) -> dict:
         stacklevel=2
     )
     
-    portfolios = get_portfolio_list(username, password)
-    if not portfolios:
+    api = _get_api_client(username, password)
+    if not api:
         return {}
     
-    patrimonio = {}
-    for portfolio in portfolios:
-        name = portfolio.get('nome_portfolio', '')
-        balance_str = portfolio.get('saldo_bruto', '0')
-        
-        if name:
-            try:
-                # Convert Brazilian currency format to float
-                balance = DataProcessor.parse_brazilian_currency(balance_str)
-                patrimonio[name] = balance
-            except (ValueError, TypeError):
-                patrimonio[name] = 0.0
-                
-    return patrimonio
+    # One report call returns the balance of every portfolio
+    snapshot = api.get_balance_snapshot()
+    if not snapshot:
+        return {}
+    
+    return dict(snapshot['balances'])
 
 
 def asset_allocation_comdinheiro(username: str, password: str, carteira: str,
@@ -325,13 +537,15 @@ def envia_comdinheiro(content_data, on_error: int = 0,
 # UTILITY FUNCTIONS
 # ==========================================
 
-def test_api_connection(username: str = None, password: str = None) -> bool:
+def test_api_connection(username: str = None, password: str = None,
+                        deadline: Optional[DeadlineLike] = None) -> bool:
     """
     Test connection to Comdinheiro API.
     
     Args:
         username (str, optional): Comdinheiro username
         password (str, optional): Comdinheiro password
+        deadline (float or Deadline, optional): Overall time budget in seconds
         
     Returns:
         bool: True if connection successful
@@ -342,14 +556,11 @@ def test_api_connection(username: str = None, password: str = None) -> bool:
         else:
             print("API connection failed")
     """
-    if username and password:
-        api = ComdinheiroAPI(username, password)
-    else:
-        api = AuthManager.create_authenticated_api_client()
-        if not api:
-            return False
+    api = _get_api_client(username, password)
+    if not api:
+        return False
     
-    return api.test_connection()
+    return api.test_connection(deadline)
 
 
 def get_user_portfolios() -> List[str]:
@@ -0,0 +1,260 @@
+"""
+In-process metrics for upstream calls and processing stages.
+
+A slow dashboard can come from Comdinheiro itself, from decoding its JSON or
+from DataProcessor. The client and the processor record into a process-wide
+MetricsRegistry:
+
+- comdinheiro_request_seconds{endpoint,status}: upstream request latency
+- comdinheiro_call_seconds{view_type}: get_portfolio_data calls, request
+  and processing included
+- comdinheiro_response_bytes{endpoint}: response body sizes
+- comdinheiro_decode_seconds{endpoint}: JSON decoding time
+- comdinheiro_requests_total{endpoint,status}: requests by HTTP status or
+  error kind ('error', 'timeout')
+- comdinheiro_cache_lookups_total{endpoint,layer,result}: memory/disk cache
+  hits and misses
+- comdinheiro_stage_seconds{stage,view_type}: time spent in
+  clean_table_data and each _process_* function
+
+Metrics can be exported as Prometheus text (to_prometheus) or as JSON
+(snapshot).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from .config import METRICS_LATENCY_BUCKETS, METRICS_BYTES_BUCKETS
+
+_METRIC_HELP = {
+    'comdinheiro_request_seconds': 'Latency of upstream Comdinheiro requests in seconds',
+    'comdinheiro_call_seconds': 'Duration of get_portfolio_data calls by view type in seconds',
+    'comdinheiro_response_bytes': 'Size of upstream response bodies in bytes',
+    'comdinheiro_decode_seconds': 'Time spent decoding upstream JSON responses in seconds',
+    'comdinheiro_requests_total': 'Upstream requests by HTTP status or error kind',
+    'comdinheiro_cache_lookups_total': 'Response cache lookups by cache layer and result',
+    'comdinheiro_stage_seconds': 'Time spent in data processing stages in seconds'
+}
+
+_METRIC_BUCKETS = {
+    'comdinheiro_response_bytes': METRICS_BYTES_BUCKETS
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as exported by Prometheus."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value (must be called with the registry lock held)."""
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative_counts(self) -> List[int]:
+        """Get the number of values at or below each bucket bound."""
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of counters and histograms keyed by name and labels.
+
+    Example:
+        metrics.inc('comdinheiro_requests_total', endpoint='portfolio_report', status='200')
+        with metrics.timer('comdinheiro_stage_seconds', stage='clean_table_data'):
+            ...
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = METRICS_LATENCY_BUCKETS):
+        """
+        Initialize an empty registry.
+
+        Args:
+            latency_buckets (sequence): Default histogram bucket bounds
+        """
+        self.latency_buckets = tuple(latency_buckets)
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): Metric name
+            amount (float): Increment
+            **labels: Label values
+        """
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Record a value in a histogram.
+
+        Args:
+            name (str): Metric name
+            value (float): Observed value (seconds, bytes...)
+            **labels: Label values
+        """
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(
+                    _METRIC_BUCKETS.get(name, self.latency_buckets)
+                )
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Record the duration of the with-block in a histogram, in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self) -> None:
+        """Drop every recorded value."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get every metric as JSON-serializable data.
+
+        Returns:
+            dict: 'counters' and 'histograms' by metric name, each a list of
+                  series with their labels, plus 'cache_hit_ratio' per
+                  endpoint and cache layer
+        """
+        with self._lock:
+            counters = {
+                name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [{
+                    'labels': dict(key),
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'buckets': dict(zip(map(_format_bound, histogram.buckets),
+                                        histogram.cumulative_counts()))
+                } for key, histogram in series.items()]
+                for name, series in self._histograms.items()
+            }
+
+        return {
+            'started_at': self.started_at,
+            'counters': counters,
+            'histograms': histograms,
+            'cache_hit_ratio': self._cache_hit_ratios(counters)
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text, one '# HELP'/'# TYPE' block per metric
+        """
+        lines = []
+
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# HELP {name} {_METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+            for name in sorted(self._histograms):
+                lines.append(f"# HELP {name} {_METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    for bound, count in zip(histogram.buckets, histogram.cumulative_counts()):
+                        bucket_key = key + (('le', _format_bound(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_key)} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} "
+                                 f"{histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    @staticmethod
+    def _label_key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((name, '' if value is None else str(value))
+                            for name, value in labels.items()))
+
+    @staticmethod
+    def _cache_hit_ratios(counters: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, float]]:
+        """Hit ratio per endpoint and cache layer from the lookup counters."""
+        totals: Dict[Tuple[str, str], List[float]] = {}
+
+        for series in counters.get('comdinheiro_cache_lookups_total', []):
+            labels = series['labels']
+            hits_lookups = totals.setdefault((labels.get('endpoint', ''), labels.get('layer', '')),
+                                             [0, 0])
+            hits_lookups[1] += series['value']
+            if labels.get('result') == 'hit':
+                hits_lookups[0] += series['value']
+
+        ratios: Dict[str, Dict[str, float]] = {}
+        for (endpoint, layer), (hits, lookups) in totals.items():
+            ratios.setdefault(endpoint, {})[layer] = hits / lookups if lookups else 0.0
+        return ratios
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in key) + '}'
+
+
+# Process-wide registry used by the client and the data processor
+metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return metrics
@@ -0,0 +1,185 @@
+"""
+Request plans: PARAM_TEMPLATES compiled once into pre-encoded query strings.
+
+build_parameters copies a template of 20-30 keys, formats every placeholder
+and looks for extra keyword arguments on each call, and _build_url then
+filters and urlencodes every pair again. A RequestPlan does that work once at
+import: static pairs are encoded and joined ahead of time, and each call only
+fills the placeholder slots. It also builds the canonical form of the URL
+(see cache.canonical_url) in the same pass, so cache and single-flight keys
+need no parsing.
+
+Plans produce exactly the URL of _build_url(endpoint, build_parameters(...)),
+including its quirks: placeholders without a value keep the raw '{name}',
+keyword arguments the template does not use are appended as extra
+parameters, and None or empty values are left out.
+"""
+
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote_plus, urlencode
+
+from .config import PARAM_TEMPLATES, build_parameters
+
+_formatter = Formatter()
+_MISSING = object()
+
+# A run is either a pre-encoded 'k=v&k=v' fragment or the index of a slot
+Run = Union[str, int]
+
+
+class PlannedURL(str):
+    """A request URL that carries its canonical cache key (see canonical_url)."""
+
+    cache_key: str
+
+
+def _encode(value: Any) -> str:
+    # Same conversion as urlencode: strings and bytes as they are, the rest through str()
+    return quote_plus(value if isinstance(value, (str, bytes)) else str(value))
+
+
+def _runs(entries: List[Tuple[str, Union[str, int]]]) -> List[Run]:
+    """Join consecutive pre-encoded pairs, keeping slot indexes apart."""
+    runs: List[Run] = []
+    static: List[str] = []
+
+    for _, item in entries:
+        if isinstance(item, int):
+            if static:
+                runs.append('&'.join(static))
+                static = []
+            runs.append(item)
+        else:
+            static.append(item)
+
+    if static:
+        runs.append('&'.join(static))
+    return runs
+
+
+def _render(runs: List[Run], slot_pairs: List[str]) -> List[str]:
+    """Resolve the slots of a run list, dropping the empty ones."""
+    parts = []
+    for run in runs:
+        if isinstance(run, int):
+            run = slot_pairs[run]
+            if not run:
+                continue
+        parts.append(run)
+    return parts
+
+
+@lru_cache(maxsize=64)
+def _canonical_base(endpoint_url: str) -> str:
+    # Import here to avoid circular imports
+    from .cache import canonical_url
+    return canonical_url(endpoint_url)
+
+
+class RequestPlan:
+    """A PARAM_TEMPLATES entry compiled into pre-encoded query fragments."""
+
+    def __init__(self, template_name: str, template: Dict[str, Any]):
+        """
+        Compile a parameter template.
+
+        Args:
+            template_name (str): Key of PARAM_TEMPLATES
+            template (dict): Parameter template, '{name}' marking placeholders
+        """
+        self.template_name = template_name
+        self.template_keys = frozenset(template)
+
+        # (encoded 'key=', raw template value, field when the value is just '{field}')
+        self._slots: List[Tuple[str, str, Optional[str]]] = []
+        placeholders = set()
+        entries: List[Tuple[str, Union[str, int]]] = []
+
+        for key, value in template.items():
+            if isinstance(value, str) and '{' in value:
+                fields = [field for _, field, _, _ in _formatter.parse(value) if field is not None]
+                placeholders.update(fields)
+                direct = fields[0] if len(fields) == 1 and value == f'{{{fields[0]}}}' else None
+                entries.append((key, len(self._slots)))
+                self._slots.append((f'{_encode(key)}=', value, direct))
+            elif value is not None and value != '':
+                entries.append((key, f'{_encode(key)}={_encode(value)}'))
+
+        self.placeholders = frozenset(placeholders)
+        self._ordered = _runs(entries)
+        self._sorted_entries = sorted(entries, key=lambda entry: entry[0])
+        self._sorted = _runs(self._sorted_entries)
+
+    def query(self, **kwargs: Any) -> Tuple[str, str]:
+        """
+        Build the query string and its canonical (key-sorted) form.
+
+        Args:
+            **kwargs: Placeholder values; names the template does not use
+                become extra parameters
+
+        Returns:
+            tuple: (query, canonical_query), both without the leading '?'
+        """
+        extras = [(key, value) for key, value in kwargs.items() if key not in self.placeholders]
+        if extras and not self.template_keys.isdisjoint(key for key, _ in extras):
+            # An extra argument overrides a template value in place: use the generic path
+            return self._generic_query(kwargs)
+
+        slot_pairs = []
+        for prefix, raw, direct in self._slots:
+            if direct is not None:
+                value = kwargs.get(direct, _MISSING)
+                value = raw if value is _MISSING else format(value)
+            else:
+                try:
+                    value = raw.format(**kwargs)
+                except KeyError:
+                    value = raw
+            slot_pairs.append(f'{prefix}{quote_plus(value)}' if value else '')
+
+        extra_pairs = [(key, f'{_encode(key)}={_encode(value)}')
+                       for key, value in extras if value is not None and value != '']
+
+        query = _render(self._ordered, slot_pairs)
+        query.extend(pair for _, pair in extra_pairs)
+
+        if not extra_pairs:
+            canonical = _render(self._sorted, slot_pairs)
+        else:
+            pairs = [(key, slot_pairs[item] if isinstance(item, int) else item)
+                     for key, item in self._sorted_entries]
+            canonical = [pair for _, pair in sorted(pairs + extra_pairs) if pair]
+
+        return '&'.join(query), '&'.join(canonical)
+
+    def url(self, endpoint_url: str, **kwargs: Any) -> PlannedURL:
+        """
+        Build the request URL of an endpoint.
+
+        Args:
+            endpoint_url (str): Base URL plus endpoint path, without a query
+            **kwargs: Placeholder values (see query)
+
+        Returns:
+            PlannedURL: URL whose cache_key is its canonical form
+        """
+        query, canonical = self.query(**kwargs)
+        url = PlannedURL(f'{endpoint_url}?{query}' if query else endpoint_url)
+        base = _canonical_base(endpoint_url)
+        url.cache_key = f'{base}?{canonical}' if canonical else base
+        return url
+
+    def _generic_query(self, kwargs: Dict[str, Any]) -> Tuple[str, str]:
+        params = build_parameters(self.template_name, **kwargs)
+        clean = {key: value for key, value in params.items() if value is not None and value != ''}
+        return urlencode(clean), urlencode(sorted((key, str(value)) for key, value in clean.items()))
+
+
+# Compiled once at import, one plan per template
+REQUEST_PLANS: Dict[str, RequestPlan] = {
+    template_name: RequestPlan(template_name, template)
+    for template_name, template in PARAM_TEMPLATES.items()
+}
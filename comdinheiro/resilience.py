@@ -0,0 +1,248 @@
+"""
+Retry, circuit breaking and rate limiting for the Comdinheiro HTTP layer.
+
+- RetryPolicy: how many times an idempotent GET is attempted and how long to
+  back off between attempts (exponential with full jitter, honouring
+  Retry-After).
+- CircuitBreaker: stops sending requests to an endpoint after consecutive
+  failures, and lets a single trial request through once reset_timeout has
+  passed.
+- TokenBucket: limits the request rate of a Comdinheiro account. Buckets are
+  shared per account within the process (see account_bucket).
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from .config import (
+    RETRY_MAX_ATTEMPTS, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, RETRY_STATUS_CODES,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, ACCOUNT_RATE_BURST
+)
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+class RetryPolicy:
+    """Retry settings for idempotent requests."""
+
+    def __init__(self, max_attempts: int = RETRY_MAX_ATTEMPTS,
+                 backoff_base: float = RETRY_BACKOFF_BASE,
+                 backoff_max: float = RETRY_BACKOFF_MAX,
+                 retry_statuses: Iterable[int] = RETRY_STATUS_CODES):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts (int): Attempts per request, the first one included
+            backoff_base (float): Upper bound of the first backoff, in seconds
+            backoff_max (float): Upper bound of any backoff, in seconds
+            retry_statuses (iterable): HTTP status codes worth retrying
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def is_retryable(self, status_code: Optional[int]) -> bool:
+        """
+        Check whether a failed attempt is worth retrying.
+
+        Args:
+            status_code (int): HTTP status, or None for connection errors
+                               and timeouts (always retryable)
+        """
+        return status_code is None or status_code in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt (int): Number of the attempt that just failed (1-based)
+            retry_after (float): Delay requested by the server, if any
+
+        Returns:
+            float: Seconds to sleep, never above backoff_max
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one endpoint.
+
+    Closed: requests flow and consecutive failures are counted. Open: after
+    failure_threshold consecutive failures every request is rejected until
+    reset_timeout has passed. Half-open: one trial request is let through; its
+    success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures before opening
+            reset_timeout (float): Seconds open before a trial request
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Check whether a request may be sent now.
+
+        Returns:
+            bool: False when the circuit is open (the request is counted as rejected)
+        """
+        with self._lock:
+            if self.state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = CIRCUIT_HALF_OPEN
+
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Record an attempt that reached a healthy upstream."""
+        with self._lock:
+            self.state = CIRCUIT_CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed attempt (connection error, timeout or retryable status)."""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == CIRCUIT_HALF_OPEN or (
+                    self.state == CIRCUIT_CLOSED
+                    and self.consecutive_failures >= self.failure_threshold):
+                self.state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                self.opened += 1
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the breaker state and counters."""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'opened': self.opened,
+                'rejected': self.rejected
+            }
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, up to capacity at once."""
+
+    def __init__(self, rate: float, capacity: int = ACCOUNT_RATE_BURST):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum tokens held (the allowed burst)
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.acquired = 0
+        self.throttled = 0
+        self.rejected = 0
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for it if needed.
+
+        Args:
+            timeout (float): Maximum seconds to wait (None waits as long as needed)
+
+        Returns:
+            bool: False if no token became available within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.acquired += 1
+                    if waited:
+                        self.throttled += 1
+                    return True
+
+                wait = (1 - self._tokens) / self.rate
+                if deadline is not None and now + wait > deadline:
+                    self.rejected += 1
+                    return False
+
+            waited = True
+            time.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the bucket settings and counters."""
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'acquired': self.acquired,
+                'throttled': self.throttled,
+                'rejected': self.rejected
+            }
+
+
+_account_buckets: Dict[str, TokenBucket] = {}
+_account_buckets_lock = threading.Lock()
+
+
+def account_bucket(account_key: str, rate: float,
+                   capacity: int = ACCOUNT_RATE_BURST) -> TokenBucket:
+    """
+    Get the process-wide token bucket of a Comdinheiro account.
+
+    Every client of the same account shares the bucket, so the limit holds
+    however many clients the registry or the callers create.
+
+    Args:
+        account_key (str): Credential hash (see cache.credential_key)
+        rate (float): Requests per second
+        capacity (int): Allowed burst
+
+    Returns:
+        TokenBucket: Bucket for the account and settings
+    """
+    key = f"{account_key}:{rate}:{capacity}"
+    with _account_buckets_lock:
+        bucket = _account_buckets.get(key)
+        if bucket is None:
+            bucket = _account_buckets[key] = TokenBucket(rate, capacity)
+        return bucket
@@ -0,0 +1,135 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+At market open a whole team opens the same dashboards, and identical report
+requests reach Comdinheiro at the same moment. SingleFlight lets concurrent
+callers asking for the same key share one execution: the first caller runs
+the call, the others wait for it and receive the same result (or exception,
+except the ones that only concern the caller that ran it, such as its own
+deadline running out: then a waiting caller runs the call itself).
+Once the call returns the key is released, so later callers run it again
+(or hit the response cache).
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+
+class _Call:
+    """An in-flight call shared by every caller of the same key."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Thread-safe coalescing of concurrent calls by key.
+
+    Keys are tuples whose first item names the operation, e.g.
+    ('request', canonical_url); counters are kept per operation. Results are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._counters: Dict[Any, Dict[str, int]] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any,
+           timeout: Optional[float] = None,
+           unshared_errors: Tuple[Type[BaseException], ...] = (), **kwargs: Any) -> Any:
+        """
+        Run fn(*args, **kwargs), or wait for the identical call already in flight.
+
+        Args:
+            key: Identity of the call; callers with equal keys share a result
+            fn (callable): Function to run when no identical call is in flight
+            timeout (float, optional): Maximum seconds to wait for a call
+                                       already in flight
+            unshared_errors (tuple): Exception types that only concern the
+                caller that ran the call (e.g. its own deadline running out);
+                a waiting caller runs the call again instead of raising them
+
+        Returns:
+            The result of the shared call
+
+        Raises:
+            TimeoutError: If the call in flight did not finish within timeout
+            Exception: Whatever the shared call raised
+        """
+        operation = key[0] if isinstance(key, tuple) and key else key
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        retrying = False
+
+        while True:
+            with self._lock:
+                counters = self._counters.setdefault(
+                    operation, {'calls': 0, 'executions': 0, 'coalesced': 0}
+                )
+                if not retrying:
+                    counters['calls'] += 1
+
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    counters['executions'] += 1
+                    if retrying:
+                        counters['coalesced'] -= 1
+                elif not retrying:
+                    counters['coalesced'] += 1
+
+            if leader:
+                break
+
+            remaining = None if expires_at is None else max(0.0, expires_at - time.monotonic())
+            if not call.done.wait(remaining):
+                raise TimeoutError("Timed out waiting for an identical call in flight")
+            if call.error is None:
+                return call.result
+            if not isinstance(call.error, unshared_errors):
+                raise call.error
+            retrying = True
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Get the number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            dict: Total calls, executions (upstream calls actually made),
+                  coalesced calls, coalesced ratio, calls in flight and the
+                  same counters per operation
+        """
+        with self._lock:
+            calls = sum(c['calls'] for c in self._counters.values())
+            coalesced = sum(c['coalesced'] for c in self._counters.values())
+            return {
+                'calls': calls,
+                'executions': calls - coalesced,
+                'coalesced': coalesced,
+                'coalesced_ratio': coalesced / calls if calls else 0.0,
+                'in_flight': len(self._calls),
+                'operations': {operation: dict(c) for operation, c in self._counters.items()}
+            }
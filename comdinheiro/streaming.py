@@ -0,0 +1,170 @@
+"""
+Incremental JSON parsing of Comdinheiro report responses.
+
+Report views put their rows in ``tables.tab0`` as ``{"lin0": {...}, "lin1":
+{...}, ...}``. Parsing the whole body with response.json() keeps the raw text,
+the full parsed document and then the cleaned copy alive at the same time.
+iter_table_rows walks the body chunk by chunk and yields one row at a time,
+so memory stays bounded by the chunk size plus the current row.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Tuple, Union
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789+-.eE'
+_json_decoder = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """Text buffer over an iterable of chunks, holding only what is still unparsed."""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]], encoding: str):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def read_more(self, min_length: int = 0) -> bool:
+        """
+        Append chunks to the buffer, dropping the consumed prefix first.
+
+        Args:
+            min_length (int): Keep reading until the buffer reaches this length
+
+        Returns:
+            bool: False when the input was already exhausted
+        """
+        if self.eof:
+            return False
+
+        parts = [self.buffer[self.pos:]]
+        length = len(parts[0])
+        self.pos = 0
+
+        while True:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                parts.append(self._decoder.decode(b'', final=True))
+                self.eof = True
+                break
+
+            text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            parts.append(text)
+            length += len(text)
+            if text and length >= min_length:
+                break
+
+        self.buffer = ''.join(parts)
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self.read_more():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON: expected '{char}', found '{found or 'end of input'}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value: at least double the pending text so that
+                # large values are not re-decoded once per chunk
+                if not self.read_more(2 * (len(self.buffer) - self.pos)):
+                    raise
+                continue
+
+            # A number may continue in the next chunk ("1" + "23", "0." + "5")
+            tail = end
+            while tail < len(self.buffer) and self.buffer[tail] in _NUMBER_CHARS:
+                tail += 1
+            if tail == len(self.buffer) and self.read_more():
+                continue
+
+            self.pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the object at the current position.
+
+        The caller must consume each member's value (with value() or a nested
+        members()) before asking for the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid JSON: object keys must be strings")
+            self.expect(':')
+            yield key
+
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Invalid JSON: expected ',' or '}}', found '{separator or 'end of input'}'")
+
+
+def iter_table_rows(chunks: Iterable[Union[bytes, str]], table: str = 'tab0',
+                    encoding: str = 'utf-8') -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield the rows of ``tables.<table>`` from a JSON body, one at a time.
+
+    Members outside the table are parsed and discarded; parsing stops once the
+    table is closed. Bodies that are not a JSON object, or have no such table,
+    yield nothing.
+
+    Args:
+        chunks (iterable): Body as bytes or str chunks (e.g. response.iter_content())
+        table (str): Table key inside 'tables'
+        encoding (str): Encoding used to decode bytes chunks
+
+    Yields:
+        tuple: (row_key, row_dict), header row (lin0) included
+
+    Raises:
+        ValueError: If the body is malformed JSON
+    """
+    reader = _ChunkReader(chunks, encoding)
+    if reader.peek() != '{':
+        return
+
+    for key in reader.members():
+        if key != 'tables' or reader.peek() != '{':
+            reader.value()
+            continue
+
+        for table_key in reader.members():
+            if table_key != table or reader.peek() != '{':
+                reader.value()
+                continue
+
+            for row_key in reader.members():
+                yield row_key, reader.value()
+            return
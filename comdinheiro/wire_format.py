@@ -0,0 +1,151 @@
+"""
+Compact columnar encoding of report tables for the wrapper protocol.
+
+The wrapper used to answer with json.dumps of the legacy ``lin/col`` tables,
+repeating every ``colN`` key on every row. The columnar-json format sends
+each table as its header once and one array per column, and text columns
+with few distinct values (institutions, asset classes, operations) as a
+dictionary plus integer codes:
+
+    {'header': {'col0': 'Carteira', ...},
+     'rows': 3,                       # lin1..lin3 (or the list of row keys)
+     'columns': {'col0': {'values': ['a', 'b', 'c']},
+                 'col1': {'dict': ['BTG', 'XP'], 'codes': [0, 1, 0]}},
+     'missing': {'col1': [2]}}        # rows where the cell is absent
+
+decode_columnar_tables gives the legacy tables back; the Node side has the
+same decoder in src/lib/server/comdinheiro-wrapper.ts.
+"""
+
+from typing import Any, Dict, List
+
+from .columnar import HEADER_KEY, MISSING
+from .config import WIRE_DICT_MAX_RATIO
+
+COLUMNAR_JSON = 'columnar-json'
+OUTPUT_FORMATS = ('json', COLUMNAR_JSON)
+
+
+def _encode_column(values: List[Any]) -> Dict[str, Any]:
+    """Dictionary-encode a text column when it repeats enough, else keep its values."""
+    limit = int(len(values) * WIRE_DICT_MAX_RATIO)
+    if limit < 1:
+        return {'values': values}
+
+    index: Dict[Any, int] = {}
+    codes = []
+    for value in values:
+        if not isinstance(value, str) and value is not None:
+            return {'values': values}
+        code = index.get(value)
+        if code is None:
+            if len(index) >= limit:
+                return {'values': values}
+            code = index[value] = len(index)
+        codes.append(code)
+
+    return {'dict': list(index), 'codes': codes}
+
+
+def encode_table(table: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Encode a legacy ``lin/col`` table in the columnar format.
+
+    Args:
+        table (dict): Legacy table, header (lin0) first
+
+    Returns:
+        dict: 'header', 'rows', 'columns' and, if any cell is absent, 'missing'
+    """
+    header = table.get(HEADER_KEY)
+    row_keys = [key for key in table if key != HEADER_KEY]
+    rows = [table[key] for key in row_keys]
+
+    column_keys = list(header) if header else []
+    seen = set(column_keys)
+    for row in rows:
+        for col_key in row:
+            if col_key not in seen:
+                seen.add(col_key)
+                column_keys.append(col_key)
+
+    columns = {}
+    missing = {}
+    for col_key in column_keys:
+        values = [row.get(col_key, MISSING) for row in rows]
+        absent = [index for index, value in enumerate(values) if value is MISSING]
+        if absent:
+            missing[col_key] = absent
+            for index in absent:
+                values[index] = None
+        columns[col_key] = _encode_column(values)
+
+    sequential = row_keys == [f'lin{index}' for index in range(1, len(row_keys) + 1)]
+    encoded = {
+        'header': header,
+        'rows': len(row_keys) if sequential else row_keys,
+        'columns': columns
+    }
+    if missing:
+        encoded['missing'] = missing
+    return encoded
+
+
+def decode_table(encoded: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Rebuild the legacy ``lin/col`` table from its columnar encoding.
+
+    Args:
+        encoded (dict): Table returned by encode_table
+
+    Returns:
+        dict: Legacy table, header (lin0) first
+    """
+    row_keys = encoded['rows']
+    if isinstance(row_keys, int):
+        row_keys = [f'lin{index}' for index in range(1, row_keys + 1)]
+
+    rows: List[Dict[str, Any]] = [{} for _ in row_keys]
+    missing = encoded.get('missing', {})
+
+    for col_key, column in encoded['columns'].items():
+        if 'dict' in column:
+            dictionary = column['dict']
+            values = [dictionary[code] for code in column['codes']]
+        else:
+            values = column['values']
+
+        absent = set(missing.get(col_key, ()))
+        for index, (row, value) in enumerate(zip(rows, values)):
+            if index not in absent:
+                row[col_key] = value
+
+    table = {}
+    if encoded.get('header') is not None:
+        table[HEADER_KEY] = encoded['header']
+    table.update(zip(row_keys, rows))
+    return table
+
+
+def encode_columnar_tables(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode every table of a portfolio data result in the columnar format.
+
+    Args:
+        data (dict): Result of get_portfolio_data ('tables' plus totals)
+
+    Returns:
+        dict: Copy of data whose tables are columnar; other keys are kept as is
+    """
+    tables = data.get('tables')
+    if not isinstance(tables, dict):
+        return data
+    return {**data, 'tables': {name: encode_table(table) for name, table in tables.items()}}
+
+
+def decode_columnar_tables(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of encode_columnar_tables."""
+    tables = data.get('tables')
+    if not isinstance(tables, dict):
+        return data
+    return {**data, 'tables': {name: decode_table(table) for name, table in tables.items()}}
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Throughput of Brazilian currency parsing and formatting, per cell vs per column.
+
+Compares the per-cell DataProcessor.parse_brazilian_currency /
+format_brazilian_currency loops with the bulk *_many functions on columns
+from 1k to 1M cells:
+
+    python3 scripts/benchmarks/benchmark_currency.py
+    python3 scripts/benchmarks/benchmark_currency.py --sizes 1000 100000 --json
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def make_column(size: int, seed: int = 42) -> list:
+    """
+    Build a column of currency strings as the reports return them.
+
+    Args:
+        size (int): Number of cells
+        seed (int): Random seed
+
+    Returns:
+        list: Strings such as "1.234.567,89", "-12,50" and a few empty cells
+    """
+    rng = random.Random(seed)
+    column = []
+
+    for _ in range(size):
+        if rng.random() < 0.02:
+            column.append('')
+            continue
+        value = rng.uniform(-1_000_000, 10_000_000)
+        column.append('{:,.2f}'.format(value).replace(',', '_').replace('.', ',').replace('_', '.'))
+
+    return column
+
+
+def best_of(func, repeat: int) -> float:
+    """Run func repeat times and return the fastest wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes: list, repeat: int) -> list:
+    """
+    Measure parse and format throughput for each column size.
+
+    Args:
+        sizes (list): Column sizes
+        repeat (int): Runs per measurement (best is kept)
+
+    Returns:
+        list: One result dict per (operation, size)
+    """
+    from comdinheiro import DataProcessor
+
+    results = []
+
+    for size in sizes:
+        column = make_column(size)
+        numbers = DataProcessor.parse_brazilian_currency_many(column)
+        number_list = numbers.tolist()
+
+        cases = [
+            ('parse', 'per_cell',
+             lambda: [DataProcessor.parse_brazilian_currency(v) for v in column]),
+            ('parse', 'many',
+             lambda: DataProcessor.parse_brazilian_currency_many(column)),
+            ('format', 'per_cell',
+             lambda: [DataProcessor.format_brazilian_currency(v) for v in number_list]),
+            ('format', 'many',
+             lambda: DataProcessor.format_brazilian_currency_many(numbers)),
+        ]
+
+        for operation, variant, func in cases:
+            seconds = best_of(func, repeat)
+            results.append({
+                'operation': operation,
+                'variant': variant,
+                'cells': size,
+                'seconds': seconds,
+                'cells_per_second': size / seconds if seconds else float('inf')
+            })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Column sizes to measure')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per measurement (best is kept)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    results = run(args.sizes, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'operation':<10}{'variant':<10}{'cells':>10}{'ms':>12}{'Mcells/s':>12}")
+    for result in results:
+        print(f"{result['operation']:<10}{result['variant']:<10}{result['cells']:>10}"
+              f"{result['seconds'] * 1000:>12.1f}{result['cells_per_second'] / 1e6:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
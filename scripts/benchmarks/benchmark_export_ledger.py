@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Cost of diffing an export against the export ledger, from 1k to 1M rows.
+
+Measures row hashing, ExportLedger.pending on an empty ledger and on a
+ledger that already holds every row (the re-run case), and recording the
+rows, on an in-memory SQLite ledger:
+
+    python3 scripts/benchmarks/benchmark_export_ledger.py
+    python3 scripts/benchmarks/benchmark_export_ledger.py --sizes 100000 --json
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def make_transactions(size: int, seed: int = 42):
+    """
+    Build a transaction export as the import sends it.
+
+    Args:
+        size (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: Carteira, Data, Operação, Ativo, Quantidade and Preço columns
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Carteira': rng.choice([f'Carteira_{index:03d}' for index in range(40)], size),
+        'Data': rng.choice([f'{day:02d}/{month:02d}/2024' for day in range(1, 29)
+                            for month in range(1, 13)], size),
+        'Operação': rng.choice(['Compra', 'Venda', 'Aplicação', 'Resgate'], size),
+        'Ativo': rng.choice([f'ATIVO{index:03d}' for index in range(300)], size),
+        'Quantidade': rng.uniform(0, 100_000, size).round(5),
+        'Preço': rng.uniform(1, 500, size).round(2)
+    })
+
+
+def best_of(func, repeat: int) -> float:
+    """Run func repeat times and return the fastest wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes: list, repeat: int) -> list:
+    """
+    Measure hashing and diffing for each export size.
+
+    Args:
+        sizes (list): Row counts
+        repeat (int): Runs per measurement (best is kept)
+
+    Returns:
+        list: One result dict per (operation, size)
+    """
+    from comdinheiro.export_ledger import ExportLedger, row_hashes
+
+    results = []
+
+    for size in sizes:
+        content_data = make_transactions(size)
+        empty = ExportLedger(':memory:')
+        full = ExportLedger(':memory:')
+        full.record(full.pending('benchmark', content_data))
+
+        cases = [
+            ('hash', lambda: row_hashes(content_data)),
+            ('diff_new', lambda: empty.pending('benchmark', content_data)),
+            ('diff_rerun', lambda: full.pending('benchmark', content_data)),
+            ('record', lambda: ExportLedger(':memory:').record(
+                empty.pending('benchmark', content_data))),
+        ]
+
+        for operation, func in cases:
+            seconds = best_of(func, repeat)
+            results.append({
+                'operation': operation,
+                'rows': size,
+                'seconds': seconds,
+                'rows_per_second': size / seconds if seconds else float('inf')
+            })
+
+        empty.close()
+        full.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Export sizes (rows) to measure')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per measurement (best is kept)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    results = run(args.sizes, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'operation':<12}{'rows':>10}{'ms':>12}{'Mrows/s':>12}")
+    for result in results:
+        print(f"{result['operation']:<12}{result['rows']:>10}"
+              f"{result['seconds'] * 1000:>12.1f}{result['rows_per_second'] / 1e6:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Cold import cost of each public symbol of the comdinheiro package.
+
+Every measurement runs in a fresh interpreter, so the numbers include the
+modules each symbol drags in (requests, flask, pandas...). Use it to keep the
+wrapper startup budget under control:
+
+    python3 scripts/benchmarks/benchmark_import_time.py
+    python3 scripts/benchmarks/benchmark_import_time.py --budget-ms 150 format_currency
+"""
+
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Heavy third-party modules we want to know about when they get loaded
+TRACKED_MODULES = ['requests', 'flask', 'pandas', 'numpy', 'psycopg2']
+
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+import comdinheiro
+{access}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'elapsed_ms': elapsed * 1000,
+    'loaded': [m for m in {tracked!r} if m in sys.modules]
+}}))
+"""
+
+
+def measure(symbol: str = None, repeat: int = 5) -> dict:
+    """
+    Measure the cold import cost of the package, optionally plus one symbol.
+
+    Args:
+        symbol (str): Public name to resolve after importing the package
+        repeat (int): Number of fresh interpreters to sample
+
+    Returns:
+        dict: Median/min time in milliseconds and heavy modules loaded
+    """
+    access = f"comdinheiro.{symbol}" if symbol else ""
+    code = PROBE.format(access=access, tracked=TRACKED_MODULES)
+    samples = []
+    loaded = []
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        samples.append(result['elapsed_ms'])
+        loaded = result['loaded']
+
+    return {
+        'symbol': symbol or '(package)',
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'loaded': loaded
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('symbols', nargs='*',
+                        help='Public symbols to measure (default: all of __all__)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Fresh interpreters per symbol')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='Exit with status 1 if any median exceeds this budget')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    import comdinheiro
+
+    symbols = args.symbols or list(comdinheiro.__all__)
+    results = [measure(None, args.repeat)]
+    results += [measure(symbol, args.repeat) for symbol in symbols]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'symbol':<32}{'median ms':>12}{'min ms':>10}  heavy modules")
+        for result in results:
+            print(f"{result['symbol']:<32}{result['median_ms']:>12.1f}"
+                  f"{result['min_ms']:>10.1f}  {', '.join(result['loaded']) or '-'}")
+
+    if args.budget_ms is not None:
+        over_budget = [r for r in results if r['median_ms'] > args.budget_ms]
+        if over_budget:
+            names = ', '.join(r['symbol'] for r in over_budget)
+            print(f"\nOver budget ({args.budget_ms:.0f} ms): {names}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cost of building a request URL and its cache key, legacy path vs request plans.
+
+The legacy path is build_parameters + _build_url + canonical_url, as the
+client did before request plans; the planned path is _planned_url, whose URL
+carries its canonical key. Both are measured for every view type:
+
+    python3 scripts/benchmarks/benchmark_request_plans.py
+    python3 scripts/benchmarks/benchmark_request_plans.py --calls 50000 --json
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+DEFAULT_CALLS = 20_000
+
+
+def best_of(func, repeat: int) -> float:
+    """Run func repeat times and return the fastest wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(calls: int, repeat: int) -> list:
+    """
+    Measure URL + cache key construction for each view type.
+
+    Args:
+        calls (int): URLs built per measurement
+        repeat (int): Runs per measurement (best is kept)
+
+    Returns:
+        list: One result dict per (view_type, variant)
+    """
+    from comdinheiro import ComdinheiroAPI
+    from comdinheiro.cache import canonical_url
+    from comdinheiro.config import VIEW_TYPE_MAPPING, build_parameters
+
+    api = ComdinheiroAPI('benchmark', 'benchmark')
+    kwargs = {
+        'portfolio': 'Carteira_001',
+        'start_date': '01012024',
+        'end_date': '31012024',
+        'bank': 'BTG%20Pactual',
+        'operation': 'todos'
+    }
+    results = []
+
+    for view_type, (endpoint_key, template_name) in VIEW_TYPE_MAPPING.items():
+        legacy_url = api._build_url(endpoint_key, build_parameters(template_name, **kwargs))
+        planned_url = api._planned_url(endpoint_key, template_name, **kwargs)
+        if planned_url != legacy_url or canonical_url(planned_url) != canonical_url(legacy_url):
+            raise AssertionError(f"Request plan differs from the legacy URL for {view_type}")
+
+        def legacy():
+            for _ in range(calls):
+                url = api._build_url(endpoint_key, build_parameters(template_name, **kwargs))
+                canonical_url(url)
+
+        def planned():
+            for _ in range(calls):
+                url = api._planned_url(endpoint_key, template_name, **kwargs)
+                canonical_url(url)
+
+        for variant, func in (('legacy', legacy), ('plan', planned)):
+            seconds = best_of(func, repeat)
+            results.append({
+                'view_type': view_type,
+                'variant': variant,
+                'calls': calls,
+                'seconds': seconds,
+                'us_per_call': seconds / calls * 1e6
+            })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=DEFAULT_CALLS,
+                        help='URLs built per measurement')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per measurement (best is kept)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    results = run(args.calls, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'view_type':<22}{'variant':<10}{'calls':>10}{'ms':>12}{'us/call':>10}")
+    for result in results:
+        print(f"{result['view_type']:<22}{result['variant']:<10}{result['calls']:>10}"
+              f"{result['seconds'] * 1000:>12.1f}{result['us_per_call']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Performance suite for report processing, the API client and the wrapper.
+
+For every VIEW_TYPE_MAPPING entry and size (10 to 1M rows) it measures:
+
+- processor: DataProcessor.process_response_by_view_type throughput
+- processor_memory: tracemalloc peak of the same call
+- client: ComdinheiroAPI.get_portfolio_data end to end (URL building, HTTP
+  layer, JSON decoding, processing) against an in-process fake transport
+
+plus wrapper_startup, the time the wrapper script takes to answer a request
+in a fresh interpreter. Fixtures come from report_fixtures (synthetic, or
+recorded responses with --fixtures-dir).
+
+Results can be saved as a JSON baseline and compared with it; the suite exits
+with status 1 when a measurement is slower or uses more memory than the
+baseline beyond --tolerance. Baselines are machine-specific, so save one on
+the machine that runs the comparison:
+
+    python3 scripts/benchmarks/benchmark_suite.py --sizes 10 1000 100000 --save-baseline
+    python3 scripts/benchmarks/benchmark_suite.py --sizes 10 1000 100000
+    python3 scripts/benchmarks/benchmark_suite.py --views relatorio --sizes 1000000 --json
+"""
+
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter
+
+import report_fixtures
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+WRAPPER_SCRIPT = PROJECT_ROOT / 'scripts' / 'comdinheiro_api_wrapper.py'
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+DEFAULT_TOLERANCE = 0.25
+
+# Differences below these are noise and never flagged
+MIN_SECONDS_DELTA = 0.002
+MIN_BYTES_DELTA = 64 * 1024
+
+
+class FakeTransport(BaseAdapter):
+    """requests transport adapter answering every request with a fixed JSON body."""
+
+    def __init__(self, body: bytes):
+        super().__init__()
+        self.body = body
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.body
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def best_of(func, repeat: int) -> float:
+    """Run func repeat times and return the fastest wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def peak_memory(func) -> int:
+    """Run func once under tracemalloc and return its peak allocation in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def repeats_for(rows: int, repeat: int) -> int:
+    """Keep the largest sizes to a single run so the suite stays usable."""
+    return 1 if rows >= 1_000_000 else repeat
+
+
+def bench_view(view_type: str, rows: int, repeat: int, fixtures_dir: Path = None) -> list:
+    """
+    Measure processing and the client end to end for one view type and size.
+
+    Args:
+        view_type (str): Key of VIEW_TYPE_MAPPING
+        rows (int): Data rows in the fixture
+        repeat (int): Runs per timing (best is kept)
+        fixtures_dir (Path, optional): Directory with recorded responses
+
+    Returns:
+        list: Result dicts for processor, processor_memory and client
+    """
+    from comdinheiro import ComdinheiroAPI, DataProcessor
+
+    response = report_fixtures.load_response(view_type, rows, fixtures_dir)
+    runs = repeats_for(rows, repeat)
+
+    def process():
+        DataProcessor.process_response_by_view_type(response, view_type, 'Benchmark')
+
+    seconds = best_of(process, runs)
+    results = [{
+        'benchmark': 'processor',
+        'view_type': view_type,
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds else float('inf')
+    }, {
+        'benchmark': 'processor_memory',
+        'view_type': view_type,
+        'rows': rows,
+        'peak_bytes': peak_memory(process)
+    }]
+
+    transport = FakeTransport(json.dumps(response).encode('utf-8'))
+    del response
+    api = ComdinheiroAPI('benchmark', 'benchmark', rate_limit=0)
+    api.session.mount('https://', transport)
+    api.session.mount('http://', transport)
+
+    def call():
+        data, error = api.get_portfolio_data('Benchmark', None, '2024-01-31', view_type=view_type)
+        if error:
+            raise RuntimeError(f"{view_type}: {error}")
+
+    try:
+        seconds = best_of(call, runs)
+    finally:
+        api.close()
+
+    results.append({
+        'benchmark': 'client',
+        'view_type': view_type,
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds else float('inf')
+    })
+    return results
+
+
+def bench_wrapper_startup(repeat: int) -> dict:
+    """
+    Measure the wrapper answering a request in a fresh interpreter.
+
+    Uses the 'metrics' action, which needs no credentials nor network, so
+    the time is interpreter start, imports and dispatch.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(WRAPPER_SCRIPT), json.dumps({'action': 'metrics'})],
+            cwd=PROJECT_ROOT, capture_output=True, check=True
+        )
+        samples.append(time.perf_counter() - start)
+
+    return {
+        'benchmark': 'wrapper_startup',
+        'view_type': None,
+        'rows': 0,
+        'seconds': statistics.median(samples)
+    }
+
+
+def result_key(result: dict) -> str:
+    return f"{result['benchmark']}:{result['view_type'] or '-'}:{result['rows']}"
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """
+    Find the measurements that regressed against a baseline.
+
+    Args:
+        results (list): Current results
+        baseline (dict): Saved baseline (see save_baseline)
+        tolerance (float): Allowed relative increase (0.25 = 25%)
+
+    Returns:
+        list: One dict per regression with the metric, baseline and current values
+    """
+    saved = baseline.get('results', {})
+    regressions = []
+
+    for result in results:
+        reference = saved.get(result_key(result))
+        if reference is None:
+            continue
+
+        for metric, min_delta in (('seconds', MIN_SECONDS_DELTA), ('peak_bytes', MIN_BYTES_DELTA)):
+            if metric not in result or metric not in reference:
+                continue
+            current, previous = result[metric], reference[metric]
+            if current > previous * (1 + tolerance) and current - previous > min_delta:
+                regressions.append({
+                    'key': result_key(result),
+                    'metric': metric,
+                    'baseline': previous,
+                    'current': current,
+                    'change': current / previous - 1 if previous else float('inf')
+                })
+
+    return regressions
+
+
+def save_baseline(results: list, path: Path) -> None:
+    """Write results as a baseline, keyed by benchmark:view_type:rows."""
+    baseline = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {result_key(result): result for result in results}
+    }
+    path.write_text(json.dumps(baseline, indent=2) + '\n', encoding='utf-8')
+
+
+def _column(result: dict, metric: str, scale: float, width: int) -> str:
+    value = result.get(metric)
+    return f"{'-':>{width}}" if value is None else f"{value * scale:>{width}.1f}"
+
+
+def main():
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from comdinheiro.config import VIEW_TYPE_MAPPING
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--views', nargs='+', default=list(VIEW_TYPE_MAPPING),
+                        choices=list(VIEW_TYPE_MAPPING), help='View types to measure')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Data rows per fixture')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per measurement (best is kept; 1 run at 1M rows)')
+    parser.add_argument('--fixtures-dir', type=Path, default=None,
+                        help='Directory with recorded <view_type>.json responses')
+    parser.add_argument('--skip-wrapper', action='store_true',
+                        help='Do not measure wrapper startup')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                        help='Baseline file to compare with or save to')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Save the results as the new baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed relative increase before flagging a regression')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = []
+    for view_type in args.views:
+        for rows in args.sizes:
+            results += bench_view(view_type, rows, args.repeat, args.fixtures_dir)
+    if not args.skip_wrapper:
+        results.append(bench_wrapper_startup(args.repeat))
+
+    regressions = []
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+    elif args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding='utf-8')),
+                              args.tolerance)
+
+    if args.json:
+        print(json.dumps({'results': results, 'regressions': regressions}, indent=2))
+    else:
+        print(f"{'benchmark':<18}{'view_type':<22}{'rows':>10}{'ms':>12}{'krows/s':>12}{'peak MB':>10}")
+        for result in results:
+            print(f"{result['benchmark']:<18}{result['view_type'] or '-':<22}{result['rows']:>10}"
+                  f"{_column(result, 'seconds', 1000, 12)}"
+                  f"{_column(result, 'rows_per_second', 1 / 1000, 12)}"
+                  f"{_column(result, 'peak_bytes', 1 / 1e6, 10)}")
+
+        if args.save_baseline:
+            print(f"\nBaseline saved to {args.baseline}")
+        for regression in regressions:
+            print(f"REGRESSION {regression['key']} {regression['metric']}: "
+                  f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+                  f"(+{regression['change']:.0%})", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Payload size and encode/decode time of the wrapper output formats.
+
+Compares the default 'json' output of get_portfolio_data (nested
+tables.tab0.linN.colN dicts) with 'columnar-json' (see
+comdinheiro.wire_format) for every view type, on processed report fixtures.
+When msgpack is installed, the columnar result packed with msgpack is
+measured too:
+
+    python3 scripts/benchmarks/benchmark_wire_format.py
+    python3 scripts/benchmarks/benchmark_wire_format.py --sizes 10000 --json
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from report_fixtures import VIEW_COLUMNS, load_response  # noqa: E402
+
+DEFAULT_SIZES = [100, 10_000, 100_000]
+
+
+def best_of(func, repeat: int) -> float:
+    """Run func repeat times and return the fastest wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def formats():
+    """
+    Get the (name, encode, decode) functions of each output format.
+
+    encode turns a wrapper result into the bytes written by the wrapper;
+    decode turns them back into the legacy result, as the caller would.
+    """
+    from comdinheiro.wire_format import decode_columnar_tables, encode_columnar_tables
+
+    def columnar(result):
+        return {**result, 'format': 'columnar-json', 'data': encode_columnar_tables(result['data'])}
+
+    def uncolumnar(result):
+        return {**result, 'data': decode_columnar_tables(result['data'])}
+
+    cases = [
+        ('json',
+         lambda result: json.dumps(result).encode('utf-8'),
+         lambda payload: json.loads(payload)),
+        ('columnar-json',
+         lambda result: json.dumps(columnar(result), separators=(',', ':')).encode('utf-8'),
+         lambda payload: uncolumnar(json.loads(payload))),
+    ]
+
+    try:
+        import msgpack
+    except ImportError:
+        return cases
+
+    cases.append(('columnar-msgpack',
+                  lambda result: msgpack.packb(columnar(result)),
+                  lambda payload: uncolumnar(msgpack.unpackb(payload))))
+    return cases
+
+
+def run(sizes: list, repeat: int, fixtures_dir: Path = None) -> list:
+    """
+    Measure every output format for each view type and size.
+
+    Args:
+        sizes (list): Data rows per report
+        repeat (int): Runs per measurement (best is kept)
+        fixtures_dir (Path, optional): Directory with recorded responses
+
+    Returns:
+        list: One result dict per (view_type, rows, format)
+    """
+    from comdinheiro import DataProcessor
+
+    results = []
+
+    for view_type in VIEW_COLUMNS:
+        for size in sizes:
+            response = load_response(view_type, size, fixtures_dir)
+            data = DataProcessor.process_response_by_view_type(response, view_type, 'Benchmark')
+            result = {'success': True, 'data': data}
+
+            for name, encode, decode in formats():
+                payload = encode(result)
+                if decode(payload)['data'] != json.loads(json.dumps(data)):
+                    raise AssertionError(f"{name} does not round-trip {view_type}")
+
+                results.append({
+                    'view_type': view_type,
+                    'rows': size,
+                    'format': name,
+                    'bytes': len(payload),
+                    'encode_seconds': best_of(lambda: encode(result), repeat),
+                    'decode_seconds': best_of(lambda: decode(payload), repeat)
+                })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Data rows per report')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per measurement (best is kept)')
+    parser.add_argument('--fixtures-dir', type=Path,
+                        help='Directory with recorded <view_type>.json responses')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    results = run(args.sizes, args.repeat, args.fixtures_dir)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'view_type':<22}{'rows':>8}  {'format':<18}{'KB':>10}{'encode ms':>12}{'decode ms':>12}")
+    for result in results:
+        print(f"{result['view_type']:<22}{result['rows']:>8}  {result['format']:<18}"
+              f"{result['bytes'] / 1024:>10.1f}{result['encode_seconds'] * 1000:>12.1f}"
+              f"{result['decode_seconds'] * 1000:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
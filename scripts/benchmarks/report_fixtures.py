@@ -0,0 +1,204 @@
+"""
+Report fixtures for the benchmarks: one response per view type, at any size.
+
+Synthetic fixtures follow the column layout each VIEW_TYPE_MAPPING entry gets
+from Comdinheiro (see PARAM_TEMPLATES and VIEW_COLUMN_SCHEMAS), with values
+formatted the way the API returns them ('1.234,56', '31/01/2024', '12,34%').
+Recorded responses (<view_type>.json files saved from the API) can be used
+instead; their data rows are repeated up to the requested size.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# (header, kind) of each column, col0 first
+_PORTFOLIO_COLUMNS = [
+    ('Carteira', 'portfolio'),
+    ('Instituição Financeira', 'institution'),
+    ('Ativo', 'asset'),
+    ('Descrição', 'description'),
+    ('Quantidade', 'quantity'),
+    ('Saldo Bruto', 'currency')
+]
+
+_RETURN_COLUMNS = [
+    ('Classe', 'asset_class'),
+    ('Ativo', 'asset'),
+    ('Saldo Bruto', 'currency'),
+    ('% SB', 'percent'),
+    ('Mês Atual', 'percent'),
+    ('3 meses', 'percent'),
+    ('6 meses', 'percent'),
+    ('12 meses', 'percent'),
+    ('24 meses', 'percent'),
+    ('Ano Atual', 'percent')
+]
+
+VIEW_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    'consolidado(antigo)': [
+        ('Classe', 'institution'),
+        ('Cor', 'color'),
+        ('Ativo', 'asset'),
+        ('Saldo Bruto', 'currency'),
+        ('% SB', 'percent')
+    ],
+    'consolidado': _PORTFOLIO_COLUMNS + [('Tipo Ativo', 'asset_class'),
+                                         ('Saldo Líquido', 'currency')],
+    'relatorio': _PORTFOLIO_COLUMNS + [('Data Aplicação', 'date'),
+                                       ('PU Aplicação', 'currency'),
+                                       ('PU', 'currency')],
+    'relatorio2': _PORTFOLIO_COLUMNS + [('Tipo Ativo', 'asset_class'),
+                                        ('Saldo Líquido', 'currency')],
+    'movimentacoes': [
+        ('Carteira', 'portfolio'),
+        ('Data Cadastro', 'date'),
+        ('Data Operação', 'date'),
+        ('Data Liquidação', 'date'),
+        ('Operação', 'operation'),
+        ('Ativo', 'asset'),
+        ('Quantidade', 'quantity'),
+        ('Preço', 'currency'),
+        ('Valor', 'currency'),
+        ('Instituição Financeira', 'institution')
+    ],
+    'analise': _RETURN_COLUMNS,
+    'asset_allocation': _RETURN_COLUMNS,
+    'saldo': [
+        ('Carteira', 'portfolio'),
+        ('Saldo Bruto', 'currency')
+    ]
+}
+
+# Portfolio list (get_portfolio_list): name, balance and institution
+PORTFOLIO_LIST_COLUMNS = [
+    ('Carteira', 'portfolio'),
+    ('Saldo Bruto', 'currency'),
+    ('Instituição Financeira', 'institution')
+]
+
+_TEXT_VALUES = {
+    'portfolio': [f'Carteira_{index:03d}' for index in range(40)],
+    'institution': ['BTG Pactual', 'XP Investimentos', 'Itaú', 'Bradesco', 'Safra',
+                    'Santander', 'Banco do Brasil', 'Caixa'],
+    'asset': [f'{prefix}{index:02d}' for prefix in ('CDB_', 'LCI_', 'PETR', 'VALE', 'FII_', 'NTNB_')
+              for index in range(50)],
+    'description': ['Renda Fixa Pós', 'Renda Fixa Pré', 'Ações', 'Fundos Imobiliários',
+                    'Tesouro IPCA+', 'Multimercado'],
+    'asset_class': ['Renda Fixa', 'Renda Variável', 'Fundos', 'Previdência', 'Caixa'],
+    'operation': ['Compra', 'Venda', 'Aplicação', 'Resgate', 'Dividendos'],
+    'color': ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+}
+
+# Distinct generated values per numeric/date column; rows cycle through them
+_POOL_SIZE = 4096
+
+
+def _brazilian_number(value: float, decimals: int = 2) -> str:
+    text = f'{value:,.{decimals}f}'
+    return text.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def _value_pool(kind: str, rng: random.Random) -> List[str]:
+    """Values of one column kind, formatted as the API returns them."""
+    if kind in _TEXT_VALUES:
+        return _TEXT_VALUES[kind]
+    if kind == 'currency':
+        return [_brazilian_number(rng.uniform(-50_000, 5_000_000)) for _ in range(_POOL_SIZE)]
+    if kind == 'quantity':
+        return [_brazilian_number(rng.uniform(0, 100_000), 5) for _ in range(_POOL_SIZE)]
+    if kind == 'percent':
+        return [_brazilian_number(rng.uniform(-30, 60)) + '%' for _ in range(_POOL_SIZE)]
+    if kind == 'date':
+        return [f'{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2015, 2024)}'
+                for _ in range(_POOL_SIZE)]
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def synthetic_response(view_type: str, rows: int, seed: int = 42) -> Dict:
+    """
+    Build a Comdinheiro JSON response with the columns of a view type.
+
+    Args:
+        view_type (str): Key of VIEW_TYPE_MAPPING
+        rows (int): Data rows (the header row lin0 comes on top)
+        seed (int): Random seed
+
+    Returns:
+        dict: {'tables': {'tab0': {'lin0': header, 'lin1': row, ...}}}
+    """
+    return synthetic_table(VIEW_COLUMNS[view_type], rows, seed)
+
+
+def synthetic_table(columns: List[Tuple[str, str]], rows: int, seed: int = 42) -> Dict:
+    """
+    Build a Comdinheiro JSON response with the given columns.
+
+    Args:
+        columns (list): (header, kind) of each column, col0 first
+        rows (int): Data rows (the header row lin0 comes on top)
+        seed (int): Random seed
+
+    Returns:
+        dict: {'tables': {'tab0': {'lin0': header, 'lin1': row, ...}}}
+    """
+    rng = random.Random(seed)
+    pools = [_value_pool(kind, rng) for _, kind in columns]
+    steps = [rng.randrange(1, 97) for _ in columns]
+    names = [f'col{index}' for index in range(len(columns))]
+
+    tab0 = {'lin0': {name: header for name, (header, _) in zip(names, columns)}}
+    for row in range(rows):
+        tab0[f'lin{row + 1}'] = {
+            name: pool[(row * step) % len(pool)]
+            for name, pool, step in zip(names, pools, steps)
+        }
+
+    return {'tables': {'tab0': tab0}}
+
+
+def recorded_response(path: Path, rows: int) -> Dict:
+    """
+    Load a recorded response and repeat its data rows up to a size.
+
+    Args:
+        path (Path): JSON file saved from the API
+        rows (int): Data rows wanted
+
+    Returns:
+        dict: Response with the recorded header and `rows` data rows
+    """
+    with open(path, encoding='utf-8') as f:
+        recorded = json.load(f)
+
+    tab0 = recorded['tables']['tab0']
+    header = tab0.get('lin0', {})
+    data_rows = [row for key, row in tab0.items() if key != 'lin0']
+    if not data_rows:
+        raise ValueError(f"No data rows in recorded fixture {path}")
+
+    scaled = {'lin0': header}
+    for row in range(rows):
+        scaled[f'lin{row + 1}'] = data_rows[row % len(data_rows)]
+
+    return {**recorded, 'tables': {**recorded['tables'], 'tab0': scaled}}
+
+
+def load_response(view_type: str, rows: int, fixtures_dir: Optional[Path] = None) -> Dict:
+    """
+    Get the fixture of a view type: recorded if fixtures_dir has one, synthetic otherwise.
+
+    Args:
+        view_type (str): Key of VIEW_TYPE_MAPPING
+        rows (int): Data rows
+        fixtures_dir (Path, optional): Directory with <view_type>.json recordings
+
+    Returns:
+        dict: Comdinheiro JSON response
+    """
+    if fixtures_dir is not None:
+        path = Path(fixtures_dir) / f'{view_type}.json'
+        if path.exists():
+            return recorded_response(path, rows)
+    return synthetic_response(view_type, rows)
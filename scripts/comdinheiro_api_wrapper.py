@@ -9,6 +9,9 @@ simplified Comdinheiro Python module.
 import sys
 import json
 import os
+import signal
+import socket
+import argparse
 import warnings
 import logging
 from datetime import datetime
@@ -27,8 +30,29 @@ from contextlib import redirect_stdout, redirect_stderr
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
+# Server mode defaults (overridable via environment or command line)
+DEFAULT_SOCKET_PATH = os.getenv('COMDINHEIRO_WRAPPER_SOCKET', '/tmp/comdinheiro_wrapper.sock')
+DEFAULT_WORKERS = int(os.getenv('COMDINHEIRO_WRAPPER_WORKERS', os.cpu_count() or 2))
+DEFAULT_MAX_REQUESTS = int(os.getenv('COMDINHEIRO_WRAPPER_MAX_REQUESTS', '1000'))
+
+# Persistent report cache shared by every wrapper process (one-shot and server
+# mode); its directory is COMDINHEIRO_DISK_CACHE_DIR
+DISK_CACHE_ENABLED = os.getenv('COMDINHEIRO_WRAPPER_DISK_CACHE', '0') == '1'
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# Overall time budget of an API call, in seconds. The SvelteKit route kills the
+# wrapper after 30 s, so calls must give up (with a clear timeout error) first;
+# requests may ask for a shorter budget with a 'deadline' field.
+DEFAULT_DEADLINE = float(os.getenv('COMDINHEIRO_WRAPPER_DEADLINE', '25'))
+CONNECTION_READ_TIMEOUT = 10
+
+
 def main():
     """Main function to handle API requests."""
+    if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+        serve(sys.argv[2:])
+        return
+
     try:
         # Read command line arguments
         if len(sys.argv) < 2:
@@ -37,38 +61,98 @@ def main():
         # Parse JSON input from command line argument
         request_data = json.loads(sys.argv[1])
         
-        action = request_data.get('action')
-        
-        # Use context manager to suppress ALL output from imports and API calls
-        # Create a null file to redirect everything to
-        with open(os.devnull, 'w') as devnull:
-            with redirect_stdout(devnull), redirect_stderr(devnull):
-                if action == 'get_portfolio_data':
-                    result = handle_portfolio_data(request_data)
-                elif action == 'test_connection':
-                    result = handle_test_connection(request_data)
-                elif action == 'get_portfolio_list':
-                    result = handle_portfolio_list(request_data)
-                else:
-                    raise ValueError(f"Unknown action: {action}")
+        result = dispatch(request_data)
         
         # Only print the JSON result - nothing else
-        print(json.dumps(result))
+        print(serialize(result))
         
     except Exception as e:
-        error_result = {
-            "success": False,
-            "error": str(e),
-            "type": type(e).__name__
-        }
-        print(json.dumps(error_result))
+        print(json.dumps(error_response(e)))
         sys.exit(1)
 
 
+def dispatch(request_data):
+    """
+    Run a single wrapper request and return its result.
+    
+    Args:
+        request_data (dict): Request payload with an 'action' key
+        
+    Returns:
+        dict: JSON-serializable result for the action
+    """
+    action = request_data.get('action')
+    handler = ACTION_HANDLERS.get(action)
+    
+    if handler is None:
+        raise ValueError(f"Unknown action: {action}")
+    
+    # Use context manager to suppress ALL output from imports and API calls
+    # Create a null file to redirect everything to
+    with open(os.devnull, 'w') as devnull:
+        with redirect_stdout(devnull), redirect_stderr(devnull):
+            return handler(request_data)
+
+
+def serialize(result):
+    """
+    Serialize a result for the caller.
+    
+    Columnar results are written without whitespace: their point is a small
+    payload, and the Node side parses them with JSON.parse either way.
+    """
+    if result.get('format') == 'columnar-json':
+        return json.dumps(result, separators=(',', ':'))
+    return json.dumps(result)
+
+
+def error_response(error):
+    """Build the error payload returned for failed requests."""
+    return {
+        "success": False,
+        "error": str(error),
+        "type": type(error).__name__
+    }
+
+
+def request_deadline(request_data):
+    """Get the time budget of a request: its 'deadline' field, capped by DEFAULT_DEADLINE."""
+    try:
+        deadline = float(request_data.get('deadline') or DEFAULT_DEADLINE)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid deadline. Use a number of seconds")
+    return min(deadline, DEFAULT_DEADLINE)
+
+
+def get_client(username, password):
+    """
+    Get a ComdinheiroAPI client for the given credentials.
+    
+    Clients come from the shared registry and are reused across requests so
+    that long-lived server workers keep their HTTP sessions (and pooled
+    connections) warm. With the disk cache enabled, past-date reports are
+    also reused across processes.
+    """
+    from comdinheiro.client_registry import get_client as get_registered_client
+    from comdinheiro.client_registry import get_default_registry
+    
+    registry = get_default_registry()
+    if DISK_CACHE_ENABLED and 'disk_cache' not in registry.client_options:
+        from comdinheiro.disk_cache import DiskCache
+        registry.client_options['disk_cache'] = DiskCache()
+    
+    return get_registered_client(username, password)
+
+
 def handle_portfolio_data(request_data):
-    """Handle portfolio data requests."""
-    # Import here to avoid output pollution during module load
-    from comdinheiro import get_portfolio_data
+    """
+    Handle portfolio data requests.
+    
+    With 'format': 'columnar-json' the tables are sent as one array per
+    column, with repeated text dictionary-encoded (see comdinheiro.wire_format);
+    'json' (the default) keeps the legacy lin/col tables.
+    """
+    from comdinheiro.wire_format import COLUMNAR_JSON, OUTPUT_FORMATS, encode_columnar_tables
     
     portfolio = request_data.get('portfolio')
     end_date = request_data.get('end_date')
@@ -90,13 +174,77 @@ def handle_portfolio_data(request_data):
     if not username or not password:
         raise ValueError("Username and password are required")
     
-    # Call the new simplified function
-    data, error = get_portfolio_data(
-        portfolio=portfolio,
+    output_format = request_data.get('format', 'json')
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError("Invalid output format. Use 'json' or 'columnar-json'")
+    
+    api = get_client(username, password)
+    data, error = api.get_portfolio_data(
+        portfolio,
         end_date=end_date,
         view_type=view_type,
-        username=username,
-        password=password
+        deadline=request_deadline(request_data)
+    )
+    
+    if error:
+        return {
+            "success": False,
+            "error": error
+        }
+    
+    if output_format == COLUMNAR_JSON:
+        return {
+            "success": True,
+            "format": COLUMNAR_JSON,
+            "data": encode_columnar_tables(data)
+        }
+    
+    return {
+        "success": True,
+        "data": data
+    }
+
+
+def handle_transactions(request_data):
+    """
+    Handle transaction (movimentacoes) requests through the local ledger.
+    
+    Only dates not synced yet, plus a short re-check window, are fetched
+    upstream (see comdinheiro.ledger); the ledger file is LEDGER_DEFAULT_PATH
+    (COMDINHEIRO_LEDGER_PATH), shared by every wrapper process.
+    """
+    from comdinheiro.ledger import TransactionSync, get_transaction_ledger
+    
+    portfolio = request_data.get('portfolio')
+    start_date = request_data.get('start_date')
+    end_date = request_data.get('end_date')
+    username = request_data.get('username')
+    password = request_data.get('password')
+    
+    if not portfolio:
+        raise ValueError("Portfolio name is required")
+    if not start_date:
+        raise ValueError("Start date is required")
+    
+    # Validate date format
+    try:
+        for value in (start_date, end_date):
+            if value:
+                datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+    
+    if not username or not password:
+        raise ValueError("Username and password are required")
+    
+    sync = TransactionSync(get_client(username, password), get_transaction_ledger())
+    data, error = sync.get_transactions(
+        portfolio,
+        start_date,
+        end_date,
+        bank=request_data.get('bank', 'todos'),
+        operation=request_data.get('operation', 'todos'),
+        deadline=request_deadline(request_data)
     )
     
     if error:
@@ -113,9 +261,6 @@ def handle_portfolio_data(request_data):
 
 def handle_test_connection(request_data):
     """Test API connection."""
-    # Import here to avoid output pollution during module load
-    from comdinheiro.api_client import ComdinheiroAPI
-    
     username = request_data.get('username')
     password = request_data.get('password')
     
@@ -123,10 +268,10 @@ def handle_test_connection(request_data):
         raise ValueError("Username and password are required for connection test")
     
     try:
-        api = ComdinheiroAPI(username, password)
+        api = get_client(username, password)
         
         # Try a simple API call that should work or fail cleanly
-        result = api.get_portfolio_list()
+        result = api.get_portfolio_list(deadline=request_deadline(request_data))
         
         return {
             "success": True,
@@ -143,9 +288,6 @@ def handle_test_connection(request_data):
 
 def handle_portfolio_list(request_data):
     """Get list of available portfolios."""
-    # Import here to avoid output pollution during module load
-    from comdinheiro import get_portfolio_list
-    
     username = request_data.get('username')
     password = request_data.get('password')
     
@@ -153,7 +295,9 @@ def handle_portfolio_list(request_data):
         raise ValueError("Username and password are required")
     
     try:
-        portfolios = get_portfolio_list(username=username, password=password)
+        portfolios = get_client(username, password).get_portfolio_list(
+            deadline=request_deadline(request_data)
+        ) or []
         
         return {
             "success": True,
@@ -167,5 +311,175 @@ def handle_portfolio_list(request_data):
         }
 
 
+def handle_metrics(request_data):
+    """
+    Dump the metrics recorded by this process.
+    
+    Metrics live in memory, so they are only meaningful in server mode, where
+    each worker answers with its own counters (identified by 'pid'). Use
+    'format': 'prometheus' for the text exposition format, 'json' otherwise.
+    """
+    from comdinheiro.metrics import get_metrics
+    
+    output_format = request_data.get('format', 'json')
+    registry = get_metrics()
+    
+    if output_format == 'prometheus':
+        return {
+            "success": True,
+            "pid": os.getpid(),
+            "format": "prometheus",
+            "metrics": registry.to_prometheus()
+        }
+    if output_format != 'json':
+        raise ValueError("Invalid metrics format. Use 'json' or 'prometheus'")
+    
+    return {
+        "success": True,
+        "pid": os.getpid(),
+        "format": "json",
+        "metrics": registry.snapshot()
+    }
+
+
+ACTION_HANDLERS = {
+    'get_portfolio_data': handle_portfolio_data,
+    'get_transactions': handle_transactions,
+    'test_connection': handle_test_connection,
+    'get_portfolio_list': handle_portfolio_list,
+    'metrics': handle_metrics,
+}
+
+
+# ==========================================
+# SERVER MODE
+# ==========================================
+
+def serve(argv=None):
+    """
+    Run the wrapper as a long-lived pre-forked server on a Unix socket.
+    
+    Each connection carries one request: a JSON object with the same
+    'action' protocol accepted on the command line, terminated by a newline.
+    The worker answers with the JSON result followed by a newline and closes
+    the connection.
+    
+    Usage:
+        python3 scripts/comdinheiro_api_wrapper.py --serve --workers 4
+    """
+    parser = argparse.ArgumentParser(
+        prog='comdinheiro_api_wrapper.py --serve',
+        description='Serve Comdinheiro wrapper requests over a Unix socket'
+    )
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH,
+                        help='Unix socket path to listen on')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='Number of pre-forked worker processes')
+    parser.add_argument('--max-requests', type=int, default=DEFAULT_MAX_REQUESTS,
+                        help='Requests served before a worker is recycled (0 = never)')
+    parser.add_argument('--response-cache', action='store_true',
+                        help='Cache report responses in memory within each worker')
+    parser.add_argument('--disk-cache', action='store_true', default=DISK_CACHE_ENABLED,
+                        help='Share past-date report responses between workers through '
+                             'the on-disk cache')
+    args = parser.parse_args(argv)
+    
+    # Warm imports once in the master so every forked worker inherits them
+    import comdinheiro.client_registry
+    import comdinheiro.data_processor  # noqa: F401
+    
+    registry = comdinheiro.client_registry.get_default_registry()
+    registry.cache_responses = args.response_cache
+    if args.disk_cache:
+        from comdinheiro.disk_cache import DiskCache
+        registry.client_options['disk_cache'] = DiskCache()
+    
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+    
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(args.socket)
+    os.chmod(args.socket, 0o600)
+    listener.listen(128)
+    
+    workers = set()
+    stopping = False
+    
+    def spawn_worker():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                _worker_loop(listener, args.max_requests)
+            finally:
+                os._exit(0)
+        workers.add(pid)
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    for _ in range(max(1, args.workers)):
+        spawn_worker()
+    
+    try:
+        while workers:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            workers.discard(pid)
+            if not stopping:
+                spawn_worker()
+    finally:
+        listener.close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+def _worker_loop(listener, max_requests):
+    """Accept and answer connections until the request budget is used up."""
+    served = 0
+    while max_requests <= 0 or served < max_requests:
+        conn, _ = listener.accept()
+        with conn:
+            _handle_connection(conn)
+        served += 1
+
+
+def _handle_connection(conn):
+    """Read one request line from the connection and write back the result."""
+    conn.settimeout(CONNECTION_READ_TIMEOUT)
+    buffer = b''
+    
+    try:
+        while b'\n' not in buffer and len(buffer) < MAX_REQUEST_BYTES:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            buffer += chunk
+        
+        request_data = json.loads(buffer.split(b'\n', 1)[0])
+        result = dispatch(request_data)
+    except socket.timeout:
+        return
+    except Exception as e:
+        result = error_response(e)
+    
+    try:
+        conn.sendall(serialize(result).encode('utf-8') + b'\n')
+    except OSError:
+        pass
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Comdinheiro API, for load tests and benchmarks.
+
+Serves the endpoints the comdinheiro module calls, from recorded fixtures or
+generated tables (see scripts/benchmarks/report_fixtures.py):
+
+- RelatorioGerencialCarteiras001.php (portfolio list, balance, relatorio,
+  consolidado; picked from the 'variaveis' parameter)
+- ExtratoCarteira015.php (asset_allocation), ExtratoCarteira022.php (analise)
+- ComprasVendas002.php (movimentacoes), CarteiraExplodida001.php
+  (consolidado(antigo))
+- Clientes/API/EndPoint001.php (export_data / import_data, POST)
+
+Latency, error rate and payload size are configurable; GET /_stats returns
+the request counters. Point the clients at it through the environment:
+
+    python3 scripts/comdinheiro_standin_server.py --port 8765 \\
+        --latency lognormal:0.4:0.5 --error-rate 0.02 --rows 200:5000
+    export COMDINHEIRO_REPORTS_BASE_URL=http://127.0.0.1:8765/
+    export COMDINHEIRO_BASE_URL=http://127.0.0.1:8765/Clientes/API/
+
+Latency specs: fixed:SECONDS, uniform:MIN:MAX, normal:MEAN:STDDEV,
+lognormal:MEDIAN:SIGMA, exponential:MEAN.
+"""
+
+import sys
+import json
+import math
+import random
+import argparse
+import threading
+import time
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+# Add the parent directory to the path to import the comdinheiro module
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(parent_dir / 'scripts' / 'benchmarks'))
+
+import report_fixtures
+from comdinheiro.config import PARAM_TEMPLATES
+
+DEFAULT_PORT = 8765
+DEFAULT_ROWS = '50'
+DEFAULT_ERROR_STATUSES = '500,502,503'
+
+# Generated payloads kept in memory, by (layout, rows)
+PAYLOAD_CACHE_SIZE = 32
+
+# 'variaveis' of RelatorioGerencialCarteiras001.php requests -> layout
+_REPORT_LAYOUTS = {
+    'nome_portfolio+saldo_bruto+instituicao_financeira': 'portfolio_list',
+    PARAM_TEMPLATES['portfolio_balance']['variaveis']: 'saldo',
+    PARAM_TEMPLATES['detailed_report']['variaveis']: 'relatorio',
+    PARAM_TEMPLATES['consolidated_report']['variaveis']: 'consolidado'
+}
+
+_ENDPOINT_LAYOUTS = {
+    'ExtratoCarteira015.php': 'asset_allocation',
+    'ExtratoCarteira022.php': 'analise',
+    'ComprasVendas002.php': 'movimentacoes',
+    'CarteiraExplodida001.php': 'consolidado(antigo)'
+}
+
+
+class LatencyDistribution:
+    """Response delay drawn from a distribution given as 'name:param[:param]'."""
+
+    def __init__(self, spec: str):
+        """
+        Parse a latency spec.
+
+        Args:
+            spec (str): fixed:S, uniform:MIN:MAX, normal:MEAN:STDDEV,
+                        lognormal:MEDIAN:SIGMA or exponential:MEAN (seconds)
+
+        Raises:
+            ValueError: If the spec is not valid
+        """
+        name, *params = spec.split(':')
+        arity = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2, 'exponential': 1}
+        if name not in arity or len(params) != arity[name]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+
+        self.spec = spec
+        self.name = name
+        self.params = [float(param) for param in params]
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a delay in seconds (never negative)."""
+        if self.name == 'fixed':
+            delay = self.params[0]
+        elif self.name == 'uniform':
+            delay = rng.uniform(*self.params)
+        elif self.name == 'normal':
+            delay = rng.gauss(*self.params)
+        elif self.name == 'lognormal':
+            median, sigma = self.params
+            delay = rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        else:
+            mean = self.params[0]
+            delay = rng.expovariate(1 / mean) if mean > 0 else 0.0
+        return max(0.0, delay)
+
+
+class StandinConfig:
+    """Behaviour of the stand-in server."""
+
+    def __init__(self, latency: str = 'fixed:0', error_rate: float = 0.0,
+                 error_statuses: str = DEFAULT_ERROR_STATUSES, drop_rate: float = 0.0,
+                 retry_after: float = None, rows: str = DEFAULT_ROWS,
+                 fixtures_dir: Path = None, seed: int = None):
+        """
+        Initialize the configuration.
+
+        Args:
+            latency (str): Latency spec (see LatencyDistribution)
+            error_rate (float): Share of requests answered with an error status
+            error_statuses (str): Comma-separated statuses picked for errors
+            drop_rate (float): Share of requests whose connection is closed
+                without a response
+            retry_after (float): Retry-After header sent with 429/503 errors
+            rows (str): Data rows per report, 'N' or 'MIN:MAX'
+            fixtures_dir (Path): Directory with recorded <view_type>.json files
+            seed (int): Random seed, for reproducible runs
+        """
+        self.latency = LatencyDistribution(latency)
+        self.error_rate = error_rate
+        self.error_statuses = [int(status) for status in error_statuses.split(',') if status]
+        self.drop_rate = drop_rate
+        self.retry_after = retry_after
+        bounds = [int(bound) for bound in rows.split(':')]
+        self.rows_range = (bounds[0], bounds[-1])
+        self.fixtures_dir = fixtures_dir
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+
+
+class StandinServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the configuration, payload cache and counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, config: StandinConfig):
+        super().__init__(address, StandinHandler)
+        self.config = config
+        self.stats = {'requests': 0, 'errors': 0, 'dropped': 0, 'endpoints': {}}
+        self.stats_lock = threading.Lock()
+        self._payloads = OrderedDict()
+        self._payloads_lock = threading.Lock()
+
+    def draw(self):
+        """Draw (delay, outcome, rows, status) for a request; outcome is ok, error or drop."""
+        config = self.config
+        with config.rng_lock:
+            delay = config.latency.sample(config.rng)
+            roll = config.rng.random()
+            rows = config.rng.randint(*config.rows_range)
+            status = config.rng.choice(config.error_statuses) if config.error_statuses else 500
+
+        if roll < config.drop_rate:
+            return delay, 'drop', rows, None
+        if roll < config.drop_rate + config.error_rate:
+            return delay, 'error', rows, status
+        return delay, 'ok', rows, 200
+
+    def count(self, endpoint: str, outcome: str) -> None:
+        with self.stats_lock:
+            self.stats['requests'] += 1
+            self.stats['endpoints'][endpoint] = self.stats['endpoints'].get(endpoint, 0) + 1
+            if outcome == 'error':
+                self.stats['errors'] += 1
+            elif outcome == 'drop':
+                self.stats['dropped'] += 1
+
+    def payload(self, layout: str, rows: int) -> bytes:
+        """Get the encoded report of a layout and size, generating it once."""
+        key = (layout, rows)
+        with self._payloads_lock:
+            body = self._payloads.get(key)
+            if body is not None:
+                self._payloads.move_to_end(key)
+                return body
+
+        if layout == 'portfolio_list':
+            response = report_fixtures.synthetic_table(report_fixtures.PORTFOLIO_LIST_COLUMNS, rows)
+        else:
+            response = report_fixtures.load_response(layout, rows, self.config.fixtures_dir)
+        body = json.dumps(response).encode('utf-8')
+
+        with self._payloads_lock:
+            self._payloads[key] = body
+            while len(self._payloads) > PAYLOAD_CACHE_SIZE:
+                self._payloads.popitem(last=False)
+        return body
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Answers Comdinheiro endpoint requests with generated reports."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == '/_stats':
+            with self.server.stats_lock:
+                self._send(200, json.dumps(self.server.stats).encode('utf-8'))
+            return
+        self._answer(parsed, None)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self._answer(urlparse(self.path), self.rfile.read(length) if length else b'')
+
+    def _answer(self, parsed, form):
+        endpoint = parsed.path.rsplit('/', 1)[-1]
+        layout = self._layout(endpoint, parse_qs(parsed.query))
+        if layout is None:
+            self._send(404, json.dumps({'error': f'Unknown endpoint: {endpoint}'}).encode('utf-8'))
+            return
+
+        delay, outcome, rows, status = self.server.draw()
+        self.server.count(endpoint, outcome)
+        time.sleep(delay)
+
+        if outcome == 'drop':
+            self.close_connection = True
+            self.connection.close()
+            return
+        if outcome == 'error':
+            headers = {}
+            if self.server.config.retry_after is not None and status in (429, 503):
+                headers['Retry-After'] = str(self.server.config.retry_after)
+            self._send(status, b'', headers)
+            return
+
+        if layout == 'export':
+            self._send(200, self._export_body(form))
+        else:
+            self._send(200, self.server.payload(layout, rows))
+
+    @staticmethod
+    def _layout(endpoint, query):
+        """Pick the report layout of a request, or None for unknown endpoints."""
+        if endpoint == 'RelatorioGerencialCarteiras001.php':
+            variaveis = query.get('variaveis', [''])[0]
+            return _REPORT_LAYOUTS.get(variaveis, 'consolidado')
+        if endpoint == 'EndPoint001.php':
+            return 'export'
+        return _ENDPOINT_LAYOUTS.get(endpoint)
+
+    @staticmethod
+    def _export_body(form):
+        """Acknowledge an export the way EndPoint001.php does."""
+        try:
+            content = parse_qs((form or b'').decode('utf-8')).get('content', ['[]'])[0]
+            records = len(json.loads(content))
+        except ValueError:
+            records = 0
+        return json.dumps({
+            'status_code': 200,
+            'resposta': [{'Comdinheiro informa': f'{records} registros recebidos. '
+                                                 f'Importação concluída'}]
+        }).encode('utf-8')
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(config: StandinConfig, host: str = '127.0.0.1',
+                port: int = DEFAULT_PORT) -> StandinServer:
+    """
+    Create a stand-in server (call serve_forever, or run it in a thread).
+
+    Args:
+        config (StandinConfig): Server behaviour
+        host (str): Interface to bind
+        port (int): Port to bind (0 picks a free one)
+
+    Returns:
+        StandinServer: Bound server
+    """
+    return StandinServer((host, port), config)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to bind')
+    parser.add_argument('--latency', default='fixed:0',
+                        help='Response delay distribution, e.g. lognormal:0.4:0.5')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Share of requests answered with an error status')
+    parser.add_argument('--error-statuses', default=DEFAULT_ERROR_STATUSES,
+                        help='Comma-separated HTTP statuses used for errors')
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help='Share of requests whose connection is closed without a response')
+    parser.add_argument('--retry-after', type=float, default=None,
+                        help='Retry-After seconds sent with 429/503 errors')
+    parser.add_argument('--rows', default=DEFAULT_ROWS,
+                        help="Data rows per report: 'N' or 'MIN:MAX'")
+    parser.add_argument('--fixtures-dir', type=Path, default=None,
+                        help='Directory with recorded <view_type>.json responses')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    args = parser.parse_args()
+
+    config = StandinConfig(
+        latency=args.latency, error_rate=args.error_rate, error_statuses=args.error_statuses,
+        drop_rate=args.drop_rate, retry_after=args.retry_after, rows=args.rows,
+        fixtures_dir=args.fixtures_dir, seed=args.seed
+    )
+    server = make_server(config, args.host, args.port)
+    host, port = server.server_address[:2]
+
+    print(f"Comdinheiro stand-in listening on http://{host}:{port}/")
+    print(f"  export COMDINHEIRO_REPORTS_BASE_URL=http://{host}:{port}/")
+    print(f"  export COMDINHEIRO_BASE_URL=http://{host}:{port}/Clientes/API/")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
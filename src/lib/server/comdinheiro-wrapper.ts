@@ -0,0 +1,232 @@
+import { spawn } from "child_process";
+import { createConnection } from "net";
+import path from "path";
+import { fileURLToPath } from "url";
+
+// Socket do servidor persistente do wrapper Python
+// (python3 scripts/comdinheiro_api_wrapper.py --serve)
+const WRAPPER_SOCKET =
+  process.env.COMDINHEIRO_WRAPPER_SOCKET || "/tmp/comdinheiro_wrapper.sock";
+
+const DEFAULT_TIMEOUT_MS = 30000;
+
+// Margem para o wrapper desistir com um erro de timeout claro antes de ser
+// encerrado pelo timeout da chamada (inicialização do processo, serialização)
+const DEADLINE_MARGIN_MS = 3000;
+
+export interface WrapperRequest {
+  action: string;
+  [key: string]: unknown;
+}
+
+export interface WrapperCallOptions {
+  timeoutMs?: number;
+}
+
+// Formato compacto de saída do wrapper (comdinheiro/wire_format.py): cabeçalho
+// uma vez, um array por coluna e textos repetidos codificados em dicionário
+export const COLUMNAR_JSON = "columnar-json";
+
+type LegacyRow = Record<string, unknown>;
+type LegacyTable = Record<string, LegacyRow>;
+
+interface ColumnarColumn {
+  values?: unknown[];
+  dict?: unknown[];
+  codes?: number[];
+}
+
+export interface ColumnarTable {
+  header: LegacyRow | null;
+  rows: number | string[];
+  columns: Record<string, ColumnarColumn>;
+  missing?: Record<string, number[]>;
+}
+
+/**
+ * Reconstrói a tabela lin/col original a partir da codificação colunar.
+ */
+export function decodeColumnarTable(encoded: ColumnarTable): LegacyTable {
+  const rowKeys =
+    typeof encoded.rows === "number"
+      ? Array.from({ length: encoded.rows }, (_, index) => `lin${index + 1}`)
+      : encoded.rows;
+  const rows: LegacyRow[] = rowKeys.map(() => ({}));
+
+  for (const [colKey, column] of Object.entries(encoded.columns)) {
+    const dictionary = column.dict;
+    const values = dictionary
+      ? (column.codes ?? []).map((code) => dictionary[code])
+      : column.values ?? [];
+    const absent = new Set(encoded.missing?.[colKey] ?? []);
+
+    for (let index = 0; index < rows.length; index++) {
+      if (!absent.has(index)) {
+        rows[index][colKey] = values[index];
+      }
+    }
+  }
+
+  const table: LegacyTable = {};
+  if (encoded.header != null) {
+    table.lin0 = encoded.header;
+  }
+  rowKeys.forEach((rowKey, index) => {
+    table[rowKey] = rows[index];
+  });
+  return table;
+}
+
+/**
+ * Decodifica as tabelas de um resultado "columnar-json", devolvendo o mesmo
+ * formato do JSON padrão (data.tables.tab0.linN.colN).
+ */
+export function decodeColumnarResult<T>(result: T): T {
+  const payload = result as { format?: string; data?: Record<string, unknown> };
+  if (payload?.format !== COLUMNAR_JSON || !payload.data) {
+    return result;
+  }
+
+  const tables = payload.data.tables as Record<string, ColumnarTable> | undefined;
+  const { format: _format, ...rest } = payload;
+  return {
+    ...rest,
+    data: {
+      ...payload.data,
+      tables: tables
+        ? Object.fromEntries(
+            Object.entries(tables).map(([name, table]) => [
+              name,
+              decodeColumnarTable(table),
+            ])
+          )
+        : tables,
+    },
+  } as T;
+}
+
+// Erros que indicam que o servidor não está rodando: usamos o spawn como fallback
+const SERVER_UNAVAILABLE_CODES = new Set(["ENOENT", "ECONNREFUSED"]);
+
+function getWrapperScriptPath(): string {
+  const __filename = fileURLToPath(import.meta.url);
+  const __dirname = path.dirname(__filename);
+  const projectRoot = path.resolve(__dirname, "../../..");
+  return path.join(projectRoot, "scripts", "comdinheiro_api_wrapper.py");
+}
+
+/**
+ * Envia a requisição para o servidor persistente do wrapper via Unix socket.
+ * Cada conexão carrega uma requisição JSON terminada por "\n"; a resposta é
+ * lida até o servidor fechar a conexão.
+ */
+function callViaSocket<T>(
+  requestData: WrapperRequest,
+  timeoutMs: number
+): Promise<T> {
+  return new Promise<T>((resolve, reject) => {
+    const socket = createConnection(WRAPPER_SOCKET);
+    const chunks: Buffer[] = [];
+
+    socket.setTimeout(timeoutMs, () => {
+      socket.destroy(new Error("Python wrapper server timeout"));
+    });
+
+    socket.on("connect", () => {
+      socket.end(JSON.stringify(requestData) + "\n");
+    });
+
+    socket.on("data", (chunk: Buffer) => {
+      chunks.push(chunk);
+    });
+
+    socket.on("end", () => {
+      try {
+        resolve(JSON.parse(Buffer.concat(chunks).toString("utf-8")));
+      } catch (error) {
+        reject(new Error(`Failed to parse Python wrapper output: ${error}`));
+      }
+    });
+
+    socket.on("error", reject);
+  });
+}
+
+/**
+ * Executa o wrapper como processo avulso (comportamento original).
+ */
+function callViaSpawn<T>(
+  requestData: WrapperRequest,
+  timeoutMs: number
+): Promise<T> {
+  return new Promise<T>((resolve, reject) => {
+    const pythonProcess = spawn("python3", [
+      getWrapperScriptPath(),
+      JSON.stringify(requestData),
+    ]);
+
+    let stdout = "";
+    let stderr = "";
+
+    pythonProcess.stdout.on("data", (data) => {
+      stdout += data.toString();
+    });
+
+    pythonProcess.stderr.on("data", (data) => {
+      stderr += data.toString();
+    });
+
+    const timer = setTimeout(() => {
+      pythonProcess.kill();
+      reject(new Error("Python script timeout"));
+    }, timeoutMs);
+
+    pythonProcess.on("close", (code) => {
+      clearTimeout(timer);
+
+      if (code !== 0) {
+        reject(new Error(`Python script failed with code ${code}: ${stderr}`));
+        return;
+      }
+
+      try {
+        resolve(JSON.parse(stdout));
+      } catch (error) {
+        reject(new Error(`Failed to parse Python script output: ${error}`));
+      }
+    });
+
+    pythonProcess.on("error", (error) => {
+      clearTimeout(timer);
+      reject(new Error(`Failed to start Python script: ${error}`));
+    });
+  });
+}
+
+/**
+ * Chama o wrapper Python do Comdinheiro.
+ *
+ * Usa o servidor persistente quando disponível (imports e conexões já
+ * aquecidos) e recorre ao spawn de um novo processo caso contrário.
+ * Resultados pedidos com format "columnar-json" já voltam decodificados.
+ */
+export async function callComdinheiroWrapper<T>(
+  requestData: WrapperRequest,
+  options: WrapperCallOptions = {}
+): Promise<T> {
+  const timeoutMs = options.timeoutMs ?? DEFAULT_TIMEOUT_MS;
+  const request: WrapperRequest = {
+    deadline: Math.max(1, (timeoutMs - DEADLINE_MARGIN_MS) / 1000),
+    ...requestData,
+  };
+
+  try {
+    return decodeColumnarResult(await callViaSocket<T>(request, timeoutMs));
+  } catch (error) {
+    const code = (error as NodeJS.ErrnoException).code;
+    if (code && SERVER_UNAVAILABLE_CODES.has(code)) {
+      return decodeColumnarResult(await callViaSpawn<T>(request, timeoutMs));
+    }
+    throw error;
+  }
+}
@@ -1,5 +1,6 @@
 import { json } from "@sveltejs/kit";
 import type { RequestHandler } from "./$types";
+import { callComdinheiroWrapper } from "$lib/server/comdinheiro-wrapper";
 
 // Tipos para a API do Comdinheiro
 interface ComdinheirRequest {
@@ -240,79 +241,23 @@ export const POST: RequestHandler = async ({ request }) => {
         view_type: view_type || "consolidado",
       });
 
-      // ✨ Use the new simplified Python module via wrapper script
-      const { spawn } = await import("child_process");
-      const path = await import("path");
-      const { fileURLToPath } = await import("url");
-
-      // Get current file directory to locate the Python script
-      const __filename = fileURLToPath(import.meta.url);
-      const __dirname = path.dirname(__filename);
-      const projectRoot = path.resolve(__dirname, "../../../..");
-      const pythonScript = path.join(
-        projectRoot,
-        "scripts",
-        "comdinheiro_api_wrapper.py"
-      );
-
+      // ✨ Use the new simplified Python module via wrapper (persistent server
+      // when running, one-off process otherwise)
       // Prepare request data for Python script
       const requestData = {
         action: "get_portfolio_data",
         portfolio: carteira,
         end_date: data_final,
         view_type: view_type || "consolidado",
+        // Tabelas colunares: payload menor entre o Python e o Node
+        format: "columnar-json",
         username,
         password,
       };
 
       try {
-        const result = await new Promise<PythonWrapperResult>(
-          (resolve, reject) => {
-            const pythonProcess = spawn("python3", [
-              pythonScript,
-              JSON.stringify(requestData),
-            ]);
-
-            let stdout = "";
-            let stderr = "";
-
-            pythonProcess.stdout.on("data", (data) => {
-              stdout += data.toString();
-            });
-
-            pythonProcess.stderr.on("data", (data) => {
-              stderr += data.toString();
-            });
-
-            pythonProcess.on("close", (code) => {
-              if (code !== 0) {
-                reject(
-                  new Error(`Python script failed with code ${code}: ${stderr}`)
-                );
-                return;
-              }
-
-              try {
-                const result = JSON.parse(stdout);
-                resolve(result);
-              } catch (error) {
-                reject(
-                  new Error(`Failed to parse Python script output: ${error}`)
-                );
-              }
-            });
-
-            pythonProcess.on("error", (error) => {
-              reject(new Error(`Failed to start Python script: ${error}`));
-            });
-
-            // Set timeout
-            setTimeout(() => {
-              pythonProcess.kill();
-              reject(new Error("Python script timeout"));
-            }, 30000);
-          }
-        );
+        const result =
+          await callComdinheiroWrapper<PythonWrapperResult>(requestData);
 
         console.log("✅ Resposta do novo módulo Comdinheiro:", {
           success: result.success,
@@ -175,6 +175,18 @@ def test_data_processor() -> Dict[str, bool]:
             results['currency_parsing'] = False
             print(f"❌ Parsing incorreto: {parsed}")
         
+        # Teste parsing/formatação de colunas inteiras
+        values = ["1.234.567,89", "", "abc", "-12,5", 3]
+        parsed_many = DataProcessor.parse_brazilian_currency_many(values).tolist()
+        formatted_many = DataProcessor.format_brazilian_currency_many(parsed_many)
+        if (parsed_many == [DataProcessor.parse_brazilian_currency(v) for v in values]
+                and formatted_many == [DataProcessor.format_brazilian_currency(v) for v in parsed_many]):
+            results['currency_bulk'] = True
+            print("✅ Parsing/formatação em lote consistentes com a versão por célula")
+        else:
+            results['currency_bulk'] = False
+            print(f"❌ Lote incorreto: {parsed_many} / {formatted_many}")
+        
         # Teste decodificação de caracteres especiais
         decoded = DataProcessor.decode_special_characters('Test String"')
         if isinstance(decoded, str):
@@ -201,6 +213,7 @@ def test_data_processor() -> Dict[str, bool]:
         results.update({
             'currency_formatting': False,
             'currency_parsing': False,
+            'currency_bulk': False,
             'character_decoding': False,
             'date_calculation': False
         })
@@ -208,6 +221,181 @@ def test_data_processor() -> Dict[str, bool]:
     return results
 
 
+def test_balance_snapshot() -> Dict[str, bool]:
+    """Testa o índice de saldos de todas as carteiras."""
+    results = {}
+    
+    print("\n💰 Testando snapshot de saldos...")
+    
+    servers = []
+    try:
+        from comdinheiro import ComdinheiroAPI, DataProcessor
+        from comdinheiro.resilience import RetryPolicy
+        import comdinheiro.api_client as api_client
+        
+        response = {'tables': {'tab0': {
+            'lin0': {'col0': 'Carteira', 'col1': 'Saldo Bruto'},
+            'lin1': {'col0': 'Carteira_A ', 'col1': '1.000,50'},
+            'lin2': {'col0': 'Carteira_B', 'col1': '2.500,00'}
+        }}}
+        
+        snapshot = DataProcessor.parse_balance_snapshot(response)
+        balance = DataProcessor.lookup_balance(snapshot, 'CARTEIRA_B')
+        missing = DataProcessor.lookup_balance(snapshot, 'Inexistente')
+        
+        if balance == 2500.0 and missing is None and snapshot['balances']['Carteira_A'] == 1000.5:
+            results['balance_snapshot'] = True
+            print("✅ Índice de saldos (sem diferenciar maiúsculas) funcionando")
+        else:
+            results['balance_snapshot'] = False
+            print(f"❌ Snapshot incorreto: {snapshot}")
+        
+        # Fallback legado: carteira não encontrada retorna o primeiro saldo
+        if DataProcessor.parse_portfolio_balance(response, 'Inexistente') == 1000.5:
+            results['balance_fallback'] = True
+            print("✅ Fallback de saldo mantido")
+        else:
+            results['balance_fallback'] = False
+            print("❌ Fallback de saldo alterado")
+        
+        # API instável: sem segunda chamada por carteira após o snapshot falhar
+        down = _start_stub_server(response, failures=100)
+        servers.append(down)
+        healthy = _start_stub_server(response)
+        servers.append(healthy)
+        original_base = api_client.BASE_REPORTS_URL
+        
+        try:
+            api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{down.server_port}/"
+            api = ComdinheiroAPI("test_user", "test_pass",
+                                 retry_policy=RetryPolicy(max_attempts=2, backoff_base=0.01))
+            failed_balance = api.get_portfolio_balance("Carteira_B", "2024-01-31")
+            
+            api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{healthy.server_port}/"
+            api = ComdinheiroAPI("test_user", "test_pass")
+            missing_balance = api.get_portfolio_balance("Inexistente", "2024-01-31")
+        finally:
+            api_client.BASE_REPORTS_URL = original_base
+        
+        if (failed_balance is None and down.requests == 2
+                and missing_balance == 1000.5 and healthy.requests == 2):
+            results['balance_no_fallback_on_failure'] = True
+            print("✅ Fallback por carteira só quando ela falta no snapshot")
+        else:
+            results['balance_no_fallback_on_failure'] = False
+            print(f"❌ Fallback incorreto: {down.requests} requisições com a API fora, "
+                  f"{healthy.requests} com carteira ausente")
+            
+    except Exception as e:
+        print(f"❌ Erro no snapshot de saldos: {e}")
+        results.update({
+            'balance_snapshot': False,
+            'balance_fallback': False,
+            'balance_no_fallback_on_failure': False
+        })
+    finally:
+        for server in servers:
+            server.shutdown()
+    
+    return results
+
+
+def test_columnar_table() -> Dict[str, bool]:
+    """Testa a representação colunar das tabelas de relatório."""
+    results = {}
+    
+    print("\n📐 Testando tabela colunar...")
+    
+    try:
+        from comdinheiro import DataProcessor, ColumnarTable
+        
+        response = {'tables': {'tab0': {
+            'lin0': {'col0': 'Carteira', 'col5': 'Saldo', 'col7': 'PU Aplic', 'col8': 'PU'},
+            'lin1': {'col0': 'A', 'col5': '1.000,50', 'col7': '10', 'col8': '11'},
+            'lin2': {'col0': 'B', 'col5': '', 'col7': '0', 'col8': '5'},
+            'lin3': {'col0': 'C', 'col5': '2.000,00', 'col8': '7'}
+        }}}
+        
+        result = DataProcessor.process_response_by_view_type(response, 'relatorio', 'A')
+        tab0 = result['tables']['tab0']
+        
+        if (result['total_geral'] == '3.000,50'
+                and tab0['lin0']['col_diff'] == 'Diferença %'
+                and '10,00%' in tab0['lin1']['col_diff']
+                and tab0['lin2']['col_diff'] == '--'
+                and tab0['lin2']['col5'] == ''
+                and 'col7' not in tab0['lin3']):
+            results['columnar_legacy_output'] = True
+            print("✅ Saída legada (lin/col) preservada")
+        else:
+            results['columnar_legacy_output'] = False
+            print(f"❌ Saída legada alterada: {result}")
+        
+        columnar = DataProcessor.process_response_by_view_type(response, 'consolidado', 'A', columnar=True)
+        table = columnar['tables']['tab0']
+        
+        if (isinstance(table, ColumnarTable) and table.is_numeric('col5')
+                and dict(table.legacy_view()) == table.to_rows()):
+            results['columnar_table'] = True
+            print("✅ Colunas numéricas e visão legada funcionando")
+        else:
+            results['columnar_table'] = False
+            print("❌ Tabela colunar incorreta")
+            
+    except Exception as e:
+        print(f"❌ Erro na tabela colunar: {e}")
+        results.update({
+            'columnar_legacy_output': False,
+            'columnar_table': False
+        })
+    
+    return results
+
+
+def test_column_types() -> Dict[str, bool]:
+    """Testa a inferência de tipo por coluna na limpeza das tabelas."""
+    results = {}
+    
+    print("\n🔠 Testando inferência de tipos por coluna...")
+    
+    try:
+        from comdinheiro import DataProcessor
+        from comdinheiro.column_types import infer_column_type
+        
+        table = {
+            'lin0': {'col0': 'Ano', 'col1': 'Código', 'col2': 'Valor', 'col3': 'Ativo'},
+            'lin1': {'col0': '2024', 'col1': '123456', 'col2': '1.234,56', 'col3': '001'},
+            'lin2': {'col0': '2025', 'col1': '654321', 'col2': 'nd', 'col3': 'PETR4'}
+        }
+        cleaned = DataProcessor.clean_table_data(table)
+        
+        if (cleaned['lin1']['col1'] == '123456' and cleaned['lin1']['col2'] == 1234.56
+                and cleaned['lin2']['col2'] == 'nd' and cleaned['lin1']['col3'] == '001'
+                and cleaned['lin1']['col0'] == '2024'):
+            results['column_type_inference'] = True
+            print("✅ Colunas de texto não misturam números (código, ativo)")
+        else:
+            results['column_type_inference'] = False
+            print(f"❌ Tipos inferidos incorretamente: {cleaned}")
+        
+        if (infer_column_type(['1,5', '', '-']) == 'number'
+                and infer_column_type(['1,5', 'abc']) == 'text'):
+            results['column_type_sampling'] = True
+            print("✅ Amostragem ignora valores vazios")
+        else:
+            results['column_type_sampling'] = False
+            print("❌ Amostragem de tipos incorreta")
+            
+    except Exception as e:
+        print(f"❌ Erro na inferência de tipos: {e}")
+        results.update({
+            'column_type_inference': False,
+            'column_type_sampling': False
+        })
+    
+    return results
+
+
 def test_auth_manager() -> Dict[str, bool]:
     """Testa as funcionalidades do AuthManager."""
     results = {}
@@ -291,6 +479,1323 @@ def test_api_client() -> Dict[str, bool]:
     return results
 
 
+def test_concurrent_fetches() -> Dict[str, bool]:
+    """Testa as chamadas concorrentes de asset allocation e do lote de carteiras."""
+    results = {}
+    
+    print("\n🔀 Testando chamadas concorrentes...")
+    
+    try:
+        import time
+        import threading
+        from comdinheiro import ComdinheiroAPI
+        from comdinheiro.config import ERROR_MESSAGES
+        
+        def allocation(url, **kwargs):
+            time.sleep(0.2)
+            return {'grafico1': {'Renda Fixa': '60', 'Multimercado': '40'}}
+        
+        def failed_balance(*args):
+            time.sleep(0.2)
+            raise RuntimeError("saldo indisponível")
+        
+        def performance(*args):
+            time.sleep(0.2)
+            return {'rentabilidade_anual': 12.5}
+        
+        def slow_performance(*args):
+            time.sleep(1)
+            return {'rentabilidade_anual': 12.5}
+        
+        # Saldo com erro não derruba o resultado; as três chamadas correm juntas
+        api = ComdinheiroAPI("test_user", "test_pass")
+        api._make_request = allocation
+        api.get_portfolio_balance = failed_balance
+        api.get_performance_data = performance
+        started = time.monotonic()
+        result = api.get_asset_allocation("Teste", "2024-01-31")
+        elapsed = time.monotonic() - started
+        
+        if (result and result['grafico1'] == {'Renda Fixa': 60.0, 'RV': 40.0}
+                and result['saldo_bruto'] == 0.0 and result['rentabilidade_anual'] == 12.5
+                and 'errors' not in result and elapsed < 0.5):
+            results['asset_allocation_failed_branch'] = True
+            print(f"✅ Asset allocation sem o saldo que falhou, em {elapsed:.2f}s")
+        else:
+            results['asset_allocation_failed_branch'] = False
+            print(f"❌ Asset allocation incorreto: {result} em {elapsed:.2f}s")
+        
+        # Desempenho atrasado: resultado parcial no prazo, sem esperar a thread
+        api.get_performance_data = slow_performance
+        started = time.monotonic()
+        result = api.get_asset_allocation("Teste", "2024-01-31", deadline=0.4)
+        elapsed = time.monotonic() - started
+        
+        if (result and result['grafico1'] == {'Renda Fixa': 60.0, 'RV': 40.0}
+                and result.get('errors') == {'performance': ERROR_MESSAGES['deadline_exceeded']}
+                and elapsed < 0.8):
+            results['asset_allocation_deadline'] = True
+            print(f"✅ Resultado parcial com erro de prazo em {elapsed:.2f}s")
+        else:
+            results['asset_allocation_deadline'] = False
+            print(f"❌ Resultado parcial incorreto: {result} em {elapsed:.2f}s")
+        
+        # Lote: no máximo max_concurrency carteiras em andamento ao mesmo tempo
+        lock = threading.Lock()
+        in_flight = {'now': 0, 'max': 0}
+        
+        def report(url, endpoint_key=None, deadline=None):
+            with lock:
+                in_flight['now'] += 1
+                in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            try:
+                wait = 1 if 'Lenta' in url else 0.05
+                time.sleep(min(wait, deadline.remaining()) if deadline else wait)
+                if deadline is not None:
+                    deadline.check()
+                return {'tables': {'tab0': {
+                    'lin0': {'col0': 'Carteira', 'col5': 'Saldo'},
+                    'lin1': {'col0': 'Teste', 'col5': '1.000,00'}
+                }}}
+            finally:
+                with lock:
+                    in_flight['now'] -= 1
+        
+        api = ComdinheiroAPI("test_user", "test_pass")
+        api._make_request = report
+        portfolios = [f"Carteira_{i}" for i in range(6)]
+        batch = list(api.get_portfolio_data_many(portfolios, view_type="relatorio",
+                                                 end_date="2024-01-31", max_concurrency=2))
+        
+        if (sorted(portfolio for portfolio, _, _ in batch) == portfolios
+                and all(data and not error for _, data, error in batch)
+                and in_flight['max'] == 2):
+            results['batch_bounded_concurrency'] = True
+            print("✅ Lote com no máximo 2 carteiras simultâneas")
+        else:
+            results['batch_bounded_concurrency'] = False
+            print(f"❌ Lote incorreto: {batch}, máximo simultâneo {in_flight['max']}")
+        
+        # Prazo do lote: as carteiras já prontas são mantidas
+        started = time.monotonic()
+        batch = {portfolio: (data, error) for portfolio, data, error in
+                 api.get_portfolio_data_many(["Lenta", "Rapida_1", "Rapida_2"],
+                                             view_type="relatorio", end_date="2024-01-31",
+                                             max_concurrency=3, deadline=0.3)}
+        elapsed = time.monotonic() - started
+        
+        if (batch["Lenta"] == (None, ERROR_MESSAGES['deadline_exceeded'])
+                and batch["Rapida_1"][0] and batch["Rapida_2"][0] and elapsed < 0.8):
+            results['batch_deadline_keeps_done'] = True
+            print(f"✅ Prazo do lote mantém as carteiras prontas ({elapsed:.2f}s)")
+        else:
+            results['batch_deadline_keeps_done'] = False
+            print(f"❌ Prazo do lote incorreto: {batch} em {elapsed:.2f}s")
+            
+    except Exception as e:
+        print(f"❌ Erro nas chamadas concorrentes: {e}")
+        results.update({
+            'asset_allocation_failed_branch': False,
+            'asset_allocation_deadline': False,
+            'batch_bounded_concurrency': False,
+            'batch_deadline_keeps_done': False
+        })
+    
+    return results
+
+
+def test_request_plans() -> Dict[str, bool]:
+    """Testa os planos de requisição pré-compilados contra build_parameters + _build_url."""
+    results = {}
+    
+    print("\n🧭 Testando planos de requisição...")
+    
+    try:
+        from comdinheiro import ComdinheiroAPI
+        from comdinheiro.cache import canonical_url
+        from comdinheiro.config import VIEW_TYPE_MAPPING, build_parameters
+        
+        api = ComdinheiroAPI("test_user", "test_pass")
+        calls = [
+            {'portfolio': 'Carteira A', 'start_date': '01012024', 'end_date': '31012024',
+             'bank': 'BTG%20Pactual', 'operation': 'todos'},
+            {'portfolio': '', 'end_date': '31012024'},
+            {'portfolio': 'Carteira A', 'nome_portfolio': 'sobrescrito'}
+        ]
+        
+        mismatches = []
+        for view_type, (endpoint_key, template_name) in VIEW_TYPE_MAPPING.items():
+            for kwargs in calls:
+                legacy = api._build_url(endpoint_key, build_parameters(template_name, **kwargs))
+                planned = api._planned_url(endpoint_key, template_name, **kwargs)
+                if planned != legacy or canonical_url(planned) != canonical_url(legacy):
+                    mismatches.append((view_type, kwargs))
+        
+        if not mismatches:
+            results['request_plans'] = True
+            print("✅ Planos geram a mesma URL e chave de cache do caminho antigo")
+        else:
+            results['request_plans'] = False
+            print(f"❌ Planos divergem do caminho antigo: {mismatches}")
+            
+    except Exception as e:
+        print(f"❌ Erro nos planos de requisição: {e}")
+        results['request_plans'] = False
+    
+    return results
+
+
+def test_client_registry() -> Dict[str, bool]:
+    """Testa o registro compartilhado de clientes da API."""
+    results = {}
+    
+    print("\n♻️ Testando registro de clientes...")
+    
+    try:
+        from comdinheiro import ClientRegistry
+        
+        registry = ClientRegistry(max_size=2)
+        first = registry.get("user_a", "pass_a")
+        again = registry.get("user_a", "pass_a")
+        other = registry.get("user_b", "pass_b")
+        
+        if first is again and first is not other:
+            results['registry_reuse'] = True
+            print("✅ Cliente reutilizado para as mesmas credenciais")
+        else:
+            results['registry_reuse'] = False
+            print("❌ Registro não reutilizou o cliente")
+        
+        registry.get("user_c", "pass_c")
+        registry.idle_timeout = 0
+        evicted = registry.evict_idle()
+        if evicted == 2 and len(registry) == 0:
+            results['registry_eviction'] = True
+            print("✅ Limite de tamanho e expiração por inatividade funcionando")
+        else:
+            results['registry_eviction'] = False
+            print(f"❌ Expiração incorreta: {evicted} removidos, {len(registry)} restantes")
+            
+    except Exception as e:
+        print(f"❌ Erro no registro de clientes: {e}")
+        results.update({
+            'registry_reuse': False,
+            'registry_eviction': False
+        })
+    
+    return results
+
+
+def test_response_cache() -> Dict[str, bool]:
+    """Testa o cache de respostas (TTL + LRU)."""
+    results = {}
+    
+    print("\n🗄️ Testando cache de respostas...")
+    
+    try:
+        from comdinheiro.cache import TTLCache, canonical_url
+        
+        # Mesma URL com parâmetros em outra ordem gera a mesma chave
+        if canonical_url("https://x.com/a.php?b=1&a=2") == canonical_url("https://x.com/a.php?a=2&b=1"):
+            results['cache_canonical_key'] = True
+            print("✅ Chave canônica de URL funcionando")
+        else:
+            results['cache_canonical_key'] = False
+            print("❌ Chave canônica de URL com problema")
+        
+        cache = TTLCache(max_entries=10, max_bytes=100)
+        cache.set('a', {'v': 1}, ttl=60, size=60)
+        cache.set('b', {'v': 2}, ttl=60, size=60)  # Excede bytes: remove 'a'
+        cache.set('c', {'v': 3}, ttl=0, size=1)    # TTL zero: não é armazenado
+        
+        if cache.get('a') is None and cache.get('b') == {'v': 2} and cache.get('c') is None:
+            stats = cache.stats()
+            results['cache_lru_ttl'] = stats['hits'] == 1 and stats['evictions'] == 1
+            print(f"✅ Limites e contadores do cache: {stats}")
+        else:
+            results['cache_lru_ttl'] = False
+            print("❌ Expiração/LRU do cache com problema")
+            
+    except Exception as e:
+        print(f"❌ Erro no cache de respostas: {e}")
+        results.update({
+            'cache_canonical_key': False,
+            'cache_lru_ttl': False
+        })
+    
+    return results
+
+
+def test_disk_cache() -> Dict[str, bool]:
+    """Testa o cache persistente em disco de relatórios."""
+    results = {}
+    
+    print("\n💾 Testando cache em disco...")
+    
+    server = None
+    try:
+        import tempfile
+        from comdinheiro import ComdinheiroAPI, DiskCache
+        import comdinheiro.api_client as api_client
+        
+        directory = tempfile.mkdtemp(prefix='comdinheiro-disk-cache-')
+        server = _start_stub_server({'tables': {'tab0': {
+            'lin0': {'col0': 'Carteira', 'col5': 'Saldo'},
+            'lin1': {'col0': 'Teste', 'col5': '1.000,00'}
+        }}})
+        original_base = api_client.BASE_REPORTS_URL
+        api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{server.server_port}/"
+        
+        try:
+            # Datas passadas: o segundo "processo" lê do disco, sem servidor
+            first = ComdinheiroAPI("test_user", "test_pass", disk_cache=DiskCache(directory))
+            data, error = first.get_portfolio_data("Teste", "2024-01-01", "2024-01-31")
+            server.shutdown()
+            server = None
+            
+            second = ComdinheiroAPI("test_user", "test_pass", disk_cache=DiskCache(directory))
+            cached, cached_error = second.get_portfolio_data("Teste", "2024-01-01", "2024-01-31")
+            other = ComdinheiroAPI("outro_user", "test_pass", disk_cache=DiskCache(directory))
+            other_data, _ = other.get_portfolio_data("Teste", "2024-01-01", "2024-01-31")
+        finally:
+            api_client.BASE_REPORTS_URL = original_base
+        
+        if data and cached == data and not cached_error and other_data is None:
+            results['disk_cache_shared'] = True
+            print("✅ Relatório passado reutilizado entre clientes da mesma conta")
+        else:
+            results['disk_cache_shared'] = False
+            print(f"❌ Cache em disco incorreto: {error}, {cached_error}")
+        
+        cache = DiskCache(directory, max_bytes=200, today_ttl=60)
+        today_ttl = cache.ttl_for("https://x.com/a.php?data_fim=01012999")
+        past_ttl = cache.ttl_for("https://x.com/a.php?data_fim=01012020")
+        for i in range(5):
+            cache.set('conta', 'portfolio_report', f"https://x.com/a.php?data_fim=0101202{i}",
+                      {'tables': {'tab0': {'lin0': {'col0': 'x' * 50}}}})
+        cache.evict()
+        stats = cache.stats()
+        
+        if today_ttl == 60 and past_ttl is None and stats['bytes'] <= 200 and stats['entries'] >= 1:
+            results['disk_cache_eviction'] = True
+            print(f"✅ TTL por data e limite de tamanho: {stats}")
+        else:
+            results['disk_cache_eviction'] = False
+            print(f"❌ TTL/limite do cache em disco com problema: {stats}")
+        
+        # Erros e relatórios vazios da API não vão para o disco
+        url = "https://x.com/a.php?data_fim=01012020"
+        stored = [cache.set('conta', 'portfolio_report', url, value)
+                  for value in ({'tables': {'tab0': {}}}, {'raw_response': 'Erro'}, {})]
+        
+        if stored == [False, False, False] and cache.get('conta', 'portfolio_report', url) is None:
+            results['disk_cache_rejects_errors'] = True
+            print("✅ Respostas de erro ou vazias não são gravadas")
+        else:
+            results['disk_cache_rejects_errors'] = False
+            print(f"❌ Resposta inválida gravada: {stored}")
+    
+    except Exception as e:
+        print(f"❌ Erro no cache em disco: {e}")
+        results.update({
+            'disk_cache_shared': False,
+            'disk_cache_eviction': False,
+            'disk_cache_rejects_errors': False
+        })
+    finally:
+        if server:
+            server.shutdown()
+    
+    return results
+
+
+def test_single_flight() -> Dict[str, bool]:
+    """Testa o agrupamento de chamadas idênticas concorrentes (single-flight)."""
+    results = {}
+    
+    print("\n🛫 Testando single-flight...")
+    
+    server = None
+    try:
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from comdinheiro import ComdinheiroAPI
+        import comdinheiro.api_client as api_client
+        
+        server = _start_stub_server({'tables': {'tab0': {
+            'lin0': {'col0': 'Carteira', 'col5': 'Saldo'},
+            'lin1': {'col0': 'Teste', 'col5': '1.000,00'}
+        }}}, delay=0.3)
+        original_base = api_client.BASE_REPORTS_URL
+        api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{server.server_port}/"
+        
+        try:
+            api = ComdinheiroAPI("test_user", "test_pass")
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [executor.submit(api.get_portfolio_data, "Teste", None, "2024-01-31")
+                           for _ in range(8)]
+                outcomes = [future.result() for future in futures]
+            stats = api.single_flight_stats()
+            requests_made = server.requests
+            
+            # O prazo curto de quem faz a chamada não derruba quem espera por ela
+            api = ComdinheiroAPI("test_user", "test_pass")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                hurried = executor.submit(api.get_portfolio_data, "Teste", None, "2024-02-29",
+                                          deadline=0.1)
+                time.sleep(0.02)
+                patient = executor.submit(api.get_portfolio_data, "Teste", None, "2024-02-29")
+                hurried_data, hurried_error = hurried.result()
+                patient_data, patient_error = patient.result()
+        finally:
+            api_client.BASE_REPORTS_URL = original_base
+        
+        if (requests_made == 1 and all(data and not error for data, error in outcomes)
+                and stats['operations']['portfolio_data']['coalesced'] == 7):
+            results['single_flight_coalescing'] = True
+            print(f"✅ 8 chamadas concorrentes, 1 requisição: {stats['coalesced']} agrupadas")
+        else:
+            results['single_flight_coalescing'] = False
+            print(f"❌ Agrupamento incorreto: {requests_made} requisições, {stats}")
+        
+        if hurried_data is None and hurried_error and patient_data and not patient_error:
+            results['single_flight_private_deadline'] = True
+            print("✅ Prazo esgotado de uma chamada não é repassado a quem aguarda")
+        else:
+            results['single_flight_private_deadline'] = False
+            print(f"❌ Prazo repassado: {hurried_error} / {patient_error}")
+            
+    except Exception as e:
+        print(f"❌ Erro no single-flight: {e}")
+        results.update({
+            'single_flight_coalescing': False,
+            'single_flight_private_deadline': False
+        })
+    finally:
+        if server:
+            server.shutdown()
+    
+    return results
+
+
+def test_resilience() -> Dict[str, bool]:
+    """Testa retry, circuit breaker e rate limit contra um servidor local instável."""
+    results = {}
+    
+    print("\n🛟 Testando camada de resiliência...")
+    
+    servers = []
+    try:
+        import time
+        from comdinheiro import ComdinheiroAPI
+        from comdinheiro.resilience import RetryPolicy, TokenBucket
+        import comdinheiro.api_client as api_client
+        
+        payload = {'tables': {'tab0': {
+            'lin0': {'col0': 'Carteira', 'col5': 'Saldo'},
+            'lin1': {'col0': 'Teste', 'col5': '1.000,00'}
+        }}}
+        original_base = api_client.BASE_REPORTS_URL
+        
+        try:
+            # Duas falhas 503 seguidas de sucesso: o GET é repetido com backoff
+            flaky = _start_stub_server(payload, failures=2)
+            servers.append(flaky)
+            api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{flaky.server_port}/"
+            api = ComdinheiroAPI("test_user", "test_pass",
+                                 retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01))
+            data, error = api.get_portfolio_data("Teste", None, "2024-01-31")
+            stats = api.resilience_stats()
+            
+            if data and not error and flaky.requests == 3 and stats['retries'] == 2:
+                results['resilience_retry'] = True
+                print("✅ Falhas transitórias recuperadas com retry")
+            else:
+                results['resilience_retry'] = False
+                print(f"❌ Retry incorreto: {error}, {flaky.requests} requisições, {stats}")
+            
+            # API fora do ar: o circuito abre após 5 falhas e para de chamar
+            down = _start_stub_server(payload, failures=100)
+            servers.append(down)
+            api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{down.server_port}/"
+            api = ComdinheiroAPI("test_user", "test_pass",
+                                 retry_policy=RetryPolicy(max_attempts=1))
+            outcomes = [api.get_portfolio_data("Teste", None, "2024-01-31") for _ in range(7)]
+            stats = api.resilience_stats()
+            
+            if (all(data is None for data, _ in outcomes) and down.requests == 5
+                    and stats['circuits']['portfolio_report']['state'] == 'open'
+                    and stats['circuit_rejections'] == 2):
+                results['resilience_circuit_breaker'] = True
+                print("✅ Circuit breaker abriu e bloqueou novas chamadas")
+            else:
+                results['resilience_circuit_breaker'] = False
+                print(f"❌ Circuit breaker incorreto: {down.requests} requisições, {stats}")
+
+            # Tentativa half-open barrada pelo rate limit não deixa o circuito travado
+            healthy = _start_stub_server(payload)
+            servers.append(healthy)
+            api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{healthy.server_port}/"
+            api = ComdinheiroAPI("half_open_user", "test_pass", rate_limit=20, rate_burst=1,
+                                 retry_policy=RetryPolicy(max_attempts=1))
+            breaker = api.circuit_breakers['portfolio_report']
+            breaker.reset_timeout = 0
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+            api.rate_limiter.acquire(timeout=0)
+
+            throttled = api.get_portfolio_data("Teste", None, "2024-01-31", deadline=0.01)
+            time.sleep(0.1)
+            data, error = api.get_portfolio_data("Teste", None, "2024-01-31")
+            stats = api.resilience_stats()
+
+            if (throttled[0] is None and data and not error and healthy.requests == 1
+                    and stats['circuits']['portfolio_report']['state'] == 'closed'):
+                results['resilience_half_open_rate_limit'] = True
+                print("✅ Tentativa half-open sem token não trava o circuito")
+            else:
+                results['resilience_half_open_rate_limit'] = False
+                print(f"❌ Circuito travado em half-open: {healthy.requests} requisições, {stats}")
+        finally:
+            api_client.BASE_REPORTS_URL = original_base
+        
+        bucket = TokenBucket(rate=1, capacity=2)
+        acquired = [bucket.acquire(timeout=0) for _ in range(3)]
+        
+        if acquired == [True, True, False] and bucket.stats()['rejected'] == 1:
+            results['resilience_rate_limit'] = True
+            print("✅ Token bucket limitando a taxa por conta")
+        else:
+            results['resilience_rate_limit'] = False
+            print(f"❌ Token bucket incorreto: {acquired}")
+            
+    except Exception as e:
+        print(f"❌ Erro na camada de resiliência: {e}")
+        results.update({
+            'resilience_retry': False,
+            'resilience_circuit_breaker': False,
+            'resilience_half_open_rate_limit': False,
+            'resilience_rate_limit': False
+        })
+    finally:
+        for server in servers:
+            server.shutdown()
+    
+    return results
+
+
+def test_deadlines() -> Dict[str, bool]:
+    """Testa prazos (deadlines) e timeouts por endpoint."""
+    results = {}
+    
+    print("\n⏱️ Testando deadlines...")
+    
+    server = None
+    try:
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from comdinheiro import ComdinheiroAPI, Deadline
+        from comdinheiro.config import ENDPOINT_TIMEOUTS, ERROR_MESSAGES
+        from comdinheiro.deadline import request_timeout
+        import comdinheiro.api_client as api_client
+        
+        connect_timeout, read_timeout = request_timeout('export_data', Deadline(2))
+        if (request_timeout('portfolio_report') == ENDPOINT_TIMEOUTS['portfolio_report']
+                and connect_timeout <= 2 and read_timeout <= 2):
+            results['deadline_timeouts'] = True
+            print("✅ Timeouts por endpoint limitados pelo prazo restante")
+        else:
+            results['deadline_timeouts'] = False
+            print(f"❌ Timeouts incorretos: {connect_timeout}, {read_timeout}")
+        
+        # API travada: a chamada desiste no prazo com erro claro
+        server = _start_stub_server({'tables': {'tab0': {}}}, delay=2)
+        original_base = api_client.BASE_REPORTS_URL
+        api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{server.server_port}/"
+        
+        try:
+            api = ComdinheiroAPI("test_user", "test_pass")
+            started = time.monotonic()
+            data, error = api.get_portfolio_data("Teste", None, "2024-01-31", deadline=0.3)
+            elapsed = time.monotonic() - started
+        finally:
+            api_client.BASE_REPORTS_URL = original_base
+        
+        if data is None and error == ERROR_MESSAGES['deadline_exceeded'] and elapsed < 1:
+            results['deadline_exceeded'] = True
+            print(f"✅ Prazo respeitado: erro de timeout em {elapsed:.2f}s")
+        else:
+            results['deadline_exceeded'] = False
+            print(f"❌ Prazo não respeitado: {error} em {elapsed:.2f}s")
+        
+        # Ramo opcional que não termina no prazo é marcado como atrasado
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            slow = executor.submit(time.sleep, 0.5)
+            branch = ComdinheiroAPI._optional_result(slow, Deadline(0.05))
+        finally:
+            executor.shutdown(wait=False)
+        
+        if branch == (None, True):
+            results['deadline_optional_branch'] = True
+            print("✅ Ramo opcional atrasado sinalizado como fora do prazo")
+        else:
+            results['deadline_optional_branch'] = False
+            print(f"❌ Ramo opcional atrasado não sinalizado: {branch}")
+            
+    except Exception as e:
+        print(f"❌ Erro nos deadlines: {e}")
+        results.update({
+            'deadline_timeouts': False,
+            'deadline_exceeded': False,
+            'deadline_optional_branch': False
+        })
+    finally:
+        if server:
+            server.shutdown()
+    
+    return results
+
+
+def test_metrics() -> Dict[str, bool]:
+    """Testa o registro de métricas de requisições e etapas de processamento."""
+    results = {}
+    
+    print("\n📈 Testando métricas...")
+    
+    server = None
+    try:
+        from comdinheiro import ComdinheiroAPI, TTLCache, get_metrics
+        import comdinheiro.api_client as api_client
+        
+        metrics = get_metrics()
+        metrics.reset()
+        
+        server = _start_stub_server({'tables': {'tab0': {
+            'lin0': {'col0': 'Carteira', 'col5': 'Saldo'},
+            'lin1': {'col0': 'Teste', 'col5': '1.000,00'}
+        }}})
+        original_base = api_client.BASE_REPORTS_URL
+        api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{server.server_port}/"
+        
+        try:
+            api = ComdinheiroAPI("test_user", "test_pass", cache=TTLCache())
+            api.get_portfolio_data("Teste", None, "2024-01-31", view_type="relatorio")
+            api.get_portfolio_data("Teste", None, "2024-01-31", view_type="relatorio")
+        finally:
+            api_client.BASE_REPORTS_URL = original_base
+        
+        snapshot = metrics.snapshot()
+        requests_total = snapshot['counters'].get('comdinheiro_requests_total', [])
+        stages = {series['labels']['stage']
+                  for series in snapshot['histograms'].get('comdinheiro_stage_seconds', [])}
+        hit_ratio = snapshot['cache_hit_ratio'].get('portfolio_report', {}).get('memory')
+        
+        if (any(series['labels'] == {'endpoint': 'portfolio_report', 'status': '200'}
+                and series['value'] == 1 for series in requests_total)
+                and {'clean_table_data', '_process_detailed_report', 'to_rows'} <= stages
+                and hit_ratio == 0.5):
+            results['metrics_json'] = True
+            print(f"✅ Métricas registradas: etapas {sorted(stages)}, cache hit {hit_ratio:.0%}")
+        else:
+            results['metrics_json'] = False
+            print(f"❌ Métricas incorretas: {snapshot}")
+        
+        text = metrics.to_prometheus()
+        if ('# TYPE comdinheiro_request_seconds histogram' in text
+                and 'comdinheiro_requests_total{endpoint="portfolio_report",status="200"} 1' in text
+                and 'le="+Inf"' in text):
+            results['metrics_prometheus'] = True
+            print("✅ Exportação no formato Prometheus")
+        else:
+            results['metrics_prometheus'] = False
+            print(f"❌ Exportação Prometheus incorreta:\n{text}")
+            
+    except Exception as e:
+        print(f"❌ Erro nas métricas: {e}")
+        results.update({
+            'metrics_json': False,
+            'metrics_prometheus': False
+        })
+    finally:
+        if server:
+            server.shutdown()
+    
+    return results
+
+
+def test_standin_server() -> Dict[str, bool]:
+    """Testa o servidor substituto local e as URLs base configuráveis."""
+    results = {}
+    
+    print("\n🧪 Testando servidor substituto (stand-in)...")
+    
+    server = None
+    try:
+        import sys
+        import threading
+        from pathlib import Path
+        from comdinheiro import ComdinheiroAPI
+        
+        sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
+        from comdinheiro_standin_server import make_server, StandinConfig
+        
+        server = make_server(StandinConfig(rows='25'), port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}/"
+        
+        api = ComdinheiroAPI("test_user", "test_pass",
+                             reports_base_url=base, base_url=f"{base}Clientes/API/")
+        portfolios = api.get_portfolio_list()
+        data, error = api.get_portfolio_data("Teste", None, "2024-01-31", view_type="relatorio")
+        
+        if (portfolios and len(portfolios) == 25 and not error
+                and len(data['tables']['tab0']) == 26
+                and server.stats['endpoints'].get('RelatorioGerencialCarteiras001.php') == 2):
+            results['standin_server'] = True
+            print(f"✅ Cliente apontado para o stand-in: {len(portfolios)} carteiras, relatório com 25 linhas")
+        else:
+            results['standin_server'] = False
+            print(f"❌ Respostas incorretas do stand-in: {error}, {server.stats}")
+            
+    except Exception as e:
+        print(f"❌ Erro no servidor substituto: {e}")
+        results['standin_server'] = False
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+    
+    return results
+
+
+def test_credentials_cache() -> Dict[str, bool]:
+    """Testa o cache de credenciais do AuthManager e sua invalidação."""
+    results = {}
+    
+    print("\n🔑 Testando cache de credenciais...")
+    
+    original_fallback = None
+    try:
+        from comdinheiro import AuthManager
+        
+        lookups = []
+        
+        def fake_fallback(user_email):
+            lookups.append(user_email)
+            return ('cd_user', f'senha{len(lookups)}') if user_email == 'gestor@reino.com' else (None, None)
+        
+        original_fallback = AuthManager.__dict__['_get_credentials_fallback']
+        AuthManager._get_credentials_fallback = staticmethod(fake_fallback)
+        AuthManager.invalidate_credentials()
+        
+        first = AuthManager.get_comdinheiro_credentials('gestor@reino.com')
+        second = AuthManager.get_comdinheiro_credentials('gestor@reino.com')
+        AuthManager.get_comdinheiro_credentials('novo@reino.com')
+        AuthManager.get_comdinheiro_credentials('novo@reino.com')
+        
+        if first == second == ('cd_user', 'senha1') and lookups.count('gestor@reino.com') == 1 \
+                and lookups.count('novo@reino.com') == 2:
+            results['credentials_cache'] = True
+            print("✅ Credenciais encontradas ficam em cache (ausentes são consultadas de novo)")
+        else:
+            results['credentials_cache'] = False
+            print(f"❌ Cache de credenciais incorreto: {lookups}")
+        
+        AuthManager.invalidate_credentials('gestor@reino.com')
+        updated = AuthManager.get_comdinheiro_credentials('gestor@reino.com')
+        
+        if updated == ('cd_user', 'senha4') and lookups.count('gestor@reino.com') == 2:
+            results['credentials_invalidation'] = True
+            print("✅ Invalidação lê as credenciais atualizadas do banco")
+        else:
+            results['credentials_invalidation'] = False
+            print(f"❌ Invalidação não funcionou: {updated}")
+            
+    except Exception as e:
+        print(f"❌ Erro no cache de credenciais: {e}")
+        results.update({
+            'credentials_cache': False,
+            'credentials_invalidation': False
+        })
+    finally:
+        if original_fallback is not None:
+            AuthManager._get_credentials_fallback = original_fallback
+            AuthManager.invalidate_credentials()
+    
+    return results
+
+
+def _start_stub_server(payload: Dict[str, Any], delay: float = 0, failures: int = 0,
+                       failure_status: int = 503):
+    """
+    Sobe um servidor HTTP local que responde sempre o mesmo JSON (contando as requisições).
+    
+    As primeiras `failures` requisições recebem `failure_status`, para simular
+    instabilidades da API.
+    """
+    import json
+    import time
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    
+    body = json.dumps(payload).encode('utf-8')
+    
+    class StubHandler(BaseHTTPRequestHandler):
+        def _respond(self):
+            self.server.requests += 1
+            time.sleep(delay)
+            if self.server.requests <= failures:
+                self.send_response(failure_status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def do_GET(self):
+            self._respond()
+        
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            self._respond()
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_async_client() -> Dict[str, bool]:
+    """Testa o cliente asyncio contra um servidor HTTP local."""
+    results = {}
+    
+    print("\n⚡ Testando cliente asyncio...")
+    
+    server = None
+    servers = []
+    try:
+        import asyncio
+        import tempfile
+        import threading
+        import time
+        from comdinheiro import AsyncComdinheiroAPI, DiskCache
+        from comdinheiro.config import ENDPOINT_TIMEOUTS
+        import comdinheiro.api_client as api_client
+        
+        server = _start_stub_server({'tables': {'tab0': {
+            'lin0': {'col0': 'Carteira', 'col1': 'Saldo'},
+            'lin1': {'col0': 'Teste', 'col1': '1.234,50'}
+        }}})
+        original_base = api_client.BASE_REPORTS_URL
+        api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{server.server_port}/"
+        
+        class ThreadCheckingDiskCache(DiskCache):
+            """Registra em quais threads o disco é acessado."""
+            
+            threads = set()
+            
+            def get(self, *args):
+                self.threads.add(threading.current_thread())
+                return super().get(*args)
+            
+            def set(self, *args):
+                self.threads.add(threading.current_thread())
+                return super().set(*args)
+        
+        disk_cache = ThreadCheckingDiskCache(tempfile.mkdtemp(prefix='comdinheiro-async-cache-'))
+        
+        async def run():
+            async with AsyncComdinheiroAPI("test_user", "test_pass", max_concurrency=2) as api:
+                return await asyncio.gather(
+                    api.get_portfolio_balance("Teste", "2025-09-22"),
+                    api.get_portfolio_list()
+                )
+        
+        async def run_cached():
+            async with AsyncComdinheiroAPI("test_user", "test_pass",
+                                           disk_cache=disk_cache) as api:
+                first = await api.get_portfolio_data("Teste", "2024-01-01", "2024-01-31")
+                requests_made = server.requests
+                second = await api.get_portfolio_data("Teste", "2024-01-01", "2024-01-31")
+                return first, second, server.requests - requests_made
+        
+        try:
+            balance, portfolios = asyncio.run(run())
+            first, second, extra_requests = asyncio.run(run_cached())
+        finally:
+            api_client.BASE_REPORTS_URL = original_base
+        
+        if balance == 1234.5 and portfolios and portfolios[0]['nome_portfolio'] == 'Teste':
+            results['async_client'] = True
+            print("✅ Cliente asyncio funcionando contra servidor local")
+        else:
+            results['async_client'] = False
+            print(f"❌ Resposta inesperada: {balance}, {portfolios}")
+        
+        if (first[0] and second == first and extra_requests == 0 and disk_cache.threads
+                and threading.main_thread() not in disk_cache.threads):
+            results['async_disk_cache_off_loop'] = True
+            print("✅ Cache em disco do cliente asyncio acessado fora do event loop")
+        else:
+            results['async_disk_cache_off_loop'] = False
+            print(f"❌ Cache em disco no event loop: {disk_cache.threads}, {extra_requests} requisições")
+        
+        # Saldos de várias carteiras na mesma data: um único snapshot, como no cliente síncrono
+        snapshot_server = _start_stub_server({'tables': {'tab0': {
+            'lin0': {'col0': 'Carteira', 'col1': 'Saldo Bruto'},
+            'lin1': {'col0': 'Carteira_A', 'col1': '1.000,50'},
+            'lin2': {'col0': 'Carteira_B', 'col1': '2.500,00'}
+        }}})
+        servers.append(snapshot_server)
+        
+        async def run_balances():
+            async with AsyncComdinheiroAPI("test_user", "test_pass") as api:
+                return await api.get_portfolio_balance("Carteira_A", "2024-01-31"), \
+                    await api.get_portfolio_balance("carteira_b", "2024-01-31")
+        
+        # Timeouts por endpoint: uma API travada não prende a chamada por 300 s
+        slow_server = _start_stub_server({'tables': {'tab0': {}}}, delay=1)
+        servers.append(slow_server)
+        original_timeout = ENDPOINT_TIMEOUTS['portfolio_report']
+        
+        async def run_slow():
+            async with AsyncComdinheiroAPI("test_user", "test_pass") as api:
+                started = time.monotonic()
+                data, error = await api.get_portfolio_data("Teste", "2024-01-01", "2024-01-31")
+                return data, time.monotonic() - started
+        
+        try:
+            api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{snapshot_server.server_port}/"
+            balances = asyncio.run(run_balances())
+            api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{slow_server.server_port}/"
+            ENDPOINT_TIMEOUTS['portfolio_report'] = (1, 0.2)
+            slow_data, elapsed = asyncio.run(run_slow())
+        finally:
+            api_client.BASE_REPORTS_URL = original_base
+            ENDPOINT_TIMEOUTS['portfolio_report'] = original_timeout
+        
+        if balances == (1000.5, 2500.0) and snapshot_server.requests == 1:
+            results['async_balance_snapshot'] = True
+            print("✅ Saldos do cliente asyncio lidos de um único snapshot")
+        else:
+            results['async_balance_snapshot'] = False
+            print(f"❌ Saldos incorretos: {balances}, {snapshot_server.requests} requisições")
+        
+        if slow_data is None and elapsed < 0.8:
+            results['async_endpoint_timeout'] = True
+            print(f"✅ Timeout por endpoint respeitado pelo cliente asyncio ({elapsed:.2f}s)")
+        else:
+            results['async_endpoint_timeout'] = False
+            print(f"❌ Timeout ignorado: {elapsed:.2f}s")
+            
+    except Exception as e:
+        print(f"❌ Erro no cliente asyncio: {e}")
+        results.update({
+            'async_client': False,
+            'async_disk_cache_off_loop': False,
+            'async_balance_snapshot': False,
+            'async_endpoint_timeout': False
+        })
+    finally:
+        if server:
+            server.shutdown()
+        for extra_server in servers:
+            extra_server.shutdown()
+    
+    return results
+
+
+def test_streaming_rows() -> Dict[str, bool]:
+    """Testa o parsing incremental (linha a linha) de relatórios."""
+    results = {}
+    
+    print("\n🌊 Testando streaming de relatórios...")
+    
+    server = None
+    try:
+        import requests
+        from comdinheiro import ComdinheiroAPI
+        from comdinheiro.resilience import RetryPolicy
+        from comdinheiro.streaming import iter_table_rows
+        import comdinheiro.api_client as api_client
+        
+        body = b'{"outro": [1, 2.5], "tables": {"tab1": {}, "tab0": {"lin0": {"col0": "Data"}, "lin1": {"col0": "x", "col5": "1.234,5"}}}}'
+        chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+        rows = list(iter_table_rows(chunks))
+        
+        if rows == [('lin0', {'col0': 'Data'}), ('lin1', {'col0': 'x', 'col5': '1.234,5'})]:
+            results['streaming_parser'] = True
+            print("✅ Parser incremental funcionando com chunks pequenos")
+        else:
+            results['streaming_parser'] = False
+            print(f"❌ Linhas incorretas: {rows}")
+        
+        tab0 = {'lin0': {'col0': 'Carteira', 'col7': 'PU Aplic', 'col8': 'PU'}}
+        for i in range(1, 51):
+            tab0[f'lin{i}'] = {'col0': f'C{i}', 'col7': '10', 'col8': str(10 + i)}
+        server = _start_stub_server({'tables': {'tab0': tab0}}, failures=2)
+        original_base = api_client.BASE_REPORTS_URL
+        api_client.BASE_REPORTS_URL = f"http://127.0.0.1:{server.server_port}/"
+        
+        try:
+            api = ComdinheiroAPI("test_user", "test_pass",
+                                 retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01))
+            streamed = dict(api.iter_portfolio_data("Teste", view_type="relatorio", chunk_size=64))
+            stream_stats = api.resilience_stats()
+            data, error = api.get_portfolio_data("Teste", view_type="relatorio")
+            
+            # Circuito aberto: o streaming também é recusado sem chamar a API
+            breaker = api.circuit_breakers['portfolio_report']
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+            requests_before = server.requests
+            try:
+                list(api.iter_portfolio_data("Teste", view_type="relatorio"))
+                rejected = False
+            except requests.RequestException:
+                rejected = server.requests == requests_before
+        finally:
+            api_client.BASE_REPORTS_URL = original_base
+        
+        if data and streamed == data['tables']['tab0']:
+            results['streaming_rows'] = True
+            print("✅ Linhas do streaming iguais às do processamento completo")
+        else:
+            results['streaming_rows'] = False
+            print(f"❌ Streaming divergente: {error}")
+        
+        if stream_stats['retries'] == 2 and stream_stats['attempts'] == 3 and rejected:
+            results['streaming_resilience'] = True
+            print("✅ Streaming passa por retry, circuit breaker e rate limit")
+        else:
+            results['streaming_resilience'] = False
+            print(f"❌ Streaming fora da camada de resiliência: {stream_stats}, recusado={rejected}")
+            
+    except Exception as e:
+        print(f"❌ Erro no streaming: {e}")
+        results.update({
+            'streaming_parser': False,
+            'streaming_rows': False,
+            'streaming_resilience': False
+        })
+    finally:
+        if server:
+            server.shutdown()
+    
+    return results
+
+
+def test_bulk_export() -> Dict[str, bool]:
+    """Testa a exportação em lotes (chunks), paralela e retomável."""
+    results = {}
+    
+    print("\n📤 Testando exportação em lotes...")
+    
+    server = None
+    try:
+        import os
+        import json
+        import tempfile
+        import pandas as pd
+        from comdinheiro import ComdinheiroAPI
+        from comdinheiro.bulk_export import iter_export_chunks
+        
+        df = pd.DataFrame({
+            'carteira': [f'Carteira_{i % 7}' for i in range(500)],
+            'ativo': ['PETR4 "ON"\nà vista'] * 500,
+            'quantidade': [float(i) for i in range(500)]
+        })
+        chunks = list(iter_export_chunks(df, max_bytes=4000, max_records=60, batch_rows=33))
+        records = [record for chunk in chunks for record in json.loads(chunk.content)]
+        
+        if records == json.loads(df.to_json(orient="records")) \
+                and all(len(chunk.content) <= 4000 and chunk.rows <= 60 for chunk in chunks):
+            results['export_chunks'] = True
+            print(f"✅ {len(chunks)} chunks limitados em bytes e registros, mesmos registros")
+        else:
+            results['export_chunks'] = False
+            print("❌ Chunks de exportação incorretos")
+        
+        server = _start_stub_server({'status_code': 200,
+                                     'resposta': [{'Comdinheiro informa': 'Importação concluída'}]})
+        api = ComdinheiroAPI("test_user", "test_pass", rate_limit=0,
+                             base_url=f"http://127.0.0.1:{server.server_port}/")
+        
+        # The third upload fails once: with on_error=0 the export stops there
+        uploads = []
+        original_make_request = api._make_request
+        
+        def flaky_make_request(*args, **kwargs):
+            uploads.append(1)
+            return None if len(uploads) == 3 else original_make_request(*args, **kwargs)
+        
+        api._make_request = flaky_make_request
+        progress_path = os.path.join(tempfile.mkdtemp(), 'export.progress')
+        
+        first = api.export_data_bulk(df, max_bytes=4000, max_records=60, max_concurrency=1,
+                                     progress_path=progress_path)
+        second = api.export_data_bulk(df, max_bytes=4000, max_records=60, max_concurrency=3,
+                                      progress_path=progress_path)
+        
+        if not first['complete'] and first['chunks_sent'] == 2 \
+                and [failure['chunk'] for failure in first['failed']] == [2] \
+                and second['complete'] and second['chunks_resumed'] == 2 \
+                and first['rows_sent'] + second['rows_sent'] == len(df) \
+                and not os.path.exists(progress_path):
+            results['export_resume'] = True
+            print("✅ Exportação para no erro (on_error=0) e retoma do chunk que faltava")
+        else:
+            results['export_resume'] = False
+            print(f"❌ Retomada incorreta: {first} / {second}")
+            
+    except Exception as e:
+        print(f"❌ Erro na exportação em lotes: {e}")
+        results.update({
+            'export_chunks': False,
+            'export_resume': False
+        })
+    finally:
+        if server:
+            server.shutdown()
+    
+    return results
+
+
+def test_export_ledger() -> Dict[str, bool]:
+    """Testa a exportação idempotente com o ledger de hashes de linhas."""
+    results = {}
+    
+    print("\n🧾 Testando ledger de exportação...")
+    
+    server = None
+    try:
+        import pandas as pd
+        from comdinheiro import ComdinheiroAPI, ExportLedger
+        from comdinheiro.export_ledger import export_accepted
+        
+        df = pd.DataFrame({
+            'Carteira': ['A', 'A', 'B', 'B'],
+            'Ativo': ['PETR4', 'PETR4', 'VALE3', 'CDB'],
+            'Quantidade': [10.0, 10.0, 5.0, 1000.0]
+        })
+        ledger = ExportLedger(':memory:')
+        
+        server = _start_stub_server({'status_code': 200,
+                                     'resposta': [{'Comdinheiro informa': 'Importação concluída'}]})
+        api = ComdinheiroAPI("test_user", "test_pass", rate_limit=0,
+                             base_url=f"http://127.0.0.1:{server.server_port}/")
+        
+        first = api.export_data(df, ledger=ledger)
+        second = api.export_data(df[['Quantidade', 'Ativo', 'Carteira']], ledger=ledger)
+        
+        if first and second and second.startswith('Nenhum registro novo') and server.requests == 1:
+            results['export_ledger_skip'] = True
+            print("✅ Reexportação não reenvia linhas já aceitas")
+        else:
+            results['export_ledger_skip'] = False
+            print(f"❌ Reexportação incorreta: {second} ({server.requests} requisições)")
+        
+        changed = pd.concat([df.assign(Quantidade=[10.0, 10.0, 5.0, 2000.0]),
+                             df.iloc[[0]]], ignore_index=True)
+        batch = ledger.pending(api._account_key, changed)
+        
+        if batch.skipped == 3 and batch.rows.index.tolist() == [3, 4]:
+            results['export_ledger_diff'] = True
+            print("✅ Só linhas novas ou alteradas (incluindo repetições novas) são enviadas")
+        else:
+            results['export_ledger_diff'] = False
+            print(f"❌ Diferença incorreta: {batch.rows}")
+        
+        # Registros recusados pela API (mesmo com status 200) não entram no ledger
+        server.shutdown()
+        server = _start_stub_server({'status_code': 200, 'resposta': [
+            {'Comdinheiro informa': '1 registro importado. 1 registro rejeitado: ativo inválido'}
+        ]})
+        api = ComdinheiroAPI("test_user", "test_pass", rate_limit=0,
+                             base_url=f"http://127.0.0.1:{server.server_port}/")
+        rejected_ledger = ExportLedger(':memory:')
+        new_rows = pd.DataFrame({'Carteira': ['C', 'C'], 'Ativo': ['ITUB4', 'XXXX'],
+                                 'Quantidade': [1.0, 2.0]})
+        message = api.export_data(new_rows, ledger=rejected_ledger)
+        retried = rejected_ledger.pending(api._account_key, new_rows)
+        
+        if (message and len(retried.rows) == 2
+                and export_accepted({'status_code': 200, 'resposta': [
+                    {'Comdinheiro informa': '2 registros recebidos. Importação concluída, 0 erros'}
+                ]}, 2)
+                and not export_accepted({'status_code': 200, 'resposta': [
+                    {'Comdinheiro informa': '1 registros recebidos'}]}, 2)
+                and not export_accepted({'status_code': 200}, 2)):
+            results['export_ledger_rejections'] = True
+            print("✅ Só linhas confirmadas pela API são marcadas como exportadas")
+        else:
+            results['export_ledger_rejections'] = False
+            print(f"❌ Linhas recusadas marcadas como exportadas: {len(retried.rows)} pendentes")
+            
+    except Exception as e:
+        print(f"❌ Erro no ledger de exportação: {e}")
+        results.update({
+            'export_ledger_skip': False,
+            'export_ledger_diff': False,
+            'export_ledger_rejections': False
+        })
+    finally:
+        if server:
+            server.shutdown()
+    
+    return results
+
+
+def test_transaction_ledger() -> Dict[str, bool]:
+    """Testa a sincronização incremental de movimentações no ledger local."""
+    results = {}
+    
+    print("\n📒 Testando ledger de movimentações...")
+    
+    try:
+        from datetime import date, timedelta
+        from comdinheiro import TransactionLedger, TransactionSync
+        
+        today = date.today()
+        
+        class FakeAPI:
+            credentials = {'username': 'test_user', 'password': 'test_pass'}
+            
+            def __init__(self, date_label='Data Cadastro', undated=False):
+                self.calls = []
+                self.date_label = date_label
+                self.undated = undated
+            
+            def get_portfolio_data(self, portfolio, start_date=None, end_date=None,
+                                   view_type=None, bank='todos', operation='todos',
+                                   deadline=None):
+                self.calls.append((start_date, end_date))
+                tab0 = {'lin0': {'col0': 'Carteira', 'col1': self.date_label, 'col2': 'Valor'}}
+                for i in range(3):
+                    day = today - timedelta(days=i * 10)
+                    if start_date <= day.isoformat() <= end_date:
+                        tab0[f'lin{i + 1}'] = {'col0': portfolio, 'col1': day.strftime('%d/%m/%Y'), 'col2': float(i)}
+                if self.undated:
+                    tab0['lin9'] = {'col0': portfolio, 'col1': '', 'col2': 99.0}
+                return {'tables': {'tab0': tab0}}, None
+        
+        api = FakeAPI()
+        sync = TransactionSync(api, TransactionLedger(':memory:'))
+        start = (today - timedelta(days=30)).isoformat()
+        
+        first, error = sync.get_transactions('Teste', start)
+        repeat, _ = sync.get_transactions('Teste', start)
+        
+        if not error and len(first['tables']['tab0']) == 4 and repeat == first and len(api.calls) == 1:
+            results['ledger_local_reads'] = True
+            print("✅ Consulta repetida respondida pelo ledger local")
+        else:
+            results['ledger_local_reads'] = False
+            print(f"❌ Ledger incorreto: {error}, chamadas={api.calls}")
+        
+        sync.sync_interval = 0
+        sync.get_transactions('Teste', start)
+        recheck_start = (today - timedelta(days=sync.recheck_days)).isoformat()
+        
+        if api.calls[-1] == (recheck_start, today.isoformat()):
+            results['ledger_recheck_window'] = True
+            print("✅ Sincronização busca apenas a janela de re-checagem")
+        else:
+            results['ledger_recheck_window'] = False
+            print(f"❌ Janela inesperada: {api.calls[-1]}")
+        
+        # Sem coluna de data de cadastro, a sincronização falha em vez de usar outra data
+        ledger = TransactionLedger(':memory:')
+        sync = TransactionSync(FakeAPI(date_label='Data Operação'), ledger)
+        data, error = sync.get_transactions('Teste', start)
+        
+        if data is None and error and ledger.get_state(sync._scope('Teste', 'todos', 'todos')) is None:
+            results['ledger_requires_cadastro'] = True
+            print("✅ Movimentações sem data de cadastro não são gravadas")
+        else:
+            results['ledger_requires_cadastro'] = False
+            print(f"❌ Movimentações gravadas sem data de cadastro: {data}")
+        
+        # Linhas sem data não ficam presas no fim da janela nem somem na re-checagem
+        ledger = TransactionLedger(':memory:')
+        sync = TransactionSync(FakeAPI(undated=True), ledger)
+        scope = sync._scope('Teste', 'todos', 'todos')
+        ledger.replace_window(scope, today - timedelta(days=30), today,
+                              sync.api.get_portfolio_data('Teste', start, today.isoformat())[0]['tables']['tab0'])
+        stored = ledger.query(scope, date.min, date.max)
+        
+        if len(stored) == 3 and all(row['col1'] for row in stored):
+            results['ledger_skips_undated'] = True
+            print("✅ Movimentações sem data de cadastro são ignoradas")
+        else:
+            results['ledger_skips_undated'] = False
+            print(f"❌ Movimentações sem data gravadas: {stored}")
+            
+    except Exception as e:
+        print(f"❌ Erro no ledger de movimentações: {e}")
+        results.update({
+            'ledger_local_reads': False,
+            'ledger_recheck_window': False,
+            'ledger_requires_cadastro': False,
+            'ledger_skips_undated': False
+        })
+    
+    return results
+
+
+def test_wire_format() -> Dict[str, bool]:
+    """Testa o formato colunar de saída do wrapper."""
+    results = {}
+    
+    print("\n📦 Testando formato colunar do wrapper...")
+    
+    try:
+        import json
+        from comdinheiro.wire_format import decode_columnar_tables, encode_columnar_tables
+        
+        table = {'lin0': {'col0': 'Ativo', 'col1': 'Instituição', 'col2': 'Saldo'}}
+        for index in range(1, 41):
+            table[f'lin{index}'] = {'col0': f'ATIVO{index}', 'col1': ['BTG', 'XP'][index % 2],
+                                    'col2': index * 10.5}
+        del table['lin7']['col2']
+        data = {'tables': {'tab0': table, 'tab1': {'linA': {'col0': None}}}, 'total': 1}
+        
+        encoded = json.loads(json.dumps(encode_columnar_tables(data), separators=(',', ':')))
+        
+        if decode_columnar_tables(encoded) == data:
+            results['wire_format_round_trip'] = True
+            print("✅ Tabelas colunares voltam ao formato lin/col original")
+        else:
+            results['wire_format_round_trip'] = False
+            print("❌ Tabelas decodificadas diferem das originais")
+        
+        columns = encoded['tables']['tab0']['columns']
+        if (columns['col1'].get('dict') == ['XP', 'BTG'] and 'values' in columns['col0']
+                and encoded['tables']['tab0']['missing'] == {'col2': [6]}
+                and len(json.dumps(encoded)) < len(json.dumps(data))):
+            results['wire_format_compact'] = True
+            print("✅ Textos repetidos usam dicionário e o payload é menor")
+        else:
+            results['wire_format_compact'] = False
+            print(f"❌ Codificação inesperada: {columns}")
+            
+    except Exception as e:
+        print(f"❌ Erro no formato colunar: {e}")
+        results.update({
+            'wire_format_round_trip': False,
+            'wire_format_compact': False
+        })
+    
+    return results
+
+
 def test_utilities() -> Dict[str, bool]:
     """Testa as funções utilitárias."""
     results = {}
@@ -350,8 +1855,28 @@ def main():
         test_imports,
         test_configuration,
         test_data_processor,
+        test_balance_snapshot,
+        test_columnar_table,
+        test_column_types,
         test_auth_manager,
         test_api_client,
+        test_concurrent_fetches,
+        test_request_plans,
+        test_client_registry,
+        test_response_cache,
+        test_disk_cache,
+        test_single_flight,
+        test_resilience,
+        test_deadlines,
+        test_metrics,
+        test_standin_server,
+        test_credentials_cache,
+        test_async_client,
+        test_streaming_rows,
+        test_bulk_export,
+        test_export_ledger,
+        test_transaction_ledger,
+        test_wire_format,
         test_utilities
     ]
     